@@ -1,107 +1,193 @@
-import pandas as pd
-import os
-import requests
-from requests.exceptions import RequestException
-import time
-from tqdm import tqdm
-
-def validate_url(url, timeout=5):
-    """Cek apakah URL valid dan dapat diakses"""
-    # Skip URL dari asset.kompas.com - langsung anggap tidak valid
-    if "asset.kompas.com" in url:
-        return False
-        
-    try:
-        # Hanya melakukan HEAD request untuk kecepatan
-        response = requests.head(url, timeout=timeout, allow_redirects=True)
-        return 200 <= response.status_code < 300
-    except:
-        return False
-
-def clean_invalid_urls():
-    """Menghapus URL yang tidak valid dan URL dari asset.kompas.com"""
-    
-    # Path file
-    file_path = "2/data/processed/tourism_with_images.csv"
-    
-    # Cek apakah file ada
-    if not os.path.exists(file_path):
-        print(f"Error: File {file_path} tidak ditemukan.")
-        return
-    
-    print(f"Membaca file {file_path}...")
-    df = pd.read_csv(file_path)
-    
-    # Buat backup
-    backup_path = file_path + ".backup"
-    df.to_csv(backup_path, index=False)
-    print(f"Backup dibuat di {backup_path}")
-    
-    # Buat daftar untuk menyimpan statistik
-    total_urls = 0
-    valid_urls = 0
-    kompas_urls = 0
-    other_invalid_urls = 0
-    rows_updated = 0
-    
-    # Loop melalui setiap baris
-    print("Memvalidasi dan menghapus URL yang tidak valid...")
-    for idx, row in tqdm(df.iterrows(), total=len(df)):
-        # Skip jika tidak ada URL gambar
-        if pd.isna(row['image_urls']) or not row['image_urls'] or row['image_urls'] == "":
-            df.at[idx, 'image_urls'] = "https://via.placeholder.com/800x400?text=Tidak+Ada+Gambar"
-            rows_updated += 1
-            continue
-            
-        # Pisahkan URL berdasarkan pemisah |
-        url_list = row['image_urls'].split('|')
-        total_urls += len(url_list)
-        
-        # Filter hanya URL yang valid dan bukan dari asset.kompas.com
-        valid_url_list = []
-        for url in url_list:
-            url = url.strip()
-            if not url:
-                continue
-                
-            if "asset.kompas.com" in url:
-                kompas_urls += 1
-                continue  # Skip URL dari kompas
-                
-            if validate_url(url):
-                valid_url_list.append(url)
-                valid_urls += 1
-            else:
-                other_invalid_urls += 1
-        
-        # Jika semua URL tidak valid, gunakan placeholder
-        if not valid_url_list:
-            df.at[idx, 'image_urls'] = "https://via.placeholder.com/800x400?text=Tidak+Ada+Gambar"
-        else:
-            # Simpan hanya URL yang valid
-            df.at[idx, 'image_urls'] = "|".join(valid_url_list)
-            
-        rows_updated += 1
-        
-        # Tunggu sebentar untuk menghindari overload server
-        time.sleep(0.1)
-    
-    # Simpan hasil ke file asli
-    df.to_csv(file_path, index=False)
-    
-    # Tampilkan statistik
-    print("\n===== HASIL PEMBERSIHAN URL =====")
-    print(f"Total baris diproses: {rows_updated}")
-    print(f"Total URL diperiksa: {total_urls}")
-    print(f"URL valid: {valid_urls}")
-    print(f"URL dari asset.kompas.com (dihapus): {kompas_urls}")
-    print(f"URL invalid lainnya (dihapus): {other_invalid_urls}")
-    print(f"Total URL dihapus: {kompas_urls + other_invalid_urls}")
-    if total_urls > 0:
-        print(f"Persentase URL valid: {valid_urls/total_urls*100:.2f}%")
-    print("=================================")
-    print(f"\nFile telah diperbarui: {file_path}")
-    print(f"Backup tersimpan di: {backup_path}")
-
-if __name__ == "__main__":
-    clean_invalid_urls()
+import pandas as pd
+import os
+import time
+import argparse
+import requests
+from requests.exceptions import RequestException
+from tqdm import tqdm
+
+from src.scraping import create_session, HostConcurrencyLimiter, run_concurrently
+from src.journal import JournalCache
+
+FILE_PATH = "2/data/processed/tourism_with_images.csv"
+PLACEHOLDER_URL = "https://via.placeholder.com/800x400?text=Tidak+Ada+Gambar"
+
+# Cache hasil validasi URL -> (status HTTP, waktu diperiksa)
+URL_CACHE_FILE = "data/cache/url_status.jsonl"
+VALID_TTL = 7 * 24 * 3600  # URL valid diperiksa ulang setelah 7 hari
+INVALID_TTL = 24 * 3600  # URL gagal (bisa jadi error sementara) diperiksa ulang setelah 1 hari
+
+# Pengaturan validasi paralel
+CONCURRENCY = 16  # Jumlah request yang berjalan bersamaan
+MAX_PER_HOST = 4  # Jumlah request bersamaan maksimal ke satu host
+TIMEOUT = 5
+
+def is_excluded(url):
+    """URL dari asset.kompas.com langsung dianggap tidak valid"""
+    return "asset.kompas.com" in url
+
+def is_valid_status(status):
+    return status is not None and 200 <= status < 300
+
+def check_url_status(url, session=None, timeout=TIMEOUT):
+    """Status HTTP dari HEAD request ke URL (mengikuti redirect), None jika gagal terhubung"""
+    try:
+        # Hanya melakukan HEAD request untuk kecepatan
+        response = (session or requests).head(url, timeout=timeout, allow_redirects=True)
+        return response.status_code
+    except (RequestException, ValueError):
+        return None
+
+def validate_url(url, timeout=5):
+    """Cek apakah URL valid dan dapat diakses"""
+    # Skip URL dari asset.kompas.com - langsung anggap tidak valid
+    if is_excluded(url):
+        return False
+    return is_valid_status(check_url_status(url, timeout=timeout))
+
+def validate_urls(urls, cache, concurrency=CONCURRENCY, max_per_host=MAX_PER_HOST,
+                  valid_ttl=VALID_TTL, invalid_ttl=INVALID_TTL, timeout=TIMEOUT):
+    """
+    Validasi banyak URL secara paralel. URL yang hasilnya masih berlaku di cache
+    tidak diperiksa ulang; hasil pemeriksaan baru langsung disimpan ke cache.
+
+    Returns:
+        Tuple (dict URL -> status HTTP atau None, jumlah URL yang diperiksa ulang)
+    """
+    now = time.time()
+    statuses = {}
+    to_check = []
+    for url in urls:
+        entry = cache.lookup(url)
+        if entry is not None:
+            status, checked_at = entry
+            ttl = valid_ttl if is_valid_status(status) else invalid_ttl
+            if now - checked_at <= ttl:
+                statuses[url] = status
+                continue
+        to_check.append(url)
+
+    session = create_session(pool_size=concurrency)
+    host_limiter = HostConcurrencyLimiter(max_per_host)
+
+    def check(url):
+        with host_limiter.semaphore(url):
+            return check_url_status(url, session, timeout)
+
+    for url, status, error in tqdm(run_concurrently(check, to_check, concurrency),
+                                   total=len(to_check), desc="Validasi URL"):
+        statuses[url] = status
+        cache.set(url, status)
+
+    return statuses, len(to_check)
+
+def clean_invalid_urls(file_path=FILE_PATH, cache_path=URL_CACHE_FILE, concurrency=CONCURRENCY,
+                       max_per_host=MAX_PER_HOST, valid_ttl=VALID_TTL, invalid_ttl=INVALID_TTL):
+    """Menghapus URL yang tidak valid dan URL dari asset.kompas.com"""
+
+    # Cek apakah file ada
+    if not os.path.exists(file_path):
+        print(f"Error: File {file_path} tidak ditemukan.")
+        return
+
+    print(f"Membaca file {file_path}...")
+    df = pd.read_csv(file_path)
+
+    # Buat backup
+    backup_path = file_path + ".backup"
+    df.to_csv(backup_path, index=False)
+    print(f"Backup dibuat di {backup_path}")
+
+    # Buat daftar untuk menyimpan statistik
+    total_urls = 0
+    valid_urls = 0
+    kompas_urls = 0
+    other_invalid_urls = 0
+    rows_updated = 0
+
+    # Kumpulkan URL unik yang perlu divalidasi dari seluruh baris
+    row_urls = {}
+    for idx, image_urls in df['image_urls'].items():
+        if pd.isna(image_urls) or not image_urls:
+            continue
+        row_urls[idx] = [url.strip() for url in image_urls.split('|')]
+    unique_urls = {url for urls in row_urls.values() for url in urls if url and not is_excluded(url)}
+
+    print(f"Memvalidasi {len(unique_urls)} URL unik...")
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    with JournalCache(cache_path) as cache:
+        statuses, checked = validate_urls(unique_urls, cache, concurrency, max_per_host, valid_ttl, invalid_ttl)
+    print(f"{checked} URL diperiksa, {len(unique_urls) - checked} diambil dari cache")
+
+    # Loop melalui setiap baris
+    print("Menghapus URL yang tidak valid...")
+    for idx in df.index:
+        # Skip jika tidak ada URL gambar
+        if idx not in row_urls:
+            df.at[idx, 'image_urls'] = PLACEHOLDER_URL
+            rows_updated += 1
+            continue
+
+        # Pisahkan URL berdasarkan pemisah |
+        url_list = row_urls[idx]
+        total_urls += len(url_list)
+
+        # Filter hanya URL yang valid dan bukan dari asset.kompas.com
+        valid_url_list = []
+        for url in url_list:
+            if not url:
+                continue
+
+            if is_excluded(url):
+                kompas_urls += 1
+                continue  # Skip URL dari kompas
+
+            if is_valid_status(statuses.get(url)):
+                valid_url_list.append(url)
+                valid_urls += 1
+            else:
+                other_invalid_urls += 1
+
+        # Jika semua URL tidak valid, gunakan placeholder
+        if not valid_url_list:
+            df.at[idx, 'image_urls'] = PLACEHOLDER_URL
+        else:
+            # Simpan hanya URL yang valid
+            df.at[idx, 'image_urls'] = "|".join(valid_url_list)
+
+        rows_updated += 1
+
+    # Simpan hasil ke file asli
+    df.to_csv(file_path, index=False)
+
+    # Tampilkan statistik
+    print("\n===== HASIL PEMBERSIHAN URL =====")
+    print(f"Total baris diproses: {rows_updated}")
+    print(f"Total URL diperiksa: {total_urls}")
+    print(f"URL valid: {valid_urls}")
+    print(f"URL dari asset.kompas.com (dihapus): {kompas_urls}")
+    print(f"URL invalid lainnya (dihapus): {other_invalid_urls}")
+    print(f"Total URL dihapus: {kompas_urls + other_invalid_urls}")
+    if total_urls > 0:
+        print(f"Persentase URL valid: {valid_urls/total_urls*100:.2f}%")
+    print("=================================")
+    print(f"\nFile telah diperbarui: {file_path}")
+    print(f"Backup tersimpan di: {backup_path}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hapus URL gambar yang tidak valid")
+    parser.add_argument('--file', default=FILE_PATH)
+    parser.add_argument('--cache', default=URL_CACHE_FILE, help="File cache hasil validasi URL")
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--max-per-host', type=int, default=MAX_PER_HOST)
+    parser.add_argument('--valid-ttl-hours', type=float, default=VALID_TTL / 3600,
+                        help="Masa berlaku cache untuk URL valid (jam)")
+    parser.add_argument('--invalid-ttl-hours', type=float, default=INVALID_TTL / 3600,
+                        help="Masa berlaku cache untuk URL tidak valid (jam)")
+    args = parser.parse_args(argv)
+
+    clean_invalid_urls(args.file, args.cache, args.concurrency, args.max_per_host,
+                       args.valid_ttl_hours * 3600, args.invalid_ttl_hours * 3600)
+
+if __name__ == "__main__":
+    main()
@@ -1,156 +1,246 @@
-import pandas as pd
-import os
-import re
-import requests
-from bs4 import BeautifulSoup
-from tqdm import tqdm
-import time
-
-def extract_wikimedia_image_url(wiki_url):
-    """
-    Mengekstrak URL gambar langsung dari halaman Wikipedia atau Wikimedia Commons
-    
-    Args:
-        wiki_url (str): URL halaman Wikipedia atau Wikimedia Commons yang berisi gambar
-        
-    Returns:
-        str: URL gambar langsung atau None jika gagal
-    """
-    try:
-        # Periksa apakah ini adalah URL Wikipedia atau Wikimedia Commons
-        is_wikipedia = 'wikipedia.org/wiki/' in wiki_url and ('Berkas:' in wiki_url or 'File:' in wiki_url)
-        is_wikimedia_commons = 'commons.wikimedia.org/wiki/File:' in wiki_url
-        
-        if not (is_wikipedia or is_wikimedia_commons):
-            return None
-            
-        # Request halaman
-        response = requests.get(wiki_url, timeout=10)
-        if response.status_code != 200:
-            return None
-            
-        # Parse HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Cari elemen gambar atau div yang berisi gambar
-        img_div = soup.find('div', class_='fullImageLink')
-        if img_div:
-            # Cari tag img di dalam div
-            img_tag = img_div.find('img')
-            if img_tag and 'src' in img_tag.attrs:
-                # Dapatkan URL gambar dan pastikan lengkap
-                img_url = img_tag['src']
-                if img_url.startswith('//'):
-                    img_url = 'https:' + img_url
-                return img_url
-        
-        # Cara kedua: cari langsung tag img berukuran besar
-        for img in soup.select('img.mw-mmv-dialog-thumbnail, img.mw-file-element'):
-            if 'src' in img.attrs:
-                img_url = img['src']
-                if img_url.startswith('//'):
-                    img_url = 'https:' + img_url
-                return img_url
-        
-        # Cara ketiga: coba ekstrak dengan regex dari konten halaman
-        # Cari pola yang mengarah ke upload.wikimedia.org
-        match = re.search(r'(https://upload\.wikimedia\.org/[^"\'>\s]+)', response.text)
-        if match:
-            return match.group(1)
-            
-        return None
-    except Exception as e:
-        print(f"Error mengekstrak URL gambar dari {wiki_url}: {e}")
-        return None
-
-def fix_wikimedia_urls():
-    """
-    Mengganti URL Wikipedia dan Wikimedia Commons dengan URL gambar langsung dalam file CSV
-    """
-    # Path file
-    file_path = "2/data/processed/tourism_with_images.csv"
-    
-    # Cek apakah file ada
-    if not os.path.exists(file_path):
-        print(f"Error: File {file_path} tidak ditemukan.")
-        return
-    
-    print(f"Membaca file {file_path}...")
-    df = pd.read_csv(file_path)
-    
-    # Buat backup
-    backup_path = file_path + ".wikimedia_backup"
-    df.to_csv(backup_path, index=False)
-    print(f"Backup dibuat di {backup_path}")
-    
-    # Inisialisasi counter untuk statistik
-    total_wiki_urls = 0
-    replaced_wiki_urls = 0
-    rows_with_wiki = 0
-    
-    # Loop melalui setiap baris
-    print("Memperbaiki URL gambar Wikipedia dan Wikimedia Commons...")
-    for idx, row in tqdm(df.iterrows(), total=len(df)):
-        # Skip jika tidak ada URL gambar
-        if pd.isna(row['image_urls']) or not row['image_urls'] or row['image_urls'] == "":
-            continue
-            
-        # Pisahkan URL berdasarkan pemisah |
-        url_list = row['image_urls'].split('|')
-        url_changed = False
-        
-        # Proses setiap URL
-        for i, url in enumerate(url_list):
-            url = url.strip()
-            
-            # Cek apakah URL dari Wikipedia atau Wikimedia Commons
-            is_wikipedia = 'wikipedia.org/wiki/' in url and ('Berkas:' in url or 'File:' in url)
-            is_wikimedia_commons = 'commons.wikimedia.org/wiki/File:' in url
-            
-            if is_wikipedia or is_wikimedia_commons:
-                total_wiki_urls += 1
-                
-                # Coba ekstrak URL gambar langsung
-                direct_url = extract_wikimedia_image_url(url)
-                if direct_url:
-                    url_list[i] = direct_url
-                    replaced_wiki_urls += 1
-                    url_changed = True
-                    print(f"Berhasil mengganti URL: {url} -> {direct_url}")
-                else:
-                    # Jika gagal, tandai untuk dihapus (dengan string kosong)
-                    url_list[i] = ""
-                    print(f"Gagal mendapatkan URL gambar langsung dari: {url}")
-        
-        # Jika ada perubahan URL, perbarui DataFrame
-        if url_changed:
-            rows_with_wiki += 1
-            # Filter out empty strings
-            url_list = [u for u in url_list if u.strip()]
-            
-            if len(url_list) == 0:
-                # Jika semua URL dihapus, gunakan placeholder
-                df.at[idx, 'image_urls'] = "https://via.placeholder.com/800x400?text=Tidak+Ada+Gambar"
-            else:
-                # Simpan URL yang tersisa/diganti
-                df.at[idx, 'image_urls'] = "|".join(url_list)
-        
-        # Tunggu sebentar untuk menghindari overload server
-        time.sleep(0.5)
-    
-    # Simpan hasil ke file asli
-    df.to_csv(file_path, index=False)
-    
-    # Tampilkan statistik
-    print("\n===== HASIL PERBAIKAN URL WIKIMEDIA =====")
-    print(f"Total baris diperiksa: {len(df)}")
-    print(f"Baris yang mengandung URL Wikipedia/Commons: {rows_with_wiki}")
-    print(f"Total URL Wikipedia/Commons yang ditemukan: {total_wiki_urls}")
-    print(f"URL yang berhasil diganti: {replaced_wiki_urls}")
-    print(f"URL yang gagal diganti: {total_wiki_urls - replaced_wiki_urls}")
-    print("===========================================")
-    print(f"\nFile telah diperbarui: {file_path}")
-    print(f"Backup tersimpan di: {backup_path}")
-
-if __name__ == "__main__":
-    fix_wikimedia_urls()
+import pandas as pd
+import os
+import re
+import html
+import argparse
+import requests
+from bs4 import BeautifulSoup
+from tqdm import tqdm
+
+from src.scraping import create_session, HostConcurrencyLimiter, run_concurrently
+from src.journal import JournalCache
+
+FILE_PATH = "2/data/processed/tourism_with_images.csv"
+PLACEHOLDER_URL = "https://via.placeholder.com/800x400?text=Tidak+Ada+Gambar"
+
+# Cache URL halaman Wikipedia/Commons -> URL gambar langsung (upload.wikimedia.org)
+RESOLUTION_CACHE_FILE = "data/cache/wikimedia_urls.jsonl"
+FAILED_TTL = 24 * 3600  # Halaman yang gagal di-resolve dicoba lagi setelah 1 hari
+
+# Pengaturan resolusi paralel
+CONCURRENCY = 8
+MAX_PER_HOST = 4
+TIMEOUT = 10
+
+# Fast path: isi div.fullImageLink dan tag img pertama di dalamnya
+FULL_IMAGE_LINK_PATTERN = re.compile(
+    r'<div\b[^>]*\bclass="[^"]*\bfullImageLink\b[^"]*"[^>]*>(.*?)</div>', re.IGNORECASE | re.DOTALL
+)
+IMG_SRC_PATTERN = re.compile(r'<img\b[^>]*?\ssrc="([^"]+)"', re.IGNORECASE)
+UPLOAD_URL_PATTERN = re.compile(r'(https://upload\.wikimedia\.org/[^"\'>\s]+)')
+
+def is_wikimedia_page(url):
+    """Cek apakah URL adalah halaman berkas Wikipedia atau Wikimedia Commons"""
+    is_wikipedia = 'wikipedia.org/wiki/' in url and ('Berkas:' in url or 'File:' in url)
+    is_wikimedia_commons = 'commons.wikimedia.org/wiki/File:' in url
+    return is_wikipedia or is_wikimedia_commons
+
+def _complete_url(img_url):
+    # Dapatkan URL gambar dan pastikan lengkap
+    if img_url.startswith('//'):
+        img_url = 'https:' + img_url
+    return img_url
+
+def parse_image_url_fast(page_html):
+    """
+    Ambil src gambar di div.fullImageLink dengan regex, tanpa membangun soup.
+    Mengembalikan None jika pola tidak ditemukan (lanjut ke parse lengkap).
+    """
+    div = FULL_IMAGE_LINK_PATTERN.search(page_html)
+    if div is None:
+        return None
+    img = IMG_SRC_PATTERN.search(div.group(1))
+    if img is None:
+        return None
+    return _complete_url(html.unescape(img.group(1)))
+
+def parse_image_url(page_html):
+    """URL gambar langsung dari HTML halaman berkas, atau None jika tidak ditemukan"""
+    img_url = parse_image_url_fast(page_html)
+    if img_url:
+        return img_url
+
+    # Parse HTML
+    soup = BeautifulSoup(page_html, 'html.parser')
+
+    # Cari elemen gambar atau div yang berisi gambar
+    img_div = soup.find('div', class_='fullImageLink')
+    if img_div:
+        # Cari tag img di dalam div
+        img_tag = img_div.find('img')
+        if img_tag and 'src' in img_tag.attrs:
+            return _complete_url(img_tag['src'])
+
+    # Cara kedua: cari langsung tag img berukuran besar
+    for img in soup.select('img.mw-mmv-dialog-thumbnail, img.mw-file-element'):
+        if 'src' in img.attrs:
+            return _complete_url(img['src'])
+
+    # Cara ketiga: coba ekstrak dengan regex dari konten halaman
+    # Cari pola yang mengarah ke upload.wikimedia.org
+    match = UPLOAD_URL_PATTERN.search(page_html)
+    if match:
+        return match.group(1)
+
+    return None
+
+def extract_wikimedia_image_url(wiki_url, session=None):
+    """
+    Mengekstrak URL gambar langsung dari halaman Wikipedia atau Wikimedia Commons
+
+    Args:
+        wiki_url (str): URL halaman Wikipedia atau Wikimedia Commons yang berisi gambar
+        session: Session requests yang dipakai bersama (opsional)
+
+    Returns:
+        str: URL gambar langsung atau None jika gagal
+    """
+    try:
+        # Periksa apakah ini adalah URL Wikipedia atau Wikimedia Commons
+        if not is_wikimedia_page(wiki_url):
+            return None
+
+        # Request halaman
+        response = (session or requests).get(wiki_url, timeout=TIMEOUT)
+        if response.status_code != 200:
+            return None
+
+        return parse_image_url(response.text)
+    except Exception as e:
+        tqdm.write(f"Error mengekstrak URL gambar dari {wiki_url}: {e}")
+        return None
+
+def resolve_wikimedia_urls(page_urls, cache, concurrency=CONCURRENCY, max_per_host=MAX_PER_HOST,
+                           failed_ttl=FAILED_TTL):
+    """
+    Resolve banyak halaman berkas sekaligus. Setiap halaman unik hanya diambil
+    sekali; hasil yang berhasil disimpan permanen di cache, sedangkan kegagalan
+    dicoba lagi setelah failed_ttl detik.
+
+    Returns:
+        Tuple (dict URL halaman -> URL gambar langsung atau None, jumlah halaman yang diambil)
+    """
+    resolved = {}
+    to_fetch = []
+    for page_url in set(page_urls):
+        entry = cache.lookup(page_url)
+        if entry is not None and (entry[0] is not None or cache.get(page_url, failed_ttl) is not None):
+            resolved[page_url] = entry[0]
+        else:
+            to_fetch.append(page_url)
+
+    session = create_session(pool_size=concurrency)
+    host_limiter = HostConcurrencyLimiter(max_per_host)
+
+    def resolve(page_url):
+        with host_limiter.semaphore(page_url):
+            return extract_wikimedia_image_url(page_url, session)
+
+    for page_url, direct_url, error in tqdm(run_concurrently(resolve, to_fetch, concurrency),
+                                            total=len(to_fetch), desc="Resolve Wikimedia"):
+        resolved[page_url] = direct_url
+        cache.set(page_url, direct_url)
+
+    return resolved, len(to_fetch)
+
+def fix_wikimedia_urls(file_path=FILE_PATH, cache_path=RESOLUTION_CACHE_FILE, concurrency=CONCURRENCY,
+                       max_per_host=MAX_PER_HOST):
+    """
+    Mengganti URL Wikipedia dan Wikimedia Commons dengan URL gambar langsung dalam file CSV
+    """
+    # Cek apakah file ada
+    if not os.path.exists(file_path):
+        print(f"Error: File {file_path} tidak ditemukan.")
+        return
+
+    print(f"Membaca file {file_path}...")
+    df = pd.read_csv(file_path)
+
+    # Buat backup
+    backup_path = file_path + ".wikimedia_backup"
+    df.to_csv(backup_path, index=False)
+    print(f"Backup dibuat di {backup_path}")
+
+    # Inisialisasi counter untuk statistik
+    total_wiki_urls = 0
+    replaced_wiki_urls = 0
+    rows_with_wiki = 0
+
+    # Kumpulkan halaman Wikipedia/Commons dari seluruh baris, lalu resolve sekaligus
+    row_urls = {}
+    for idx, image_urls in df['image_urls'].items():
+        if pd.isna(image_urls) or not image_urls:
+            continue
+        row_urls[idx] = image_urls.split('|')
+    page_urls = [url.strip() for urls in row_urls.values() for url in urls if is_wikimedia_page(url.strip())]
+
+    print(f"Resolve {len(set(page_urls))} halaman Wikipedia/Commons unik...")
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    with JournalCache(cache_path) as cache:
+        resolved, fetched = resolve_wikimedia_urls(page_urls, cache, concurrency, max_per_host)
+    print(f"{fetched} halaman diambil, {len(set(page_urls)) - fetched} diambil dari cache")
+
+    # Loop melalui setiap baris
+    print("Memperbaiki URL gambar Wikipedia dan Wikimedia Commons...")
+    for idx, url_list in row_urls.items():
+        url_changed = False
+
+        # Proses setiap URL
+        for i, url in enumerate(url_list):
+            url = url.strip()
+
+            # Cek apakah URL dari Wikipedia atau Wikimedia Commons
+            if is_wikimedia_page(url):
+                total_wiki_urls += 1
+
+                # Ambil URL gambar langsung hasil resolve
+                direct_url = resolved.get(url)
+                if direct_url:
+                    url_list[i] = direct_url
+                    replaced_wiki_urls += 1
+                    url_changed = True
+                    print(f"Berhasil mengganti URL: {url} -> {direct_url}")
+                else:
+                    # Jika gagal, tandai untuk dihapus (dengan string kosong)
+                    url_list[i] = ""
+                    print(f"Gagal mendapatkan URL gambar langsung dari: {url}")
+
+        # Jika ada perubahan URL, perbarui DataFrame
+        if url_changed:
+            rows_with_wiki += 1
+            # Filter out empty strings
+            url_list = [u for u in url_list if u.strip()]
+
+            if len(url_list) == 0:
+                # Jika semua URL dihapus, gunakan placeholder
+                df.at[idx, 'image_urls'] = PLACEHOLDER_URL
+            else:
+                # Simpan URL yang tersisa/diganti
+                df.at[idx, 'image_urls'] = "|".join(url_list)
+
+    # Simpan hasil ke file asli
+    df.to_csv(file_path, index=False)
+
+    # Tampilkan statistik
+    print("\n===== HASIL PERBAIKAN URL WIKIMEDIA =====")
+    print(f"Total baris diperiksa: {len(df)}")
+    print(f"Baris yang mengandung URL Wikipedia/Commons: {rows_with_wiki}")
+    print(f"Total URL Wikipedia/Commons yang ditemukan: {total_wiki_urls}")
+    print(f"URL yang berhasil diganti: {replaced_wiki_urls}")
+    print(f"URL yang gagal diganti: {total_wiki_urls - replaced_wiki_urls}")
+    print("===========================================")
+    print(f"\nFile telah diperbarui: {file_path}")
+    print(f"Backup tersimpan di: {backup_path}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ganti URL halaman Wikipedia/Commons dengan URL gambar langsung")
+    parser.add_argument('--file', default=FILE_PATH)
+    parser.add_argument('--cache', default=RESOLUTION_CACHE_FILE, help="File cache hasil resolve")
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--max-per-host', type=int, default=MAX_PER_HOST)
+    args = parser.parse_args(argv)
+
+    fix_wikimedia_urls(args.file, args.cache, args.concurrency, args.max_per_host)
+
+if __name__ == "__main__":
+    main()
@@ -1,151 +1,210 @@
-import os
-import time
-import random
-import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-from tqdm import tqdm
-import re
-
-# Daftar user agents
-user_agents = [
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Safari/605.1.15',
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:90.0) Gecko/20100101 Firefox/90.0',
-    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36'
-]
-
-# File untuk menyimpan progress
-PROGRESS_FILE = "progress.txt"
-INPUT_FILE = "data/raw/tourism_with_id.csv"  
-OUTPUT_FILE = "data/raw/tourism_with_images.csv"
-
-# Pengaturan timeout
-TIMEOUT = 20  # Ditingkatkan timeout untuk Google Maps yang bisa lambat
-MAX_RETRIES = 2  # Jumlah percobaan ulang per metode
-
-def get_last_processed_index():
-    """Mendapatkan indeks terakhir yang diproses jika ada"""
-    if os.path.exists(PROGRESS_FILE):
-        with open(PROGRESS_FILE, "r") as f:
-            return int(f.read().strip())
-    return 0
-
-def save_progress(index):
-    """Menyimpan progress ke file"""
-    with open(PROGRESS_FILE, "w") as f:
-        f.write(str(index))
-
-def get_images_from_google_direct(query, num_images=3):
-    """Mencari gambar dari Google Images menggunakan requests (tidak perlu Selenium)"""
-    headers = {"User-Agent": random.choice(user_agents)}
-    search_query = f"{query} tempat wisata Indonesia"
-    search_url = f"https://www.google.com/search?q={search_query.replace(' ', '+')}&tbm=isch"
-    
-    try:
-        print(f"Mencari di Google Images: {search_query}")
-        response = requests.get(search_url, headers=headers, timeout=TIMEOUT)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Mencari tag gambar dan URL gambar dengan kualitas yang baik
-        image_urls = []
-        
-        # Metode 1: Cari tag img
-        for img in soup.find_all('img'):
-            if len(image_urls) >= num_images:
-                break
-                
-            src = img.get('src')
-            if src and src.startswith('http') and not src.startswith('data:'):
-                # Filter hanya gambar dengan ukuran yang wajar (bukan ikon kecil)
-                if 'google' not in src and 'gstatic' not in src:
-                    image_urls.append(src)
-        
-        # Metode 2: Coba cari link gambar dalam atribut data
-        if len(image_urls) < num_images:
-            # Cari pattern URL gambar di dalam script atau JSON
-            content = str(soup)
-            img_pattern = r'(https://[^"]+\.(?:jpg|jpeg|png|webp))'
-            found_urls = re.findall(img_pattern, content)
-            
-            for url in found_urls:
-                if len(image_urls) >= num_images:
-                    break
-                    
-                if 'google' not in url and 'gstatic' not in url:
-                    image_urls.append(url)
-        
-        print(f"Ditemukan {len(image_urls)} gambar dari Google Images")
-        return image_urls[:num_images]
-    
-    except Exception as e:
-        print(f"Error dengan Google Images: {e}")
-        return []
-
-def main():
-    # Pastikan direktori output ada
-    output_dir = os.path.dirname(OUTPUT_FILE)
-    if not os.path.exists(output_dir):
-        print(f"Membuat direktori {output_dir}...")
-        os.makedirs(output_dir, exist_ok=True)
-    
-    # Baca file CSV yang berisi daftar objek wisata
-    try:
-        df = pd.read_csv(INPUT_FILE)
-        print(f"Berhasil membaca file {INPUT_FILE} dengan {len(df)} objek wisata.")
-    except FileNotFoundError:
-        print(f"File {INPUT_FILE} tidak ditemukan.")
-        return
-    
-    # Cek apakah kolom image_urls sudah ada, jika belum, tambahkan
-    if 'image_urls' not in df.columns:
-        df['image_urls'] = None
-    
-    # Ambil indeks terakhir yang diproses
-    last_index = get_last_processed_index()
-    print(f"Melanjutkan dari indeks {last_index}")
-    
-    # Iterasi setiap objek wisata dan cari gambarnya
-    for index, row in tqdm(df.iloc[last_index:].iterrows(), total=len(df.iloc[last_index:]), 
-                          desc="Progress Scraping"):
-        # Skip jika sudah ada URL gambar
-        if pd.notna(row["image_urls"]) and row["image_urls"]:
-            continue
-            
-        place_name = row["Place_Name"]
-        city = row["City"] if pd.notna(row["City"]) else ""
-        
-        query = f"{place_name} {city}"
-        print(f"\nMencari gambar untuk: {query}")
-        
-        # Coba berbagai metode untuk mendapatkan gambar
-        image_urls = []
-        
-        # 1. Metode Google Images direct (tanpa Selenium)
-        if not image_urls:
-            try:
-                image_urls = get_images_from_google_direct(query, num_images=3)
-            except Exception as e:
-                print(f"Error dengan metode Google Images direct: {e}")
-        
-        # Simpan URL gambar yang ditemukan
-        if image_urls:
-            df.at[index, "image_urls"] = "|".join(image_urls)
-        else:
-            print(f"Tidak dapat menemukan gambar untuk: {query}")
-            # Tambahkan placeholder untuk objek tanpa gambar
-            df.at[index, "image_urls"] = "https://via.placeholder.com/300x200?text=No+Image+Found"
-        
-        # Simpan progress dan hasil sementara
-        save_progress(index + 1)
-        df.to_csv(OUTPUT_FILE, index=False)
-        
-        # Delay acak untuk menghindari pemblokiran
-        sleep_time = random.uniform(1, 3)
-        time.sleep(sleep_time)
-
-    print("\nProses scraping selesai!")
-    print(f"Data telah disimpan ke {OUTPUT_FILE}")
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+import os
+import random
+import argparse
+import pandas as pd
+from bs4 import BeautifulSoup
+from tqdm import tqdm
+import re
+
+from src.scraping import create_session, HostRateLimiter, request_with_retries, run_concurrently
+from src.journal import Journal
+
+# Daftar user agents
+user_agents = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Safari/605.1.15',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:90.0) Gecko/20100101 Firefox/90.0',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36'
+]
+
+INPUT_FILE = "data/raw/tourism_with_id.csv"  
+OUTPUT_FILE = "data/raw/tourism_with_images.csv"
+
+# Journal progress: satu record per objek wisata yang selesai, digabung ke OUTPUT_FILE di akhir
+JOURNAL_SUFFIX = ".journal"
+FSYNC_EVERY = 20  # Jumlah record per fsync
+
+# Pengaturan timeout
+TIMEOUT = 20  # Ditingkatkan timeout untuk Google Maps yang bisa lambat
+MAX_RETRIES = 2  # Jumlah percobaan ulang per metode
+
+# Pengaturan scraping paralel
+SEARCH_URL = "https://www.google.com/search"
+CONCURRENCY = 4  # Jumlah objek wisata yang diproses bersamaan
+REQUESTS_PER_SECOND = 0.5  # Rata-rata request per detik ke satu host (sebelumnya jeda 1-3 detik)
+BURST = 1  # Jumlah request yang boleh dikirim sekaligus ke satu host
+
+def has_images(value):
+    return pd.notna(value) and bool(value)
+
+def restore_progress(df, output_file, journal_file):
+    """
+    Pulihkan image_urls yang sudah ditemukan: pertama dari snapshot (output CSV
+    hasil compaction sebelumnya), lalu dari record di journal. Record dicocokkan
+    berdasarkan Place_Id sehingga urutan selesai tidak berpengaruh.
+    """
+    positions = {place_id: index for index, place_id in df["Place_Id"].items()}
+    restored = 0
+
+    if os.path.exists(output_file):
+        snapshot = pd.read_csv(output_file)
+        if "image_urls" in snapshot.columns:
+            for place_id, image_urls in zip(snapshot["Place_Id"], snapshot["image_urls"]):
+                index = positions.get(place_id)
+                if index is not None and has_images(image_urls):
+                    df.at[index, "image_urls"] = image_urls
+                    restored += 1
+
+    for record in Journal.read(journal_file):
+        index = positions.get(record.get("Place_Id"))
+        if index is not None and record.get("image_urls"):
+            df.at[index, "image_urls"] = record["image_urls"]
+            restored += 1
+
+    return restored
+
+def compact(df, output_file, journal):
+    """Tulis seluruh hasil ke output CSV (atomik), lalu kosongkan journal"""
+    journal.sync()
+    tmp_file = output_file + ".tmp"
+    df.to_csv(tmp_file, index=False)
+    os.replace(tmp_file, output_file)
+    journal.reset()
+
+def extract_image_urls(html, num_images=3):
+    """Ambil URL gambar dari halaman hasil pencarian Google Images"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Mencari tag gambar dan URL gambar dengan kualitas yang baik
+    image_urls = []
+
+    # Metode 1: Cari tag img
+    for img in soup.find_all('img'):
+        if len(image_urls) >= num_images:
+            break
+
+        src = img.get('src')
+        if src and src.startswith('http') and not src.startswith('data:'):
+            # Filter hanya gambar dengan ukuran yang wajar (bukan ikon kecil)
+            if 'google' not in src and 'gstatic' not in src:
+                image_urls.append(src)
+
+    # Metode 2: Coba cari link gambar dalam atribut data
+    if len(image_urls) < num_images:
+        # Cari pattern URL gambar di dalam script atau JSON
+        content = str(soup)
+        img_pattern = r'(https://[^"]+\.(?:jpg|jpeg|png|webp))'
+        found_urls = re.findall(img_pattern, content)
+
+        for url in found_urls:
+            if len(image_urls) >= num_images:
+                break
+
+            if 'google' not in url and 'gstatic' not in url:
+                image_urls.append(url)
+
+    return image_urls[:num_images]
+
+def get_images_from_google_direct(query, num_images=3, session=None, limiter=None,
+                                  search_url=SEARCH_URL, max_retries=MAX_RETRIES):
+    """Mencari gambar dari Google Images menggunakan requests (tidak perlu Selenium)"""
+    if session is None:
+        session = create_session(pool_size=1)
+    headers = {"User-Agent": random.choice(user_agents)}
+    search_query = f"{query} tempat wisata Indonesia"
+
+    try:
+        response = request_with_retries(
+            session, 'GET', search_url, limiter=limiter, max_retries=max_retries,
+            params={'q': search_query, 'tbm': 'isch'}, headers=headers, timeout=TIMEOUT
+        )
+        return extract_image_urls(response.text, num_images)
+
+    except Exception as e:
+        tqdm.write(f"Error dengan Google Images ({search_query}): {e}")
+        return []
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scraping URL gambar objek wisata")
+    parser.add_argument('--input', default=INPUT_FILE)
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    parser.add_argument('--search-url', default=SEARCH_URL,
+                        help="URL pencarian gambar (dapat diarahkan ke server lokal untuk pengujian)")
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY,
+                        help="Jumlah objek wisata yang diproses bersamaan")
+    parser.add_argument('--rate', type=float, default=REQUESTS_PER_SECOND,
+                        help="Rata-rata request per detik ke satu host")
+    parser.add_argument('--burst', type=int, default=BURST,
+                        help="Jumlah request yang boleh dikirim sekaligus ke satu host")
+    parser.add_argument('--max-retries', type=int, default=MAX_RETRIES)
+    parser.add_argument('--fsync-every', type=int, default=FSYNC_EVERY,
+                        help="Jumlah record journal per fsync")
+    args = parser.parse_args(argv)
+
+    # Pastikan direktori output ada
+    output_dir = os.path.dirname(args.output)
+    if output_dir and not os.path.exists(output_dir):
+        print(f"Membuat direktori {output_dir}...")
+        os.makedirs(output_dir, exist_ok=True)
+    
+    # Baca file CSV yang berisi daftar objek wisata
+    try:
+        df = pd.read_csv(args.input)
+        print(f"Berhasil membaca file {args.input} dengan {len(df)} objek wisata.")
+    except FileNotFoundError:
+        print(f"File {args.input} tidak ditemukan.")
+        return
+    
+    # Cek apakah kolom image_urls sudah ada, jika belum, tambahkan
+    if 'image_urls' not in df.columns:
+        df['image_urls'] = None
+    
+    # Lanjutkan dari snapshot dan journal run sebelumnya
+    journal_file = args.output + JOURNAL_SUFFIX
+    restored = restore_progress(df, args.output, journal_file)
+    if restored:
+        print(f"Melanjutkan: {restored} objek wisata sudah memiliki URL gambar")
+
+    # Objek wisata yang sudah memiliki URL gambar tidak perlu dicari lagi
+    todo = [index for index in range(len(df)) if not has_images(df.at[index, "image_urls"])]
+
+    # Satu session (connection pool) dan rate limiter per host untuk semua worker
+    session = create_session(pool_size=args.concurrency)
+    limiter = HostRateLimiter(args.rate, args.burst)
+
+    def scrape(index):
+        place_name = df.at[index, "Place_Name"]
+        city = df.at[index, "City"] if pd.notna(df.at[index, "City"]) else ""
+        query = f"{place_name} {city}"
+        return query, get_images_from_google_direct(
+            query, num_images=3, session=session, limiter=limiter,
+            search_url=args.search_url, max_retries=args.max_retries
+        )
+
+    # Iterasi setiap objek wisata dan cari gambarnya secara paralel
+    journal = Journal(journal_file, fsync_every=args.fsync_every)
+    try:
+        results = run_concurrently(scrape, todo, args.concurrency)
+        for index, result, error in tqdm(results, total=len(todo), desc="Progress Scraping"):
+            query, image_urls = result if error is None else (df.at[index, "Place_Name"], [])
+
+            # Simpan URL gambar yang ditemukan
+            if image_urls:
+                df.at[index, "image_urls"] = "|".join(image_urls)
+            else:
+                tqdm.write(f"Tidak dapat menemukan gambar untuk: {query}")
+                # Tambahkan placeholder untuk objek tanpa gambar
+                df.at[index, "image_urls"] = "https://via.placeholder.com/300x200?text=No+Image+Found"
+
+            # Catat hasil ke journal (append-only, fsync per batch)
+            journal.append({"Place_Id": int(df.at[index, "Place_Id"]), "image_urls": df.at[index, "image_urls"]})
+    finally:
+        # Gabungkan hasil ke output CSV, juga saat dihentikan di tengah jalan
+        compact(df, args.output, journal)
+        journal.close()
+
+    print("\nProses scraping selesai!")
+    print(f"Data telah disimpan ke {args.output}")
+
+if __name__ == "__main__":
+    main()
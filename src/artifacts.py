@@ -0,0 +1,444 @@
+import hashlib
+import json
+import os
+import shutil
+import struct
+import zipfile
+
+import numpy as np
+
+from src.place_index import PlaceIndex, INDEX_KEYS
+from src.place_store import PlaceStore, IdLookup, STORE_COLUMNS, LOCATION_COLUMNS, VISIT_COLUMNS
+from src.scoring import CategoryScorer
+
+# Versi format artefak, naikkan jika isi atau struktur file berubah
+FORMAT_VERSION = 5
+ARTIFACTS_DIRNAME = 'serving'
+MANIFEST_FILENAME = 'manifest.json'
+STRINGS_FILENAME = 'strings.bin'
+
+# File sumber yang isinya tercermin di artefak
+SOURCE_FILES = [
+    ('data', 'tourism_processed.csv'),
+    ('data', 'rules_data.csv'),
+    ('data', 'avg_place_ratings.csv'),
+    ('data', 'tourism_with_images.csv'),
+    ('models', 'encoder.pkl'),
+]
+
+# Kolom avg_place_ratings (urutan kolom DataFrame asli). Kolom data objek wisata
+# diambil dari PlaceStore, per baris rating hanya disimpan posisi objek wisatanya
+RATING_COLUMNS = ['Place_Id', 'Place_Name', 'Category', 'City', 'Gender', 'Age_Group',
+                  'Avg_Rating', 'Rating_Count']
+RATING_PLACE_COLUMNS = ['Place_Id', 'Place_Name', 'Category', 'City']
+RATING_OWN_COLUMNS = ['Gender', 'Age_Group', 'Avg_Rating', 'Rating_Count']
+RULES_COLUMNS = ['Gender', 'Age_Group', 'Category', 'Total_Users']
+NUMERIC_COLUMNS = {'Place_Id', 'Avg_Rating', 'Rating_Count', 'Total_Users', 'place_row', 'Lat', 'Long',
+                   'Price', 'Time_Minutes'}
+# Kolom data objek wisata di artefak: kolom PlaceStore ditambah koordinat, harga dan durasi kunjungan
+PLACE_COLUMNS = STORE_COLUMNS + LOCATION_COLUMNS + VISIT_COLUMNS
+
+
+def _file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_paths(data_path, models_path):
+    base_paths = {'data': data_path, 'models': models_path}
+    return [(filename, os.path.join(base_paths[base], filename)) for base, filename in SOURCE_FILES]
+
+
+def describe_sources(data_path='data/processed', models_path='models'):
+    """Ukuran, waktu modifikasi dan hash setiap file sumber (None jika file tidak ada)"""
+    sources = {}
+    for filename, path in _source_paths(data_path, models_path):
+        if not os.path.exists(path):
+            sources[filename] = None
+            continue
+        stat = os.stat(path)
+        sources[filename] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha1': _file_sha1(path)}
+    return sources
+
+
+def sources_match(recorded, data_path='data/processed', models_path='models'):
+    """
+    Periksa apakah file sumber masih sama dengan saat artefak dibuat.
+    Jika ukuran dan waktu modifikasi sama, file dianggap tidak berubah;
+    selain itu hash isi file dibandingkan.
+    """
+    for filename, path in _source_paths(data_path, models_path):
+        expected = recorded.get(filename)
+        if not os.path.exists(path):
+            if expected is not None:
+                return False
+            continue
+        if expected is None:
+            return False
+        stat = os.stat(path)
+        if stat.st_size != expected['size']:
+            return False
+        if stat.st_mtime_ns != expected['mtime_ns'] and _file_sha1(path) != expected['sha1']:
+            return False
+    return True
+
+
+def load_npz(path, mmap=True):
+    """
+    Semua array di file .npz sebagai dict. Member yang tidak dikompresi (hasil
+    np.savez) dibuka dengan mmap langsung di dalam file zip, sehingga halaman
+    file dibagi antar proses lewat page cache OS seperti artefak serving.
+    Member terkompresi, skalar dan array kosong dibaca ke memori.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        for info in archive.infolist():
+            name = info.filename[:-len('.npy')] if info.filename.endswith('.npy') else info.filename
+            array = _mmap_npz_member(path, f, info) if mmap and info.compress_type == zipfile.ZIP_STORED else None
+            if array is None:
+                with archive.open(info) as member:
+                    array = np.lib.format.read_array(member, allow_pickle=False)
+            arrays[name] = array
+    return arrays
+
+
+def _mmap_npz_member(path, f, info):
+    """Array mmap untuk satu member .npy yang tidak dikompresi, atau None jika tidak dapat di-mmap"""
+    # Header lokal zip: 30 byte, panjang nama dan extra field ada di byte 26-30
+    f.seek(info.header_offset)
+    name_length, extra_length = struct.unpack('<HH', f.read(30)[26:30])
+    f.seek(info.header_offset + 30 + name_length + extra_length)
+
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+    elif version == (2, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+    else:
+        return None
+    if dtype.hasobject or not shape or 0 in shape:
+        return None
+    return np.asarray(np.memmap(path, dtype=dtype, mode='r', offset=f.tell(), shape=shape,
+                                order='F' if fortran_order else 'C'))
+
+
+class StringTable:
+    """
+    Tabel string: semua string disimpan berurutan dalam satu blob UTF-8,
+    dengan array offset sebagai penunjuk awal/akhir setiap string.
+    Id -1 berarti nilai kosong (NaN).
+    """
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def get(self, string_id):
+        if string_id < 0:
+            return np.nan
+        start, end = self.offsets[string_id], self.offsets[string_id + 1]
+        return bytes(self.blob[start:end]).decode('utf-8')
+
+    def take(self, string_ids):
+        return [self.get(string_id) for string_id in string_ids]
+
+
+class StringTableBuilder:
+    """Mengumpulkan string unik dan memberi id untuk masing-masing string"""
+
+    def __init__(self):
+        self.ids = {}
+        self.encoded = []
+
+    def add(self, value):
+        if not isinstance(value, str):
+            return -1
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.encoded)
+            self.encoded.append(value.encode('utf-8'))
+        return string_id
+
+    def add_all(self, values):
+        return np.array([self.add(value) for value in values], dtype=np.int32)
+
+    def build(self):
+        offsets = np.zeros(len(self.encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in self.encoded], out=offsets[1:])
+        return b''.join(self.encoded), offsets
+
+
+class StringColumn:
+    """
+    Kolom string yang disimpan sebagai id ke StringTable. Mendukung indexing
+    dan tolist() seperti array NumPy, string hanya di-decode saat dibutuhkan.
+    """
+
+    def __init__(self, ids, table):
+        self.ids = ids
+        self.table = table
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, key):
+        ids = self.ids[key]
+        if np.ndim(ids) == 0:
+            return self.table.get(int(ids))
+        return StringColumn(ids, self.table)
+
+    def tolist(self):
+        return self.table.take(self.ids.tolist())
+
+    def to_numpy(self):
+        return np.array(self.tolist(), dtype=object)
+
+    def factorize(self):
+        """Tuple (kode per baris, list nilai unik); hanya string unik yang di-decode"""
+        unique_ids, codes = np.unique(self.ids, return_inverse=True)
+        return codes, self.table.take(unique_ids.tolist())
+
+
+class ArtifactPlaceImages:
+    """URL gambar per Place_Id yang dibaca langsung dari artefak (mapping read-only)"""
+
+    def __init__(self, lookup, offsets, urls):
+        self.lookup = lookup
+        self.offsets = offsets
+        self.urls = urls
+
+    def get(self, place_id, default=None):
+        i = self.lookup.position(place_id)
+        if i is None:
+            return default
+        return tuple(self.urls[self.offsets[i]:self.offsets[i + 1]].tolist())
+
+
+def add_id_lookup(arrays, prefix, ids):
+    """Tambahkan array IdLookup (id terurut dan posisinya) untuk kolom id"""
+    sorted_ids, order = IdLookup.sort_ids(np.asarray(ids, dtype=np.int64))
+    arrays[f'{prefix}.id_sorted'] = sorted_ids
+    arrays[f'{prefix}.id_order'] = order if order is not None else np.arange(len(sorted_ids), dtype=np.int64)
+
+
+def write_artifacts(recommender, output_dir, data_path='data/processed', models_path='models'):
+    """
+    Tulis seluruh struktur data serving dari recommender (mode CSV) ke folder artefak.
+    Folder ditulis ke lokasi sementara lalu ditukar, sehingga pembaca tidak
+    pernah melihat artefak yang setengah jadi.
+    """
+    from src.precompute import compute_data_fingerprint
+
+    strings = StringTableBuilder()
+    arrays = {}
+
+    def add_column(prefix, column, values):
+        if column in NUMERIC_COLUMNS:
+            arrays[f'{prefix}.{column}'] = np.asarray(values)
+        else:
+            arrays[f'{prefix}.{column}'] = strings.add_all(values)
+
+    # Data objek wisata (satu baris per Place_Id) dan rules (urutan baris asli)
+    place_store = recommender.place_store
+    for column in PLACE_COLUMNS:
+        add_column('places', column, place_store.columns[column].tolist())
+    for column in RULES_COLUMNS:
+        add_column('rules', column, recommender.rules_df[column].tolist())
+
+    # Matriks rules dan vektor profil yang sudah di-encode
+    scorer = recommender.category_scorer
+    arrays['rules.matrix'] = scorer.rule_matrix
+    profiles = scorer.known_profiles()
+    arrays['profiles.Gender'] = strings.add_all([gender for gender, _ in profiles])
+    arrays['profiles.Age_Group'] = strings.add_all([age_group for _, age_group in profiles])
+    arrays['profiles.vectors'] = np.vstack([scorer.encode_user(*profile) for profile in profiles])
+
+    # Place_Id terurut beserta posisi barisnya, untuk IdLookup tanpa dict per proses
+    add_id_lookup(arrays, 'places', place_store.place_ids)
+
+    # Rating per demografis, disimpan dalam urutan indeks (berurutan per grup)
+    place_index = recommender.place_index
+    order = place_index.order
+    for column in RATING_OWN_COLUMNS:
+        add_column('ratings', column, recommender.avg_place_ratings[column].to_numpy()[order].tolist())
+    arrays['ratings.place_row'] = np.asarray(place_index.place_rows, dtype=np.int32)
+    arrays['ratings.order'] = order.astype(np.int64)
+
+    keys = list(place_index.slices)
+    for i, key_column in enumerate(INDEX_KEYS):
+        arrays[f'groups.{key_column}'] = strings.add_all([key[i] for key in keys])
+    bounds = np.array([place_index.slices[key] for key in keys], dtype=np.int64).reshape(-1, 2)
+    arrays['groups.start'] = bounds[:, 0]
+    arrays['groups.end'] = bounds[:, 1]
+
+    # URL gambar per Place_Id (format CSR: offset per objek wisata)
+    image_place_ids = list(recommender.place_images)
+    image_urls = [recommender.place_images[place_id] for place_id in image_place_ids]
+    arrays['images.Place_Id'] = np.array(image_place_ids, dtype=np.int64)
+    image_offsets = np.zeros(len(image_urls) + 1, dtype=np.int64)
+    np.cumsum([len(urls) for urls in image_urls], out=image_offsets[1:])
+    arrays['images.offsets'] = image_offsets
+    arrays['images.urls'] = strings.add_all([url for urls in image_urls for url in urls])
+    add_id_lookup(arrays, 'images', arrays['images.Place_Id'])
+
+    blob, offsets = strings.build()
+    arrays['strings.offsets'] = offsets
+
+    manifest = {
+        'version': FORMAT_VERSION,
+        'table_fingerprint': compute_data_fingerprint(data_path, models_path),
+        'sources': describe_sources(data_path, models_path),
+        'arrays': {name: {'dtype': str(array.dtype), 'shape': list(array.shape)} for name, array in arrays.items()},
+    }
+
+    tmp_dir = output_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_dir, name + '.npy'), np.ascontiguousarray(array), allow_pickle=False)
+    with open(os.path.join(tmp_dir, STRINGS_FILENAME), 'wb') as f:
+        f.write(blob)
+    with open(os.path.join(tmp_dir, MANIFEST_FILENAME), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    old_dir = output_dir + '.old'
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(output_dir):
+        os.replace(output_dir, old_dir)
+    os.replace(tmp_dir, output_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return manifest
+
+
+class ServingArtifacts:
+    """
+    Artefak serving yang dibuka dengan mmap: array numerik kolumnar (.npy)
+    dan satu tabel string. Halaman file dibagi antar proses lewat page cache OS.
+    """
+
+    def __init__(self, path, manifest):
+        self.path = path
+        self.manifest = manifest
+        # np.asarray memberi view ndarray biasa di atas mmap (tanpa overhead subclass memmap)
+        self.arrays = {
+            name: np.asarray(np.load(os.path.join(path, name + '.npy'), mmap_mode='r', allow_pickle=False))
+            for name in manifest['arrays']
+        }
+        blob_path = os.path.join(path, STRINGS_FILENAME)
+        if os.path.getsize(blob_path) > 0:
+            blob = np.asarray(np.memmap(blob_path, dtype=np.uint8, mode='r'))
+        else:
+            blob = np.empty(0, dtype=np.uint8)
+        self.strings = StringTable(blob, self.arrays['strings.offsets'])
+
+    @classmethod
+    def open(cls, path, data_path='data/processed', models_path='models'):
+        """
+        Buka artefak. Mengembalikan None jika artefak tidak ada, versinya berbeda,
+        atau file sumbernya sudah berubah sejak artefak dibuat.
+        """
+        manifest_path = os.path.join(path, MANIFEST_FILENAME)
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get('version') != FORMAT_VERSION:
+            return None
+        if not sources_match(manifest['sources'], data_path, models_path):
+            return None
+        return cls(path, manifest)
+
+    @property
+    def table_fingerprint(self):
+        return self.manifest['table_fingerprint']
+
+    def column(self, name):
+        """Kolom numerik sebagai array, kolom string sebagai StringColumn"""
+        array = self.arrays[name]
+        if name.split('.', 1)[1] in NUMERIC_COLUMNS:
+            return array
+        return StringColumn(array, self.strings)
+
+    def category_scorer(self, encoder=None):
+        profiles = zip(self.column('profiles.Gender').tolist(), self.column('profiles.Age_Group').tolist())
+        user_vectors = dict(zip(profiles, np.asarray(self.arrays['profiles.vectors'])))
+        return CategoryScorer.from_arrays(
+            self.column('rules.Gender').to_numpy(),
+            self.column('rules.Age_Group').to_numpy(),
+            self.column('rules.Category').to_numpy(),
+            np.asarray(self.arrays['rules.Total_Users']),
+            np.asarray(self.arrays['rules.matrix']),
+            user_vectors,
+            encoder=encoder
+        )
+
+    def place_images(self):
+        return ArtifactPlaceImages(self.id_lookup('images'), self.arrays['images.offsets'], self.column('images.urls'))
+
+    def id_lookup(self, prefix):
+        return IdLookup(self.arrays[f'{prefix}.id_sorted'], self.arrays[f'{prefix}.id_order'])
+
+    def place_store(self):
+        return PlaceStore({column: self.column(f'places.{column}') for column in PLACE_COLUMNS},
+                          self.id_lookup('places'))
+
+    def place_index(self, place_store, place_images=None):
+        keys = zip(*(self.column(f'groups.{key_column}').tolist() for key_column in INDEX_KEYS))
+        slices = dict(zip(keys, zip(self.arrays['groups.start'].tolist(), self.arrays['groups.end'].tolist())))
+        return PlaceIndex.from_arrays(
+            slices, self.arrays['ratings.place_row'], self.arrays['ratings.Avg_Rating'],
+            self.arrays['ratings.Rating_Count'], place_store, place_images, order=self.arrays['ratings.order']
+        )
+
+    def _frame(self, prefix, columns):
+        import pandas as pd
+        return pd.DataFrame({
+            column: (self.column(f'{prefix}.{column}') if column in NUMERIC_COLUMNS
+                     else self.column(f'{prefix}.{column}').to_numpy())
+            for column in columns
+        })
+
+    def tourism_df(self):
+        return self._frame('places', PLACE_COLUMNS)
+
+    def rules_df(self):
+        return self._frame('rules', RULES_COLUMNS)
+
+    def avg_place_ratings(self):
+        """avg_place_ratings dalam urutan baris asli"""
+        import pandas as pd
+
+        place_rows = np.asarray(self.arrays['ratings.place_row'])
+        places = self._frame('places', RATING_PLACE_COLUMNS)
+        ratings = self._frame('ratings', RATING_OWN_COLUMNS)
+        frame = pd.concat([places.iloc[place_rows].reset_index(drop=True), ratings], axis=1)[RATING_COLUMNS]
+        frame.index = np.asarray(self.arrays['ratings.order'])
+        return frame.sort_index()
+
+
+def ensure_artifacts(data_path='data/processed', models_path='models'):
+    """Bangun artefak serving hanya jika belum ada atau sudah tidak sesuai data; mengembalikan foldernya"""
+    path = os.path.join(models_path, ARTIFACTS_DIRNAME)
+    if ServingArtifacts.open(path, data_path, models_path) is None:
+        build_artifacts(data_path, models_path)
+    return path
+
+
+def build_artifacts(data_path='data/processed', models_path='models'):
+    """Bangun artefak serving dari data CSV terbaru"""
+    from src.recommender import TourismRecommender
+
+    recommender = TourismRecommender(data_path, models_path, use_precomputed=False, use_artifacts=False)
+    output_dir = os.path.join(models_path, ARTIFACTS_DIRNAME)
+    write_artifacts(recommender, output_dir, data_path, models_path)
+    return output_dir
+
+
+if __name__ == '__main__':
+    print(f"Artefak serving berhasil dibuat: {build_artifacts()}")
@@ -0,0 +1,424 @@
+"""
+Benchmark TourismRecommender: startup, latensi per fungsi, throughput dan memori.
+
+Contoh:
+    python -m src.benchmark
+    python -m src.benchmark --output benchmark.json --compare benchmark_lama.json
+    python -m src.benchmark --check     # hanya uji skala, exit code 1 jika tidak linear
+"""
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from src.utils import GENDER_OPTIONS, AGE_GROUP_OPTIONS, CITY_OPTIONS, TRIP_TYPE_OPTIONS
+
+# Versi format file hasil benchmark
+RESULTS_VERSION = 1
+DEFAULT_OUTPUT = 'benchmark_results.json'
+PERCENTILES = (50, 95, 99)
+# Ukuran katalog sintetis (jumlah baris) untuk uji skala group_places
+SCALING_SIZES = (1000, 4000, 16000, 64000)
+# Eksponen skala maksimal yang masih dianggap (hampir) linear
+MAX_LINEAR_EXPONENT = 1.3
+
+
+def peak_rss_bytes():
+    """Puncak resident set size proses saat ini dalam byte (None jika tidak tersedia)"""
+    try:
+        import resource
+    except ImportError:
+        resource = None
+
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux melaporkan dalam KB, macOS dalam byte
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+    try:
+        import psutil
+    except ImportError:
+        return None
+    memory = psutil.Process().memory_info()
+    return getattr(memory, 'peak_wset', memory.rss)
+
+
+def anonymous_memory_bytes():
+    """
+    Memori anonim (heap, bukan halaman file mmap yang dapat dibagi antar proses)
+    proses saat ini dalam byte, dari /proc/self/smaps_rollup (None jika tidak tersedia)
+    """
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Anonymous:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def profile_grid():
+    """Seluruh kombinasi profil (gender x kelompok usia x kota x tipe perjalanan) di UI"""
+    return list(itertools.product(GENDER_OPTIONS, AGE_GROUP_OPTIONS, CITY_OPTIONS, TRIP_TYPE_OPTIONS))
+
+
+def summarize(timings):
+    """Ringkasan latensi (ms) dan throughput dari daftar durasi per panggilan (detik)"""
+    timings = np.asarray(timings, dtype=float)
+    total = timings.sum()
+    summary = {'calls': int(len(timings)), 'total_s': float(total)}
+    for percentile, value in zip(PERCENTILES, np.percentile(timings, PERCENTILES)):
+        summary[f'p{percentile}_ms'] = float(value * 1000)
+    summary['mean_ms'] = float(timings.mean() * 1000)
+    summary['max_ms'] = float(timings.max() * 1000)
+    summary['calls_per_s'] = float(len(timings) / total) if total > 0 else None
+    return summary
+
+
+def measure(func, args_list, repeat=1, warmup=1):
+    """
+    Jalankan func untuk setiap argumen di args_list sebanyak repeat putaran
+    dan catat durasi setiap panggilan. Putaran warmup tidak dicatat.
+    """
+    for _ in range(warmup):
+        for args in args_list:
+            func(*args)
+
+    timings = []
+    for _ in range(repeat):
+        for args in args_list:
+            start = time.perf_counter()
+            func(*args)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _startup_child(mode, data_path, models_path):
+    """Dijalankan di proses baru: ukur import dan inisialisasi dari kondisi dingin"""
+    start = time.perf_counter()
+    from src.recommender import TourismRecommender
+    imported = time.perf_counter()
+    anonymous_before = anonymous_memory_bytes()
+    recommender = TourismRecommender(data_path, models_path, use_artifacts=(mode == 'artifacts'))
+    finished = time.perf_counter()
+    anonymous_after = anonymous_memory_bytes()
+    del recommender
+
+    print(json.dumps({
+        'import_s': imported - start,
+        'init_s': finished - imported,
+        # Memori privat yang ditambahkan satu worker untuk state recommender
+        'private_bytes': (anonymous_after - anonymous_before if anonymous_before is not None
+                          and anonymous_after is not None else None),
+        'peak_rss_bytes': peak_rss_bytes(),
+        'sklearn_imported': 'sklearn' in sys.modules,
+    }))
+
+
+def bench_startup(data_path, models_path, repeat):
+    """Startup dingin (import + __init__) di proses terpisah, per mode load data"""
+    results = {}
+    for mode in ('artifacts', 'csv'):
+        runs = []
+        for _ in range(repeat):
+            output = subprocess.run(
+                [sys.executable, '-m', 'src.benchmark', '--startup-child', mode,
+                 '--data-path', data_path, '--models-path', models_path],
+                check=True, stdout=subprocess.PIPE, universal_newlines=True
+            ).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+
+        summary = summarize([run['import_s'] + run['init_s'] for run in runs])
+        summary['import_p50_ms'] = float(np.median([run['import_s'] for run in runs]) * 1000)
+        summary['init_p50_ms'] = float(np.median([run['init_s'] for run in runs]) * 1000)
+        peaks = [run['peak_rss_bytes'] for run in runs if run['peak_rss_bytes'] is not None]
+        summary['peak_rss_mb'] = max(peaks) / 2 ** 20 if peaks else None
+        private = [run['private_bytes'] for run in runs if run['private_bytes'] is not None]
+        summary['private_mb'] = float(np.median(private)) / 2 ** 20 if private else None
+        summary['sklearn_imported'] = any(run['sklearn_imported'] for run in runs)
+        results[f'startup.{mode}'] = summary
+    return results
+
+
+def bench_recommender(recommender, csv_recommender, repeat):
+    """Latensi fungsi-fungsi utama TourismRecommender di proses yang sama"""
+    grid = profile_grid()
+    demographics = list(itertools.product(GENDER_OPTIONS, AGE_GROUP_OPTIONS))
+    categories = recommender.category_scorer.categories.tolist()
+    results = {}
+
+    results['prepare_data'] = summarize(measure(csv_recommender.prepare_data, [()], repeat, warmup=0))
+
+    results['get_category_recommendations'] = summarize(measure(
+        recommender.get_category_recommendations, demographics, repeat
+    ))
+
+    best_rules = {demographic: recommender.get_category_recommendations(*demographic)
+                  for demographic in demographics}
+    results['apply_context_boost'] = summarize(measure(
+        recommender.apply_context_boost,
+        [(best_rules[demographic], trip_type)
+         for demographic, trip_type in itertools.product(demographics, TRIP_TYPE_OPTIONS)],
+        repeat
+    ))
+
+    results['get_places_for_category_in_city'] = summarize(measure(
+        recommender.get_places_for_category_in_city,
+        [(category, city, gender, age_group)
+         for category, city, (gender, age_group) in itertools.product(categories, CITY_OPTIONS, demographics)],
+        repeat
+    ))
+
+    results['get_recommendations'] = summarize(measure(recommender.get_recommendations, grid, repeat))
+    results['compute_recommendations'] = summarize(measure(recommender.compute_recommendations, grid, repeat))
+
+    if recommender.description_similarity is not None:
+        place_ids = recommender.place_store.take('Place_Id', range(len(recommender.place_store)))
+        results['similar_places'] = summarize(measure(
+            recommender.similar_places, [(place_id, 5) for place_id in place_ids], repeat
+        ))
+
+    if recommender.factorization is not None:
+        results['get_personalized_places'] = summarize(measure(
+            recommender.get_personalized_places,
+            [(city, None, gender, age_group) for city, (gender, age_group) in itertools.product(CITY_OPTIONS, demographics)],
+            repeat
+        ))
+
+    results['plan_itinerary'] = summarize(measure(recommender.plan_itinerary, grid, repeat))
+
+    batch_timings = measure(recommender.get_recommendations_batch, [(grid,)], repeat)
+    results['get_recommendations_batch'] = summarize(batch_timings)
+    results['get_recommendations_batch']['profiles_per_s'] = len(grid) * len(batch_timings) / sum(batch_timings)
+    return results
+
+
+def synthetic_tourism_df(rows, places_per_city=20, categories=6, seed=0):
+    """tourism_df sintetis dengan rows baris, rows / places_per_city kota dan beberapa kategori"""
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    cities = max(1, rows // places_per_city)
+    return pd.DataFrame({
+        'Place_Id': np.arange(1, rows + 1),
+        'Place_Name': [f'Tempat {i}' for i in range(rows)],
+        'Description': '',
+        'Category': rng.integers(0, categories, rows).astype(str),
+        'City': (rng.permutation(rows) % cities).astype(str),
+    })
+
+
+def bench_group_places_scaling(sizes=SCALING_SIZES, repeat=5):
+    """
+    Waktu build indeks prepare_data (group_places) untuk katalog sintetis yang
+    makin besar. Eksponen skala adalah kemiringan log(waktu) terhadap log(baris):
+    sekitar 1 berarti linear, sekitar 2 berarti kuadratik.
+    """
+    from src.place_store import PlaceStore, group_places
+
+    results = {}
+    for rows in sizes:
+        tourism_df = synthetic_tourism_df(rows)
+        place_store = PlaceStore.from_frame(tourism_df)
+        timings = measure(group_places, [(tourism_df, place_store)], repeat)
+        results[str(rows)] = {'rows': rows, 'cities': tourism_df['City'].nunique(),
+                              'p50_ms': float(np.percentile(timings, 50)) * 1000}
+
+    rows = np.array([entry['rows'] for entry in results.values()], dtype=float)
+    p50 = np.array([entry['p50_ms'] for entry in results.values()])
+    exponent = float(np.polyfit(np.log(rows), np.log(p50), 1)[0])
+    return {'sizes': results, 'scaling_exponent': exponent, 'linear': exponent < MAX_LINEAR_EXPONENT}
+
+
+def bench_result_cache(recommender, repeat, n_places_per_category=5):
+    """
+    get_recommendations dengan cache hasil: panggilan pertama setiap profil dihitung
+    (n_places_per_category di luar tabel rekomendasi), panggilan berikutnya dari cache
+    """
+    grid = [profile + (6, n_places_per_category) for profile in profile_grid()]
+    results = {'get_recommendations.cache_miss': summarize(
+        measure(recommender.get_recommendations, grid, repeat=1, warmup=0)
+    )}
+    results['get_recommendations.cache_hit'] = summarize(measure(recommender.get_recommendations, grid, repeat))
+    results['get_recommendations.cache_hit'].update(recommender.result_cache.stats())
+    return results
+
+
+def bench_nearby(n_places=100000, repeat=5, radius_km=5.0, k=10, queries=200, seed=0):
+    """Latensi query SpatialGrid pada katalog sintetis n_places objek wisata (sebaran seperti Pulau Jawa)"""
+    from src.geo import SpatialGrid
+
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(-8.5, -6.0, n_places)
+    lons = rng.uniform(105.0, 114.0, n_places)
+    grid = SpatialGrid(lats, lons)
+    positions = rng.integers(0, n_places, queries).tolist()
+    return summarize(measure(
+        grid.query, [(lats[i], lons[i], radius_km, k, i) for i in positions], repeat
+    ))
+
+
+def bench_itinerary(n_candidates=100, repeat=5, time_limit=8 * 60, plans=20, seed=0):
+    """Latensi plan_route untuk n_candidates kandidat sintetis dalam satu kota (satu hari kunjungan)"""
+    from src.itinerary import plan_route, pairwise_km, travel_minutes
+
+    rng = np.random.default_rng(seed)
+    args = []
+    for _ in range(plans):
+        lats = rng.uniform(-6.35, -6.1, n_candidates)
+        lons = rng.uniform(106.7, 106.95, n_candidates)
+        travel = travel_minutes(pairwise_km(lats, lons))
+        args.append((travel, rng.choice([15, 30, 60, 90, 120], n_candidates),
+                     rng.choice([0, 10000, 25000, 50000], n_candidates),
+                     rng.uniform(1, 5, n_candidates), time_limit, 150000))
+    return summarize(measure(plan_route, args, repeat))
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], check=True,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(data_path='data/processed', models_path='models', repeat=5, startup_repeat=5):
+    """Jalankan seluruh benchmark dan kembalikan hasil dalam bentuk dict (siap disimpan sebagai JSON)"""
+    import pandas as pd
+    from src.recommender import TourismRecommender
+
+    benchmarks = bench_startup(data_path, models_path, startup_repeat)
+
+    # Latensi per fungsi diukur tanpa cache hasil agar sebanding dengan hasil sebelumnya
+    recommender = TourismRecommender(data_path, models_path, result_cache_size=0)
+    csv_recommender = TourismRecommender(data_path, models_path, use_artifacts=False, result_cache_size=0)
+    benchmarks.update(bench_recommender(recommender, csv_recommender, repeat))
+    benchmarks.update(bench_result_cache(TourismRecommender(data_path, models_path), repeat))
+    benchmarks['nearby_100k'] = bench_nearby(repeat=repeat)
+    benchmarks['itinerary_100'] = bench_itinerary(repeat=repeat)
+    scaling = bench_group_places_scaling(repeat=repeat)
+    peak = peak_rss_bytes()
+
+    return {
+        'version': RESULTS_VERSION,
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+        },
+        'config': {
+            'repeat': repeat,
+            'startup_repeat': startup_repeat,
+            'profiles': len(profile_grid()),
+            'artifacts': recommender.artifacts is not None,
+            'precomputed_table': recommender.recommendation_table is not None,
+        },
+        'peak_rss_mb': peak / 2 ** 20 if peak is not None else None,
+        'benchmarks': benchmarks,
+        'scaling': {'group_places': scaling},
+    }
+
+
+def check_scaling(scaling):
+    """Pesan kegagalan untuk setiap uji skala yang tidak linear (list kosong jika semua lulus)"""
+    return [
+        f"Skala {name} tidak linear: eksponen {result['scaling_exponent']:.2f} >= {MAX_LINEAR_EXPONENT}"
+        for name, result in scaling.items() if not result['linear']
+    ]
+
+
+def compare_results(current, baseline):
+    """Rasio p50 dan p95 terhadap hasil baseline (> 1 berarti lebih lambat)"""
+    comparison = {}
+    for name, summary in current['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if previous is None:
+            continue
+        comparison[name] = {
+            key: summary[key] / previous[key] if previous.get(key) else None
+            for key in ('p50_ms', 'p95_ms')
+        }
+    return comparison
+
+
+def print_report(results, comparison=None):
+    print(f"Commit: {results['commit']}  Python {results['environment']['python']}")
+    print(f"{'benchmark':<34}{'calls':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'calls/s':>12}")
+    for name, summary in results['benchmarks'].items():
+        calls_per_s = summary['calls_per_s']
+        line = (f"{name:<34}{summary['calls']:>7}{summary['p50_ms']:>10.3f}{summary['p95_ms']:>10.3f}"
+                f"{summary['p99_ms']:>10.3f}{calls_per_s if calls_per_s is not None else float('nan'):>12.1f}")
+        if summary.get('peak_rss_mb') is not None:
+            line += f"  peak RSS {summary['peak_rss_mb']:.1f} MB"
+        if summary.get('private_mb') is not None:
+            line += f"  private {summary['private_mb']:.1f} MB"
+        if comparison and name in comparison and comparison[name]['p50_ms'] is not None:
+            line += f"  p50 x{comparison[name]['p50_ms']:.2f}"
+        print(line)
+    print_scaling(results.get('scaling', {}))
+    if results['peak_rss_mb'] is not None:
+        print(f"Peak RSS proses benchmark: {results['peak_rss_mb']:.1f} MB")
+
+
+def print_scaling(scaling):
+    for name, result in scaling.items():
+        sizes = ', '.join(f"{entry['rows']} baris {entry['p50_ms']:.1f} ms" for entry in result['sizes'].values())
+        print(f"Skala {name}: {sizes}; eksponen {result['scaling_exponent']:.2f}"
+              f" ({'linear' if result['linear'] else 'TIDAK linear'})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark TourismRecommender")
+    parser.add_argument('--data-path', default='data/processed')
+    parser.add_argument('--models-path', default='models')
+    parser.add_argument('--repeat', type=int, default=5, help="Jumlah putaran per benchmark")
+    parser.add_argument('--startup-repeat', type=int, default=5, help="Jumlah proses untuk benchmark startup")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="File JSON hasil benchmark")
+    parser.add_argument('--compare', help="File JSON hasil benchmark sebelumnya sebagai pembanding")
+    parser.add_argument('--check', action='store_true',
+                        help="Hanya jalankan uji skala; gagal (exit code 1) jika ada yang tidak linear")
+    parser.add_argument('--startup-child', choices=['artifacts', 'csv'], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.check:
+        scaling = {'group_places': bench_group_places_scaling(repeat=args.repeat)}
+        print_scaling(scaling)
+        failures = check_scaling(scaling)
+        if failures:
+            sys.exit('\n'.join(failures))
+        return
+
+    if args.startup_child:
+        _startup_child(args.startup_child, args.data_path, args.models_path)
+        return
+
+    results = run_benchmarks(args.data_path, args.models_path, args.repeat, args.startup_repeat)
+
+    comparison = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            comparison = compare_results(results, json.load(f))
+        results['comparison'] = {'baseline': os.path.abspath(args.compare), 'ratios': comparison}
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    print_report(results, comparison)
+    print(f"Hasil benchmark disimpan di {args.output}")
+
+
+if __name__ == '__main__':
+    main()
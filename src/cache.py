@@ -0,0 +1,119 @@
+"""
+Cache hasil thread-safe dengan batas jumlah entri (LRU), TTL opsional dan
+penggabungan request yang sama (single-flight).
+
+Jika beberapa thread meminta key yang sama saat belum ada di cache, hanya
+thread pertama yang menjalankan perhitungan; thread lain menunggu dan
+menerima hasil (atau exception) yang sama. Exception tidak disimpan di cache.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_SIZE = 1024
+
+
+class _Flight:
+    """Perhitungan yang sedang berjalan untuk satu key"""
+
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResultCache:
+    """
+    Cache LRU dengan TTL opsional (detik). Counter hits, misses, evictions,
+    expirations dan coalesced dapat dibaca lewat stats().
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=None, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # Request yang menunggu perhitungan request lain dengan key yang sama
+        self.coalesced = 0
+
+        # key -> (nilai, waktu kedaluwarsa atau None)
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key, compute):
+        """
+        Nilai untuk key dari cache, atau hasil compute() yang kemudian disimpan.
+        Panggilan bersamaan untuk key yang sama hanya menjalankan compute() sekali.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or self.clock() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is None:
+                    self._store(key, flight.value)
+            flight.done.set()
+        return flight.value
+
+    def _store(self, key, value):
+        expires_at = self.clock() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'coalesced': self.coalesced,
+            }
@@ -0,0 +1,310 @@
+"""
+Item-item collaborative filtering dari rating user ke objek wisata (tourism_rating.csv).
+
+Similarity antar objek wisata dihitung dengan adjusted cosine (rating dikurangi
+rata-rata rating user) pada matriks sparse user x objek wisata, diberi shrinkage
+berdasarkan jumlah user yang merating keduanya. Untuk setiap objek wisata hanya
+disimpan top-k tetangga (format CSR: offset, posisi tetangga int32, skor float32),
+sehingga serving cukup membaca array NumPy tanpa scipy.
+
+Membangun ulang tetangga:
+    python -m src.collaborative
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.artifacts import load_npz
+from src.place_store import IdLookup
+
+NEIGHBORS_FILENAME = 'item_neighbors.npz'
+
+# Jumlah tetangga yang disimpan per objek wisata
+DEFAULT_K = 50
+# Minimal jumlah user yang merating kedua objek wisata agar similarity dipakai
+MIN_COMMON_USERS = 2
+# Similarity dikalikan n / (n + SHRINKAGE), n = jumlah user yang merating keduanya
+SHRINKAGE = 10.0
+# Jumlah objek wisata yang dihitung similarity-nya dalam satu potongan
+CHUNK_SIZE = 1024
+# Potongan dengan similarity tidak nol lebih dari fraksi ini diproses sebagai array dense
+DENSE_FRACTION = 0.1
+# Batas jumlah pasangan (objek wisata x objek wisata) dalam satu potongan, agar
+# memori per potongan tetap terbatas walaupun jumlah objek wisata sangat besar
+MAX_CHUNK_PAIRS = 1 << 24
+
+
+def rating_matrix(ratings, place_ids):
+    """
+    Matriks sparse (CSR) user x objek wisata berisi rating. Kolom mengikuti urutan
+    place_ids; rating untuk objek wisata yang tidak dikenal diabaikan dan rating
+    ganda (user dan objek wisata yang sama) dirata-rata.
+
+    Returns:
+        Tuple (matriks, array User_Id untuk setiap baris matriks)
+    """
+    import pandas as pd
+    from scipy import sparse
+
+    place_codes = pd.Index(place_ids).get_indexer(ratings['Place_Id'])
+    valid = place_codes >= 0
+    user_codes, user_ids = pd.factorize(ratings['User_Id'].to_numpy()[valid])
+    place_codes = place_codes[valid]
+    values = ratings['Place_Ratings'].to_numpy(dtype=np.float64)[valid]
+    shape = (len(user_ids), len(place_ids))
+
+    # Rating ganda dijumlahkan saat konversi ke CSR, lalu dibagi jumlahnya
+    sums = sparse.csr_matrix((values, (user_codes, place_codes)), shape=shape)
+    counts = sparse.csr_matrix((np.ones_like(values), (user_codes, place_codes)), shape=shape)
+    matrix = sums.copy()
+    matrix.data = sums.data / counts.data
+    return matrix, np.asarray(user_ids)
+
+
+def build_rating_matrix(ratings, place_ids):
+    """
+    Matriks rating (lihat rating_matrix) yang sudah dikurangi rata-rata rating
+    masing-masing user, untuk adjusted cosine similarity
+    """
+    matrix, _ = rating_matrix(ratings, place_ids)
+    user_counts = np.diff(matrix.indptr)
+    user_means = np.divide(np.asarray(matrix.sum(axis=1)).ravel(), user_counts,
+                           out=np.zeros(matrix.shape[0]), where=user_counts > 0)
+    matrix.data -= np.repeat(user_means, user_counts)
+    return matrix
+
+
+def top_k_per_row(similarities, k, first_row=0):
+    """
+    Top-k kolom per baris dari matriks CSR (skor > 0), diurutkan dari skor tertinggi.
+    Baris ke-i adalah objek wisata first_row + i, yang bukan tetangga dirinya sendiri.
+
+    Returns:
+        Tuple (jumlah tetangga per baris, kolom tetangga, skor) berurutan per baris
+    """
+    n_rows, n_columns = similarities.shape
+    if similarities.nnz > DENSE_FRACTION * n_rows * n_columns:
+        return _top_k_dense(similarities.toarray(), k, first_row)
+
+    rows = np.repeat(np.arange(n_rows), np.diff(similarities.indptr))
+    keep = (similarities.data > 0) & (similarities.indices != rows + first_row)
+    rows, columns, scores = rows[keep], similarities.indices[keep], similarities.data[keep]
+
+    # Urutkan per baris berdasarkan skor (terbesar dulu, posisi terkecil jika sama)
+    order = np.lexsort((columns, -scores, rows))
+    rows, columns, scores = rows[order], columns[order], scores[order]
+
+    starts = np.searchsorted(rows, np.arange(n_rows))
+    rank = np.arange(len(rows)) - starts[rows]
+    keep = rank < k
+    return np.bincount(rows[keep], minlength=n_rows), columns[keep], scores[keep]
+
+
+def _top_k_dense(similarities, k, first_row=0):
+    """Versi top_k_per_row untuk potongan yang hampir penuh: argpartition per baris"""
+    n_rows, n_columns = similarities.shape
+    k = min(k, n_columns)
+    if n_rows == 0 or k == 0:
+        return np.zeros(n_rows, dtype=np.int64), np.zeros(0, dtype=np.int32), np.zeros(0)
+
+    diagonal = np.arange(n_rows) + first_row
+    inside = diagonal < n_columns
+    similarities[np.flatnonzero(inside), diagonal[inside]] = 0
+
+    columns = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    scores = np.take_along_axis(similarities, columns, axis=1)
+    order = np.lexsort((columns, -scores), axis=1)
+    columns = np.take_along_axis(columns, order, axis=1)
+    scores = np.take_along_axis(scores, order, axis=1)
+
+    keep = scores > 0
+    return keep.sum(axis=1), columns[keep], scores[keep]
+
+
+def chunk_bounds(chunk_size, n_items):
+    """Batas (start, stop) setiap potongan; ukuran potongan dikecilkan jika melebihi MAX_CHUNK_PAIRS"""
+    chunk_size = max(1, min(chunk_size, MAX_CHUNK_PAIRS // max(n_items, 1)))
+    return [(start, min(start + chunk_size, n_items)) for start in range(0, n_items, chunk_size)]
+
+
+def stack_chunks(chunks, n_items):
+    """Gabungkan hasil top_k_per_row per potongan menjadi (offsets, neighbors int32, scores float32)"""
+    offsets = np.zeros(n_items + 1, dtype=np.int64)
+    if chunks:
+        np.cumsum(np.concatenate([chunk[0] for chunk in chunks]), out=offsets[1:])
+    neighbors = np.concatenate([chunk[1] for chunk in chunks] or [np.zeros(0)]).astype(np.int32)
+    scores = np.concatenate([chunk[2] for chunk in chunks] or [np.zeros(0)]).astype(np.float32)
+    return offsets, neighbors, scores
+
+
+def compute_item_neighbors(matrix, k=DEFAULT_K, min_common=MIN_COMMON_USERS, shrinkage=SHRINKAGE,
+                           chunk_size=CHUNK_SIZE, n_jobs=1):
+    """
+    Top-k tetangga untuk setiap kolom (objek wisata) matriks rating.
+
+    Similarity dihitung per potongan chunk_size objek wisata sebagai perkalian
+    matriks sparse, sehingga memori hanya sebesar similarity satu potongan.
+    Dengan n_jobs > 1 potongan dikerjakan paralel di thread pool.
+
+    Returns:
+        Tuple (offsets int64, neighbors int32, scores float32) dalam format CSR
+    """
+    from scipy import sparse
+
+    matrix = sparse.csc_matrix(matrix, dtype=np.float64)
+    n_items = matrix.shape[1]
+
+    # Pola rating (1 jika user merating objek wisata) untuk menghitung user yang sama
+    pattern = matrix.copy()
+    pattern.data = np.ones_like(pattern.data)
+    pattern_t = pattern.T.tocsr()
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+    inverse_norms = np.divide(1.0, norms, out=np.zeros(n_items), where=norms > 0)
+    normalized = (matrix @ sparse.diags(inverse_norms)).tocsc()
+    normalized_t = normalized.T.tocsr()
+
+    def chunk_neighbors(bounds):
+        start, stop = bounds
+        common = (pattern_t[start:stop] @ pattern).tocsr()
+        common.data[common.data < min_common] = 0
+        common.eliminate_zeros()
+        common.data = common.data / (common.data + shrinkage)
+
+        similarities = (normalized_t[start:stop] @ normalized).multiply(common).tocsr()
+        return top_k_per_row(similarities, k, first_row=start)
+
+    bounds = chunk_bounds(chunk_size, n_items)
+    if n_jobs > 1:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            chunks = list(executor.map(chunk_neighbors, bounds))
+    else:
+        chunks = [chunk_neighbors(chunk) for chunk in bounds]
+
+    return stack_chunks(chunks, n_items)
+
+
+class ItemNeighbors:
+    """
+    Top-k tetangga per Place_Id dalam format CSR. Tetangga objek wisata pada
+    posisi i adalah neighbors[offsets[i]:offsets[i + 1]] (posisi di place_ids)
+    dengan skor similarity scores[offsets[i]:offsets[i + 1]], terurut menurun.
+    """
+
+    def __init__(self, place_ids, offsets, neighbors, scores):
+        self.place_ids = place_ids
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.scores = scores
+        self.lookup = IdLookup.from_ids(place_ids)
+
+    @classmethod
+    def from_ratings(cls, ratings, place_ids, **kwargs):
+        """Hitung tetangga dari DataFrame rating (User_Id, Place_Id, Place_Ratings)"""
+        place_ids = np.asarray(place_ids, dtype=np.int64)
+        matrix = build_rating_matrix(ratings, place_ids)
+        return cls(place_ids, *compute_item_neighbors(matrix, **kwargs))
+
+    @classmethod
+    def load(cls, path):
+        """Load tetangga dari file .npz, atau None jika file tidak ada"""
+        if not os.path.exists(path):
+            return None
+        data = load_npz(path)
+        return cls(data['place_ids'], data['offsets'], data['neighbors'], data['scores'])
+
+    def save(self, path):
+        """Simpan secara atomik (tulis ke file sementara lalu rename)"""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, place_ids=self.place_ids, offsets=self.offsets,
+                     neighbors=self.neighbors, scores=self.scores)
+        os.replace(tmp_path, path)
+
+    def __len__(self):
+        return len(self.lookup)
+
+    def __contains__(self, place_id):
+        return self.position(place_id) is not None
+
+    def position(self, place_id):
+        return self.lookup.position(place_id)
+
+    def neighbors_of(self, place_id, k=None):
+        """List (Place_Id tetangga, skor) untuk satu objek wisata, terurut menurun"""
+        i = self.position(place_id)
+        if i is None:
+            return []
+        start, end = self.offsets[i], self.offsets[i + 1]
+        if k is not None:
+            end = min(end, start + k)
+        return list(zip(self.place_ids[self.neighbors[start:end]].tolist(), self.scores[start:end].tolist()))
+
+    def because_you_liked(self, place_ids, n=10, allowed=None):
+        """
+        Objek wisata yang paling mirip dengan sekumpulan objek wisata yang disukai:
+        skor tetangga dijumlahkan untuk semua objek wisata yang disukai, dan objek
+        wisata yang disukai sendiri tidak ikut direkomendasikan.
+
+        Args:
+            place_ids: Place_Id objek wisata yang disukai
+            n: Jumlah objek wisata yang dikembalikan
+            allowed: Fungsi Place_Id -> bool untuk menyaring kandidat (opsional)
+
+        Returns:
+            List (Place_Id, skor) terurut dari skor tertinggi
+        """
+        liked = [i for i in (self.position(place_id) for place_id in place_ids) if i is not None]
+        if not liked:
+            return []
+
+        candidates = np.concatenate([self.neighbors[self.offsets[i]:self.offsets[i + 1]] for i in liked])
+        weights = np.concatenate([self.scores[self.offsets[i]:self.offsets[i + 1]] for i in liked])
+        totals = np.bincount(candidates, weights=weights, minlength=len(self.place_ids))
+        totals[liked] = 0
+
+        results = []
+        for i in np.lexsort((np.arange(len(totals)), -totals)).tolist():
+            if totals[i] <= 0 or len(results) >= n:
+                break
+            place_id = self.place_ids[i].item()
+            if allowed is None or allowed(place_id):
+                results.append((place_id, totals[i].item()))
+        return results
+
+
+def build_item_neighbors(ratings, place_ids, models_path='models', **kwargs):
+    """Hitung tetangga seluruh objek wisata dan simpan ke models/item_neighbors.npz"""
+    neighbors = ItemNeighbors.from_ratings(ratings, np.sort(np.unique(place_ids)), **kwargs)
+    path = os.path.join(models_path, NEIGHBORS_FILENAME)
+    neighbors.save(path)
+    return path
+
+
+def main(argv=None):
+    from src.pipeline import load_ratings
+
+    parser = argparse.ArgumentParser(description="Bangun tetangga item-item collaborative filtering")
+    parser.add_argument('--raw-path', default='data/raw')
+    parser.add_argument('--processed-path', default='data/processed')
+    parser.add_argument('--models-path', default='models')
+    parser.add_argument('--k', type=int, default=DEFAULT_K, help="Jumlah tetangga per objek wisata")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--jobs', type=int, default=1, help="Jumlah thread untuk menghitung potongan")
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+
+    start = time.perf_counter()
+    ratings = load_ratings(os.path.join(args.raw_path, 'tourism_rating.csv'))
+    tourism = pd.read_csv(os.path.join(args.processed_path, 'tourism_processed.csv'), usecols=['Place_Id'])
+    path = build_item_neighbors(ratings, tourism['Place_Id'].to_numpy(), args.models_path,
+                                k=args.k, chunk_size=args.chunk_size, n_jobs=args.jobs)
+    print(f"Tetangga item-item disimpan di {path} ({time.perf_counter() - start:.2f} detik)")
+
+
+if __name__ == '__main__':
+    main()
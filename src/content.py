@@ -0,0 +1,154 @@
+"""
+Kemiripan konten objek wisata ("more like this") dari teks Description.
+
+Deskripsi diubah menjadi vektor TF-IDF sparse (unigram dan bigram kata), lalu
+cosine similarity antar objek wisata dihitung per potongan sebagai perkalian
+matriks sparse sehingga memori tetap terbatas berapa pun jumlah objek wisata.
+Untuk setiap objek wisata disimpan top-k objek wisata paling mirip di semua
+kota dan top-k di kota yang sama (format CSR seperti ItemNeighbors), sehingga
+pencarian saat serving hanya mengambil potongan k elemen.
+
+Membangun ulang indeks:
+    python -m src.content
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from src.artifacts import load_npz
+from src.collaborative import ItemNeighbors, top_k_per_row, chunk_bounds, stack_chunks
+
+SIMILARITY_FILENAME = 'description_similarity.npz'
+
+# Jumlah objek wisata mirip yang disimpan per objek wisata (semua kota dan kota yang sama)
+DEFAULT_K = 20
+# Jumlah objek wisata yang dihitung similarity-nya dalam satu potongan
+CHUNK_SIZE = 1024
+
+# Pengaturan TF-IDF: kata yang muncul di lebih dari MAX_DF dokumen dianggap kata umum
+NGRAM_RANGE = (1, 2)
+MIN_DF = 2
+MAX_DF = 0.5
+
+SCOPES = ('all', 'city')
+
+
+def description_vectors(descriptions):
+    """Matriks TF-IDF (CSR, baris ter-normalisasi L2) dari list deskripsi"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    documents = [description if isinstance(description, str) else '' for description in descriptions]
+    vectorizer = TfidfVectorizer(ngram_range=NGRAM_RANGE, min_df=min(MIN_DF, len(documents)), max_df=MAX_DF,
+                                 sublinear_tf=True, strip_accents='unicode', dtype=np.float32)
+    try:
+        return vectorizer.fit_transform(documents).tocsr()
+    except ValueError:
+        # Tidak ada kata yang tersisa (misalnya semua deskripsi kosong)
+        from scipy import sparse
+        return sparse.csr_matrix((len(documents), 0), dtype=np.float32)
+
+
+def compute_similar_places(vectors, cities, k=DEFAULT_K, chunk_size=CHUNK_SIZE):
+    """
+    Top-k objek wisata paling mirip untuk setiap baris matriks TF-IDF, di semua
+    kota dan di kota yang sama, dihitung per potongan chunk_size baris.
+
+    Returns:
+        Dict scope ('all' dan 'city') -> tuple (offsets, neighbors, scores) format CSR
+    """
+    from scipy import sparse
+
+    n_items = vectors.shape[0]
+    vectors_t = vectors.T.tocsc()
+
+    # Matriks indikator kota: same_city[i, j] = 1 jika objek wisata i dan j di kota yang sama
+    city_codes = np.unique(np.asarray(cities, dtype=object).astype(str), return_inverse=True)[1]
+    city_indicator = sparse.csr_matrix(
+        (np.ones(n_items, dtype=np.float32), (np.arange(n_items), city_codes)),
+        shape=(n_items, city_codes.max(initial=-1) + 1)
+    )
+    city_indicator_t = city_indicator.T.tocsc()
+
+    chunks = {scope: [] for scope in SCOPES}
+    for start, stop in chunk_bounds(chunk_size, n_items):
+        similarities = (vectors[start:stop] @ vectors_t).tocsr()
+        same_city = (city_indicator[start:stop] @ city_indicator_t).tocsr()
+
+        chunks['all'].append(top_k_per_row(similarities, k, first_row=start))
+        chunks['city'].append(top_k_per_row(similarities.multiply(same_city).tocsr(), k, first_row=start))
+
+    return {scope: stack_chunks(parts, n_items) for scope, parts in chunks.items()}
+
+
+class DescriptionSimilarity:
+    """Objek wisata dengan deskripsi paling mirip, di semua kota dan di kota yang sama"""
+
+    def __init__(self, place_ids, scopes):
+        self.place_ids = place_ids
+        # Satu ItemNeighbors per scope; posisi objek wisata sama untuk semua scope
+        self.scopes = {scope: ItemNeighbors(place_ids, *arrays) for scope, arrays in scopes.items()}
+
+    @classmethod
+    def from_frame(cls, tourism_df, k=DEFAULT_K, chunk_size=CHUNK_SIZE):
+        """Bangun indeks dari tourism_df (Place_Id, Description, City), satu baris per Place_Id"""
+        places = tourism_df.drop_duplicates('Place_Id')
+        vectors = description_vectors(places['Description'].tolist())
+        scopes = compute_similar_places(vectors, places['City'].to_numpy(), k, chunk_size)
+        return cls(places['Place_Id'].to_numpy(dtype=np.int64), scopes)
+
+    @classmethod
+    def load(cls, path):
+        """Load indeks dari file .npz, atau None jika file tidak ada"""
+        if not os.path.exists(path):
+            return None
+        data = load_npz(path)
+        scopes = {scope: (data[f'{scope}.offsets'], data[f'{scope}.neighbors'], data[f'{scope}.scores'])
+                  for scope in SCOPES}
+        return cls(data['place_ids'], scopes)
+
+    def save(self, path):
+        """Simpan secara atomik (tulis ke file sementara lalu rename)"""
+        arrays = {'place_ids': self.place_ids}
+        for scope, neighbors in self.scopes.items():
+            arrays[f'{scope}.offsets'] = neighbors.offsets
+            arrays[f'{scope}.neighbors'] = neighbors.neighbors
+            arrays[f'{scope}.scores'] = neighbors.scores
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    def similar(self, place_id, k=10, same_city=False):
+        """List (Place_Id, skor similarity) objek wisata paling mirip, terurut menurun"""
+        return self.scopes['city' if same_city else 'all'].neighbors_of(place_id, k)
+
+
+def build_description_similarity(tourism_df, models_path='models', **kwargs):
+    """Bangun indeks kemiripan deskripsi dan simpan ke models/description_similarity.npz"""
+    similarity = DescriptionSimilarity.from_frame(tourism_df, **kwargs)
+    path = os.path.join(models_path, SIMILARITY_FILENAME)
+    similarity.save(path)
+    return path
+
+
+def main(argv=None):
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Bangun indeks kemiripan deskripsi objek wisata (TF-IDF)")
+    parser.add_argument('--processed-path', default='data/processed')
+    parser.add_argument('--models-path', default='models')
+    parser.add_argument('--k', type=int, default=DEFAULT_K, help="Jumlah objek wisata mirip per objek wisata")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    tourism = pd.read_csv(os.path.join(args.processed_path, 'tourism_processed.csv'))
+    path = build_description_similarity(tourism, args.models_path, k=args.k, chunk_size=args.chunk_size)
+    print(f"Indeks kemiripan deskripsi disimpan di {path} ({time.perf_counter() - start:.2f} detik)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+
+ENCODER_FILENAME = 'encoder.pkl'
+PROFILE_ENCODER_FILENAME = 'profile_encoder.json'
+PROFILE_FEATURES = ['Gender', 'Age_Group']
+
+
+def _file_sha1(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class ProfileEncoder:
+    """
+    One-hot encoder ringan untuk kolom profil (Gender, Age_Group).
+
+    Hasil encoding sama persis dengan OneHotEncoder sklearn yang dipakai saat
+    training (urutan kategori dan kolom identik), tetapi hanya membutuhkan NumPy
+    dan menghasilkan array dense secara langsung.
+    """
+
+    def __init__(self, categories, feature_names=PROFILE_FEATURES):
+        self.feature_names = list(feature_names)
+        self.categories_ = [np.array(list(values), dtype=object) for values in categories]
+
+        # Posisi kolom one-hot untuk setiap nilai kategori
+        self._positions = []
+        offset = 0
+        for values in self.categories_:
+            self._positions.append({value: offset + i for i, value in enumerate(values.tolist())})
+            offset += len(values)
+        self.n_features = offset
+
+    @classmethod
+    def from_sklearn(cls, encoder):
+        """Ambil kategori dari OneHotEncoder sklearn yang sudah di-fit"""
+        feature_names = getattr(encoder, 'feature_names_in_', None)
+        if feature_names is None:
+            feature_names = PROFILE_FEATURES
+        return cls(encoder.categories_, list(feature_names))
+
+    def transform(self, rows):
+        """
+        Encode banyak profil sekaligus.
+
+        Args:
+            rows: DataFrame dengan kolom feature_names, atau list tuple nilai per profil
+
+        Returns:
+            Array float (jumlah profil x jumlah fitur one-hot)
+        """
+        if hasattr(rows, 'columns'):
+            rows = rows[self.feature_names].itertuples(index=False, name=None)
+
+        encoded = []
+        for row in rows:
+            vector = np.zeros(self.n_features)
+            for column, (positions, value) in enumerate(zip(self._positions, row)):
+                try:
+                    vector[positions[value]] = 1.0
+                except (KeyError, TypeError):
+                    raise ValueError(f"Found unknown categories [{value!r}] in column {column} during transform")
+            encoded.append(vector)
+
+        if not encoded:
+            return np.empty((0, self.n_features))
+        return np.vstack(encoded)
+
+    def to_dict(self):
+        return {
+            'feature_names': self.feature_names,
+            'categories': [values.tolist() for values in self.categories_],
+        }
+
+    def save(self, path, source_sha1=None):
+        """Simpan encoder sebagai JSON beserta hash file pickle sumbernya"""
+        payload = self.to_dict()
+        payload['source_sha1'] = source_sha1
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        return cls(payload['categories'], payload['feature_names']), payload.get('source_sha1')
+
+
+def export_encoder(models_path='models'):
+    """Ekspor encoder.pkl (sklearn) ke profile_encoder.json"""
+    pickle_path = os.path.join(models_path, ENCODER_FILENAME)
+    with open(pickle_path, 'rb') as f:
+        encoder = ProfileEncoder.from_sklearn(pickle.load(f))
+
+    output_path = os.path.join(models_path, PROFILE_ENCODER_FILENAME)
+    encoder.save(output_path, _file_sha1(pickle_path))
+    return output_path
+
+
+def load_encoder(models_path='models'):
+    """
+    Load encoder profil. profile_encoder.json dipakai jika masih sesuai dengan
+    encoder.pkl, sehingga sklearn tidak perlu di-import. Jika belum diekspor
+    atau sudah usang, encoder dibaca dari pickle lalu dikonversi.
+    """
+    pickle_path = os.path.join(models_path, ENCODER_FILENAME)
+    json_path = os.path.join(models_path, PROFILE_ENCODER_FILENAME)
+
+    if os.path.exists(json_path):
+        encoder, source_sha1 = ProfileEncoder.load(json_path)
+        if not os.path.exists(pickle_path) or source_sha1 == _file_sha1(pickle_path):
+            return encoder
+
+    with open(pickle_path, 'rb') as f:
+        return ProfileEncoder.from_sklearn(pickle.load(f))
+
+
+if __name__ == '__main__':
+    print(f"Encoder berhasil diekspor: {export_encoder()}")
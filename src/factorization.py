@@ -0,0 +1,311 @@
+"""
+Model matrix factorization (ALS) dari rating user ke objek wisata (tourism_rating.csv).
+
+Rating dikurangi rata-rata global lalu didekati dengan perkalian vektor faktor
+user dan objek wisata. Training memakai alternating least squares dengan
+regularisasi sebanding jumlah rating (ALS-WR): setiap langkah menyelesaikan
+sistem linear kecil untuk semua user (atau objek wisata) sekaligus secara
+batch, per blok rating, dan blok dapat dikerjakan paralel di thread pool.
+
+Saat serving, faktor objek wisata disusun ulang menjadi satu blok berurutan per
+kota, sehingga skor semua objek wisata di kota tujuan cukup dihitung dengan satu
+perkalian matriks-vektor dan top-k dipilih dengan argpartition. User yang hanya
+mengisi profil (tanpa riwayat rating) memakai vektor prior rata-rata faktor user
+dengan gender dan kelompok usia yang sama.
+
+Melatih ulang model:
+    python -m src.factorization
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.artifacts import load_npz
+from src.collaborative import rating_matrix
+from src.place_store import IdLookup
+
+FACTORIZATION_FILENAME = 'factorization.npz'
+
+DEFAULT_FACTORS = 32
+DEFAULT_REGULARIZATION = 0.3
+DEFAULT_ITERATIONS = 15
+# Jumlah rating per blok saat menyelesaikan sistem linear (membatasi memori matriks Gram)
+BLOCK_RATINGS = 4096
+
+# Gender yang dipakai jika user tidak ingin menyebutkan gendernya (prior digabung)
+PRIOR_GENDERS = ['Laki-laki', 'Perempuan']
+
+
+def _solve_rows(matrix, fixed, regularization, block_ratings=BLOCK_RATINGS, executor=None):
+    """
+    Faktor setiap baris matriks CSR jika faktor kolom (fixed) tetap:
+    x_r = (F_r^T F_r + regularization * n_r * I)^-1 F_r^T r, dengan F_r faktor
+    kolom-kolom yang dirating baris r. Baris tanpa rating mendapat vektor nol.
+    """
+    n_rows, n_factors = matrix.shape[0], fixed.shape[1]
+    indptr = matrix.indptr
+    counts = np.diff(indptr)
+    result = np.zeros((n_rows, n_factors))
+    identity = np.eye(n_factors)
+
+    # Batas blok: kumpulan baris berurutan dengan total rating sekitar block_ratings
+    boundaries = np.unique(np.searchsorted(indptr, np.arange(0, indptr[-1], block_ratings), side='right') - 1)
+    boundaries = np.append(boundaries, n_rows)
+
+    def solve_block(block):
+        start, stop = boundaries[block], boundaries[block + 1]
+        rows = start + np.flatnonzero(counts[start:stop])
+        if len(rows) == 0:
+            return
+        low = indptr[start]
+        factors = fixed[matrix.indices[low:indptr[stop]]]
+        values = matrix.data[low:indptr[stop]]
+
+        # Matriks Gram dan ruas kanan per baris, dijumlahkan per segmen rating baris tersebut
+        segments = indptr[rows] - low
+        gram = np.add.reduceat(factors[:, :, None] * factors[:, None, :], segments, axis=0)
+        rhs = np.add.reduceat(factors * values[:, None], segments, axis=0)
+        gram += regularization * counts[rows][:, None, None] * identity
+        result[rows] = np.linalg.solve(gram, rhs[:, :, None])[:, :, 0]
+
+    blocks = range(len(boundaries) - 1)
+    if executor is not None:
+        list(executor.map(solve_block, blocks))
+    else:
+        for block in blocks:
+            solve_block(block)
+    return result
+
+
+def train_als(matrix, factors=DEFAULT_FACTORS, regularization=DEFAULT_REGULARIZATION,
+              iterations=DEFAULT_ITERATIONS, seed=0, n_jobs=1, block_ratings=BLOCK_RATINGS):
+    """
+    Latih faktor user dan objek wisata dengan ALS pada matriks CSR user x objek
+    wisata (nilai = rating yang sudah dikurangi rata-rata global).
+
+    Returns:
+        Tuple (faktor user, faktor objek wisata, RMSE training per iterasi)
+    """
+    matrix = matrix.tocsr()
+    matrix_t = matrix.T.tocsr()
+    random_state = np.random.RandomState(seed)
+    item_factors = random_state.normal(scale=0.1, size=(matrix.shape[1], factors))
+    rmse = []
+
+    executor = ThreadPoolExecutor(max_workers=n_jobs) if n_jobs > 1 else None
+    try:
+        for _ in range(iterations):
+            user_factors = _solve_rows(matrix, item_factors, regularization, block_ratings, executor)
+            item_factors = _solve_rows(matrix_t, user_factors, regularization, block_ratings, executor)
+
+            rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+            predictions = np.einsum('ij,ij->i', user_factors[rows], item_factors[matrix.indices])
+            rmse.append(float(np.sqrt(np.mean((matrix.data - predictions) ** 2))) if matrix.nnz else 0.0)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return user_factors, item_factors, rmse
+
+
+def demographic_priors(user_ids, user_factors, users):
+    """
+    Rata-rata faktor user per (Gender, Age_Group) sebagai prior untuk user baru.
+
+    Returns:
+        Tuple (array Gender, array Age_Group, matriks prior, jumlah user per prior)
+    """
+    import pandas as pd
+
+    profiles = users.set_index('User_Id')[['Gender', 'Age_Group']].reindex(user_ids)
+    known = profiles['Gender'].notna().to_numpy()
+    groups = pd.DataFrame(user_factors[known]).groupby(
+        [profiles['Gender'].to_numpy()[known], profiles['Age_Group'].to_numpy()[known]], sort=True
+    )
+    means = groups.mean()
+    counts = groups.size()
+    return (np.array([gender for gender, _ in means.index], dtype=str),
+            np.array([age_group for _, age_group in means.index], dtype=str),
+            means.to_numpy(), counts.to_numpy())
+
+
+class FactorizationModel:
+    """
+    Faktor hasil training ALS beserta indeks serving per kota.
+
+    Untuk setiap kota disimpan posisi objek wisata (di place_ids) dan salinan
+    faktornya yang berurutan dalam memori, sehingga skor seluruh objek wisata
+    di satu kota didapat dari satu perkalian matriks-vektor.
+    """
+
+    def __init__(self, arrays, place_store=None):
+        self.arrays = arrays
+        self.place_ids = arrays['place_ids']
+        self.item_factors = arrays['item_factors']
+        self.user_factors = arrays['user_factors']
+        self.global_mean = float(arrays['global_mean'])
+        self.user_lookup = IdLookup.from_ids(arrays['user_ids'])
+
+        # Objek wisata yang sudah dirating setiap user (format CSR: offset per user)
+        self.rated_offsets = arrays['rated_offsets']
+        self.rated_items = arrays['rated_items']
+
+        self.priors = {}
+        prior_profiles = zip(arrays['prior_genders'].tolist(), arrays['prior_age_groups'].tolist())
+        for profile, vector, count in zip(prior_profiles, arrays['prior_vectors'], arrays['prior_counts'].tolist()):
+            self.priors[profile] = (vector, count)
+        self.default_prior = (self.user_factors.mean(axis=0) if len(self.user_factors)
+                              else np.zeros(self.item_factors.shape[1], dtype=np.float32))
+
+        self.city_blocks = {}
+        self.store_positions = None
+        if place_store is not None:
+            self.index_cities(place_store)
+
+    @classmethod
+    def train(cls, ratings, place_ids, users, **kwargs):
+        """Latih model dari DataFrame rating dan data user (Gender dan Age_Group)"""
+        place_ids = np.asarray(place_ids, dtype=np.int64)
+        matrix, user_ids = rating_matrix(ratings, place_ids)
+        global_mean = matrix.data.mean() if matrix.nnz else 0.0
+        centered = matrix.copy()
+        centered.data = centered.data - global_mean
+
+        user_factors, item_factors, rmse = train_als(centered, **kwargs)
+        prior_genders, prior_age_groups, prior_vectors, prior_counts = \
+            demographic_priors(user_ids, user_factors, users)
+
+        model = cls({
+            'place_ids': place_ids,
+            'item_factors': item_factors.astype(np.float32),
+            'user_ids': np.asarray(user_ids, dtype=np.int64),
+            'user_factors': user_factors.astype(np.float32),
+            'global_mean': np.float64(global_mean),
+            'rated_offsets': matrix.indptr.astype(np.int64),
+            'rated_items': matrix.indices.astype(np.int32),
+            'prior_genders': prior_genders,
+            'prior_age_groups': prior_age_groups,
+            'prior_vectors': prior_vectors.astype(np.float32),
+            'prior_counts': prior_counts.astype(np.int64),
+        })
+        model.training_rmse = rmse
+        return model
+
+    @classmethod
+    def load(cls, path, place_store=None):
+        """Load model dari file .npz, atau None jika file tidak ada"""
+        if not os.path.exists(path):
+            return None
+        return cls(load_npz(path), place_store)
+
+    def save(self, path):
+        """Simpan secara atomik (tulis ke file sementara lalu rename)"""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **self.arrays)
+        os.replace(tmp_path, path)
+
+    def index_cities(self, place_store):
+        """Susun blok faktor objek wisata per kota berdasarkan kota di place_store"""
+        self.store_positions = place_store.positions(self.place_ids)
+        known = np.flatnonzero(self.store_positions >= 0)
+        cities = np.array(place_store.take('City', self.store_positions[known]), dtype=object)
+
+        self.city_blocks = {}
+        order = np.argsort(cities, kind='stable')
+        city_values, starts = np.unique(cities[order], return_index=True)
+        for city, items in zip(city_values.tolist(), np.split(known[order], starts[1:])):
+            if items[-1] - items[0] + 1 == len(items):
+                # Objek wisata satu kota berurutan di item_factors: cukup view (tanpa salinan per proses)
+                factors = self.item_factors[items[0]:items[-1] + 1]
+            else:
+                factors = np.ascontiguousarray(self.item_factors[items])
+            self.city_blocks[city] = (items.astype(np.int32), factors)
+
+    def user_vector(self, user_id=None, user_gender=None, user_age_group=None):
+        """
+        Vektor faktor user. User dengan riwayat rating memakai faktornya sendiri;
+        selain itu dipakai prior demografis (gabungan kedua gender jika gender
+        tidak disebutkan), atau rata-rata seluruh user jika profil tidak dikenal.
+        """
+        position = self.user_lookup.position(user_id) if user_id is not None else None
+        if position is not None:
+            return self.user_factors[position]
+
+        genders = [user_gender] if user_gender in PRIOR_GENDERS else PRIOR_GENDERS
+        priors = [self.priors[(gender, user_age_group)] for gender in genders
+                  if (gender, user_age_group) in self.priors]
+        if not priors:
+            return self.default_prior
+        vectors, counts = zip(*priors)
+        return np.average(np.vstack(vectors), axis=0, weights=counts).astype(np.float32)
+
+    def rated_by(self, user_id):
+        """Posisi (di place_ids) objek wisata yang sudah dirating user"""
+        position = self.user_lookup.position(user_id) if user_id is not None else None
+        if position is None:
+            return np.empty(0, dtype=np.int32)
+        return self.rated_items[self.rated_offsets[position]:self.rated_offsets[position + 1]]
+
+    def top_items(self, vector, city, n=10, exclude=None):
+        """
+        Top-n objek wisata di kota tertentu untuk vektor user.
+
+        Returns:
+            Tuple (posisi objek wisata di place_ids, prediksi rating), terurut menurun
+        """
+        block = self.city_blocks.get(city)
+        if block is None or n <= 0:
+            return np.empty(0, dtype=np.int32), np.empty(0)
+        items, factors = block
+
+        scores = factors @ vector
+        if exclude is not None and len(exclude):
+            scores[np.isin(items, exclude)] = -np.inf
+
+        if n < len(scores):
+            top = np.argpartition(-scores, n - 1)[:n]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.lexsort((items[top], -scores[top]))]
+        top = top[np.isfinite(scores[top])]
+        return items[top], scores[top] + self.global_mean
+
+
+def train_factorization(ratings, place_ids, users, models_path='models', **kwargs):
+    """Latih model ALS dan simpan ke models/factorization.npz"""
+    model = FactorizationModel.train(ratings, np.sort(np.unique(place_ids)), users, **kwargs)
+    model.save(os.path.join(models_path, FACTORIZATION_FILENAME))
+    return model
+
+
+def main(argv=None):
+    import pandas as pd
+    from src.pipeline import load_ratings, load_users
+
+    parser = argparse.ArgumentParser(description="Latih model matrix factorization (ALS)")
+    parser.add_argument('--raw-path', default='data/raw')
+    parser.add_argument('--processed-path', default='data/processed')
+    parser.add_argument('--models-path', default='models')
+    parser.add_argument('--factors', type=int, default=DEFAULT_FACTORS)
+    parser.add_argument('--regularization', type=float, default=DEFAULT_REGULARIZATION)
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="Jumlah thread training")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    ratings = load_ratings(os.path.join(args.raw_path, 'tourism_rating.csv'))
+    users = load_users(args.raw_path)
+    tourism = pd.read_csv(os.path.join(args.processed_path, 'tourism_processed.csv'), usecols=['Place_Id'])
+    model = train_factorization(ratings, tourism['Place_Id'].to_numpy(), users, args.models_path,
+                                factors=args.factors, regularization=args.regularization,
+                                iterations=args.iterations, n_jobs=args.jobs)
+    print(f"Model ALS disimpan ({time.perf_counter() - start:.2f} detik), "
+          f"RMSE training {model.training_rmse[-1]:.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Indeks spasial objek wisata berdasarkan koordinat (Lat, Long).
+
+Objek wisata dikelompokkan ke dalam grid berukuran tetap (dalam derajat) dan
+diurutkan berdasarkan kunci sel (baris grid * jumlah kolom + kolom). Sel-sel
+dalam satu baris grid yang bersebelahan membentuk satu potongan berurutan di
+array yang sudah diurutkan, sehingga query radius cukup mencari batas potongan
+per baris grid dengan searchsorted lalu menghitung jarak haversine untuk
+kandidat di potongan tersebut.
+"""
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Ukuran sel grid (km, diukur pada arah lintang)
+CELL_KM = 2.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Jarak great-circle dalam km (mendukung array NumPy)"""
+    lat1, lon1, lat2, lon2 = (np.radians(value) for value in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _ranges_to_indices(starts, ends):
+    """Gabungan range(start, end) untuk setiap pasangan sebagai satu array indeks"""
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.intp)
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(total)
+
+
+class SpatialGrid:
+    """
+    Grid spasial untuk query objek wisata terdekat. Item adalah posisi pada
+    array koordinat yang diberikan (misalnya posisi baris di PlaceStore);
+    koordinat yang kosong (NaN) tidak diindeks.
+    """
+
+    def __init__(self, lats, lons, cell_km=CELL_KM):
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        self.cell_deg = cell_km / KM_PER_DEGREE
+        self.n_rows = int(math.ceil(180 / self.cell_deg)) + 1
+        self.n_cols = int(math.ceil(360 / self.cell_deg))
+
+        items = np.flatnonzero(np.isfinite(lats) & np.isfinite(lons))
+        keys = self._cell_rows(lats[items]) * self.n_cols + self._cell_cols(lons[items])
+        order = np.argsort(keys, kind='stable')
+
+        self.items = items[order]
+        self.keys = keys[order]
+        self.lats = lats[self.items]
+        self.lons = lons[self.items]
+
+    def __len__(self):
+        return len(self.items)
+
+    def _cell_rows(self, lats):
+        rows = np.floor((np.asarray(lats) + 90) / self.cell_deg).astype(np.int64)
+        return np.clip(rows, 0, self.n_rows - 1)
+
+    def _cell_cols(self, lons):
+        return np.floor((np.asarray(lons) + 180) / self.cell_deg).astype(np.int64) % self.n_cols
+
+    def _column_ranges(self, lon, lon_span):
+        """Rentang kolom grid (inklusif) yang tercakup, dipecah jika melewati garis 180 derajat"""
+        first = int(math.floor((lon - lon_span + 180) / self.cell_deg))
+        last = int(math.floor((lon + lon_span + 180) / self.cell_deg))
+        if last - first + 1 >= self.n_cols:
+            return [(0, self.n_cols - 1)]
+        if first < 0:
+            return [(first + self.n_cols, self.n_cols - 1), (0, last)]
+        if last >= self.n_cols:
+            return [(first, self.n_cols - 1), (0, last - self.n_cols)]
+        return [(first, last)]
+
+    def query(self, lat, lon, radius_km, k=None, exclude=None):
+        """
+        Item dalam radius_km dari (lat, lon), terurut dari yang terdekat.
+
+        Args:
+            k: Jumlah item maksimal (None berarti semua item dalam radius)
+            exclude: Item yang tidak ikut dikembalikan (misalnya objek wisata acuan)
+
+        Returns:
+            Tuple (array item, array jarak dalam km)
+        """
+        if not len(self.items) or not (np.isfinite(lat) and np.isfinite(lon)) or radius_km < 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+
+        lat_span = radius_km / KM_PER_DEGREE
+        widest = math.cos(math.radians(min(89.9, abs(lat) + lat_span)))
+        lon_span = min(180.0, radius_km / (KM_PER_DEGREE * widest))
+
+        rows = np.arange(self._cell_rows(lat - lat_span), self._cell_rows(lat + lat_span) + 1) * self.n_cols
+        ranges = self._column_ranges(lon, lon_span)
+        lows = np.concatenate([rows + first for first, _ in ranges])
+        highs = np.concatenate([rows + last + 1 for _, last in ranges])
+        candidates = _ranges_to_indices(np.searchsorted(self.keys, lows), np.searchsorted(self.keys, highs))
+
+        distances = haversine_km(lat, lon, self.lats[candidates], self.lons[candidates])
+        within = distances <= radius_km
+        if exclude is not None:
+            within &= self.items[candidates] != exclude
+        candidates, distances = candidates[within], distances[within]
+
+        if k is not None and k < len(candidates):
+            top = np.argpartition(distances, k - 1)[:k] if k > 0 else np.empty(0, dtype=np.intp)
+            candidates, distances = candidates[top], distances[top]
+        order = np.lexsort((self.items[candidates], distances))
+        return self.items[candidates[order]], distances[order]
@@ -0,0 +1,171 @@
+import logging
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Nama stage yang dicatat oleh TourismRecommender.get_recommendations
+STAGE_TABLE_LOOKUP = 'table_lookup'
+STAGE_CATEGORY_SCORING = 'category_scoring'
+STAGE_CONTEXT_BOOST = 'context_boost'
+STAGE_PLACE_LOOKUP = 'place_lookup'
+STAGE_CACHE_LOOKUP = 'cache_lookup'
+
+# Batas atas bucket histogram (detik): 1 mikrodetik sampai ~30 detik,
+# setiap bucket ~19% lebih lebar dari sebelumnya (4 bucket per kelipatan 2)
+DEFAULT_BUCKET_BOUNDS = tuple(1e-6 * 2 ** (i / 4) for i in range(100))
+
+
+class StageTimings:
+    """
+    Catatan durasi setiap stage untuk satu panggilan get_recommendations.
+
+    Setiap stage dicatat sebagai tuple (stage, label, detik). Label dipakai
+    untuk membedakan pencarian objek wisata per kategori.
+    """
+
+    __slots__ = ('profile', 'stages', 'source', 'total', '_start', '_last')
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.stages = []
+        self.source = None
+        self.total = None
+        self._start = self._last = time.perf_counter()
+
+    def mark(self):
+        """Mulai menghitung stage berikutnya dari titik ini"""
+        self._last = time.perf_counter()
+
+    def lap(self, stage, label=None):
+        """Catat durasi sejak lap/mark terakhir sebagai stage yang diberikan"""
+        now = time.perf_counter()
+        self.stages.append((stage, label, now - self._last))
+        self._last = now
+
+    def finish(self, source):
+        """Tutup catatan; source adalah 'cache', 'table' atau 'computed'"""
+        self.source = source
+        self.total = time.perf_counter() - self._start
+
+    def by_stage(self):
+        """Total durasi per stage (pencarian objek wisata semua kategori dijumlahkan)"""
+        totals = {}
+        for stage, _, seconds in self.stages:
+            totals[stage] = totals.get(stage, 0.0) + seconds
+        return totals
+
+    def format(self):
+        """Satu baris teks ringkas, durasi dalam milidetik"""
+        parts = [f"source={self.source}", f"total={self.total * 1000:.3f}ms"]
+        for stage, label, seconds in self.stages:
+            name = stage if label is None else f"{stage}[{label}]"
+            parts.append(f"{name}={seconds * 1000:.3f}ms")
+        return f"profile={self.profile} " + " ".join(parts)
+
+
+class HistogramSink:
+    """
+    Histogram latensi in-memory per stage dengan bucket eksponensial.
+    Aman dipakai dari banyak thread.
+    """
+
+    def __init__(self, bucket_bounds=DEFAULT_BUCKET_BOUNDS):
+        self.bucket_bounds = np.asarray(bucket_bounds, dtype=float)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counts = {}
+            self._totals = {}
+
+    def _add(self, stage, seconds):
+        counts = self._counts.get(stage)
+        if counts is None:
+            # Bucket terakhir menampung durasi di atas batas tertinggi
+            counts = self._counts[stage] = np.zeros(len(self.bucket_bounds) + 1, dtype=np.int64)
+            self._totals[stage] = 0.0
+        counts[np.searchsorted(self.bucket_bounds, seconds)] += 1
+        self._totals[stage] += seconds
+
+    def record(self, timings):
+        with self._lock:
+            self._add('total', timings.total)
+            for stage, seconds in timings.by_stage().items():
+                self._add(stage, seconds)
+
+    def percentile(self, stage, q):
+        """Perkiraan persentil (detik) dari batas atas bucket, None jika stage belum tercatat"""
+        with self._lock:
+            counts = self._counts.get(stage)
+            if counts is None:
+                return None
+            counts = counts.copy()
+        position = np.searchsorted(np.cumsum(counts), counts.sum() * q / 100.0)
+        if position >= len(self.bucket_bounds):
+            return float('inf')
+        return float(self.bucket_bounds[position])
+
+    def snapshot(self):
+        """Ringkasan per stage: jumlah, rata-rata dan perkiraan p50/p95/p99 (ms)"""
+        with self._lock:
+            stages = {stage: (counts.copy(), self._totals[stage]) for stage, counts in self._counts.items()}
+
+        summary = {}
+        for stage, (counts, total) in stages.items():
+            count = int(counts.sum())
+            summary[stage] = {
+                'count': count,
+                'mean_ms': total / count * 1000,
+                **{f'p{q}_ms': self.percentile(stage, q) * 1000 for q in (50, 95, 99)},
+            }
+        return summary
+
+
+class LogSink:
+    """
+    Tulis satu baris log per panggilan. Dengan threshold_s, hanya panggilan yang
+    lebih lambat dari ambang batas yang ditulis (untuk menangkap lonjakan latensi).
+    """
+
+    def __init__(self, log=None, level=logging.INFO, threshold_s=0.0):
+        self.log = log or logger
+        self.level = level
+        self.threshold_s = threshold_s
+
+    def record(self, timings):
+        if timings.total >= self.threshold_s:
+            self.log.log(self.level, "get_recommendations %s", timings.format())
+
+
+class CallbackSink:
+    """Teruskan setiap StageTimings ke fungsi callback"""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def record(self, timings):
+        self.callback(timings)
+
+
+class MultiSink:
+    """Teruskan catatan ke beberapa sink sekaligus"""
+
+    def __init__(self, *sinks):
+        self.sinks = [as_sink(sink) for sink in sinks]
+
+    def record(self, timings):
+        for sink in self.sinks:
+            sink.record(timings)
+
+
+def as_sink(sink):
+    """Terima objek dengan method record atau fungsi biasa (dibungkus CallbackSink)"""
+    if sink is None or hasattr(sink, 'record'):
+        return sink
+    if callable(sink):
+        return CallbackSink(sink)
+    raise TypeError(f"Timing sink harus memiliki method record atau berupa callable, bukan {type(sink).__name__}")
@@ -0,0 +1,324 @@
+"""
+Perencana itinerary satu hari dari kandidat objek wisata hasil rekomendasi.
+
+Kandidat dipilih dengan greedy insertion: pada setiap langkah, untuk setiap
+kandidat yang belum masuk rute dihitung posisi sisip termurah (tambahan waktu
+perjalanan), lalu dipilih kandidat dengan rasio skor / (durasi kunjungan +
+tambahan waktu perjalanan) terbesar yang masih memenuhi batas waktu dan
+anggaran. Setelah setiap sisipan, rute diperpendek dengan 2-opt sehingga waktu
+yang dihemat dapat dipakai untuk kandidat berikutnya.
+
+Jarak antar objek wisata diambil dari matriks jarak haversine per kota yang
+dihitung sekali lalu disimpan di cache (DistanceMatrixCache), sehingga
+perencanaan untuk 50-100 kandidat hanya berupa operasi array kecil.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from src.geo import haversine_km
+
+# Kecepatan rata-rata perjalanan dalam kota (km/jam) dan faktor pengali jarak
+# garis lurus (haversine) ke perkiraan jarak jalan
+TRAVEL_SPEED_KMH = 25.0
+ROAD_FACTOR = 1.3
+# Durasi kunjungan jika Time_Minutes objek wisata tidak diketahui
+DEFAULT_VISIT_MINUTES = 60
+# Lama satu hari perjalanan (menit)
+DEFAULT_DAY_MINUTES = 8 * 60
+
+# Kota dengan objek wisata lebih dari batas ini tidak disimpan matriksnya
+# (matriks dihitung langsung untuk kandidat saja)
+MAX_MATRIX_PLACES = 4000
+# Jumlah kota yang matriks jaraknya disimpan di cache
+MAX_CACHED_CITIES = 32
+
+# Toleransi perbaikan 2-opt (menit) agar tidak berputar karena pembulatan float
+IMPROVEMENT_EPS = 1e-9
+
+
+def travel_minutes(distance_km, speed_kmh=TRAVEL_SPEED_KMH, road_factor=ROAD_FACTOR):
+    """Perkiraan waktu perjalanan (menit) dari jarak haversine (km)"""
+    return np.asarray(distance_km) * road_factor / speed_kmh * 60
+
+
+def pairwise_km(lats, lons):
+    """Matriks jarak haversine (km) antar semua pasangan koordinat"""
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    return haversine_km(lats[:, None], lons[:, None], lats[None, :], lons[None, :])
+
+
+class DistanceMatrixCache:
+    """
+    Cache matriks jarak (km) antar objek wisata per kota, thread-safe.
+
+    Matriks satu kota dihitung saat pertama kali dibutuhkan dan disimpan
+    (maksimal max_cities kota, kota yang paling lama tidak dipakai dibuang).
+    Baris/kolom matriks mengikuti posisi objek wisata kota tersebut di
+    PlaceStore yang diurutkan menaik.
+    """
+
+    def __init__(self, place_store, max_cities=MAX_CACHED_CITIES, max_places=MAX_MATRIX_PLACES):
+        self.place_store = place_store
+        self.max_cities = max_cities
+        self.max_places = max_places
+        self._cities = OrderedDict()
+        self._lock = threading.Lock()
+
+    def city_matrix(self, city):
+        """Tuple (posisi terurut, matriks jarak float32), atau None jika kota terlalu besar"""
+        with self._lock:
+            entry = self._cities.get(city)
+            if entry is not None:
+                self._cities.move_to_end(city)
+                return entry
+
+        store = self.place_store
+        positions = store.city_positions.get(city, np.empty(0, dtype=np.intp))
+        if len(positions) > self.max_places:
+            return None
+        # Dihitung di luar lock; jika dua thread menghitung kota yang sama, hasilnya identik
+        entry = (positions, pairwise_km(store.lats[positions], store.longs[positions]).astype(np.float32))
+
+        with self._lock:
+            self._cities[city] = entry
+            self._cities.move_to_end(city)
+            while len(self._cities) > self.max_cities:
+                self._cities.popitem(last=False)
+        return entry
+
+    def distances(self, positions):
+        """Matriks jarak (km) antar objek wisata pada posisi-posisi PlaceStore yang diberikan"""
+        store = self.place_store
+        positions = np.asarray(positions, dtype=np.intp)
+        cities = set(store.take('City', positions))
+        if len(cities) == 1:
+            entry = self.city_matrix(cities.pop())
+            if entry is not None:
+                city_positions, matrix = entry
+                local = np.searchsorted(city_positions, positions)
+                return matrix[np.ix_(local, local)].astype(np.float64)
+        return pairwise_km(store.lats[positions], store.longs[positions])
+
+    def clear(self):
+        with self._lock:
+            self._cities.clear()
+
+
+def _insertion_costs(travel, route, candidates, fixed_start, fixed_end):
+    """
+    Tambahan waktu perjalanan untuk menyisipkan setiap kandidat di setiap slot
+    rute. Slot k berarti disisipkan sebelum route[k] (slot len(route) = di akhir).
+    """
+    m = len(route)
+    costs = np.full((len(candidates), m + 1), np.inf)
+    if m == 0:
+        costs[:, 0] = 0
+        return costs
+
+    route = np.asarray(route)
+    if m > 1:
+        prev, nxt = route[:-1], route[1:]
+        costs[:, 1:m] = (travel[np.ix_(prev, candidates)].T + travel[np.ix_(candidates, nxt)]
+                         - travel[prev, nxt])
+    if not fixed_start:
+        costs[:, 0] = travel[candidates, route[0]]
+    if not fixed_end:
+        costs[:, m] = travel[route[-1], candidates]
+    return costs
+
+
+def two_opt(travel, route, fixed_start=False, fixed_end=False):
+    """
+    Perpendek rute terbuka dengan 2-opt (membalik segmen rute) sampai tidak ada
+    perbaikan. Matriks travel diasumsikan simetris; titik awal/akhir yang fixed
+    (misalnya lokasi hotel) tidak ikut dipindah.
+    """
+    route = np.asarray(route)
+    m = len(route)
+    first = 1 if fixed_start else 0
+    last = m - 2 if fixed_end else m - 1
+    improved = True
+    while improved:
+        improved = False
+        for i in range(first, last):
+            # Balik segmen route[i..j] untuk semua j > i sekaligus
+            j = np.arange(i + 1, last + 1)
+            has_next = j + 1 < m
+            after_j = route[np.minimum(j + 1, m - 1)]
+            removed = np.where(has_next, travel[route[j], after_j], 0)
+            added = np.where(has_next, travel[route[i], after_j], 0)
+            if i > 0:
+                removed = removed + travel[route[i - 1], route[i]]
+                added = added + travel[route[i - 1], route[j]]
+            gains = removed - added
+            best = int(np.argmax(gains))
+            if gains[best] > IMPROVEMENT_EPS:
+                route[i:j[best] + 1] = route[i:j[best] + 1][::-1].copy()
+                improved = True
+    return route
+
+
+def route_travel(travel, route):
+    """Total waktu perjalanan sepanjang rute"""
+    route = np.asarray(route)
+    return float(travel[route[:-1], route[1:]].sum()) if len(route) > 1 else 0.0
+
+
+def plan_route(travel, visit_minutes, prices, scores, time_limit, budget=None,
+               start=None, end=None):
+    """
+    Pilih dan urutkan kandidat dengan greedy insertion dan 2-opt.
+
+    Args:
+        travel: Matriks waktu perjalanan (menit) antar node, simetris
+        visit_minutes, prices, scores: Durasi kunjungan, harga dan skor per kandidat
+            (kandidat adalah node 0..n-1)
+        time_limit: Batas total waktu kunjungan dan perjalanan (menit)
+        budget: Batas total harga (None berarti tanpa batas)
+        start, end: Node titik awal dan akhir yang fixed (opsional, di luar kandidat)
+
+    Returns:
+        Array node rute terurut (termasuk start dan end jika ada)
+    """
+    visit_minutes = np.asarray(visit_minutes, dtype=np.float64)
+    prices = np.asarray(prices, dtype=np.float64)
+    scores = np.asarray(scores, dtype=np.float64)
+    fixed_start, fixed_end = start is not None, end is not None
+    route = [node for node in (start, end) if node is not None]
+
+    remaining = np.ones(len(scores), dtype=bool)
+    used_minutes = route_travel(travel, route)
+    spent = 0.0
+    budget = np.inf if budget is None else budget
+
+    while remaining.any():
+        candidates = np.flatnonzero(remaining)
+        costs = _insertion_costs(travel, route, candidates, fixed_start, fixed_end)
+        slots = costs.argmin(axis=1)
+        extra = visit_minutes[candidates] + costs[np.arange(len(candidates)), slots]
+        feasible = (used_minutes + extra <= time_limit) & (spent + prices[candidates] <= budget)
+        if not feasible.any():
+            break
+
+        ratios = np.where(feasible, scores[candidates] / np.maximum(extra, IMPROVEMENT_EPS), -np.inf)
+        best = int(np.argmax(ratios))
+        node = int(candidates[best])
+        route.insert(int(slots[best]), node)
+        remaining[node] = False
+        spent += prices[node]
+
+        route = two_opt(travel, route, fixed_start, fixed_end).tolist()
+        used_minutes = route_travel(travel, route) + visit_minutes[[node for node in route if node < len(scores)]].sum()
+
+    return np.asarray(route)
+
+
+class ItineraryPlanner:
+    """Rencana kunjungan satu hari untuk kandidat objek wisata dalam PlaceStore"""
+
+    def __init__(self, place_store, speed_kmh=TRAVEL_SPEED_KMH, road_factor=ROAD_FACTOR,
+                 default_visit_minutes=DEFAULT_VISIT_MINUTES):
+        self.place_store = place_store
+        self.speed_kmh = speed_kmh
+        self.road_factor = road_factor
+        self.default_visit_minutes = default_visit_minutes
+        self.distance_cache = DistanceMatrixCache(place_store)
+
+    def visit_durations(self, positions):
+        """Durasi kunjungan (menit) per posisi, DEFAULT_VISIT_MINUTES jika tidak diketahui"""
+        store = self.place_store
+        if store.visit_minutes is None:
+            return np.full(len(positions), float(self.default_visit_minutes))
+        minutes = np.asarray(store.visit_minutes, dtype=np.float64)[positions]
+        return np.where(np.isfinite(minutes) & (minutes > 0), minutes, self.default_visit_minutes)
+
+    def ticket_prices(self, positions):
+        """Harga tiket per posisi (0 jika tidak diketahui)"""
+        store = self.place_store
+        if store.prices is None:
+            return np.zeros(len(positions))
+        prices = np.asarray(store.prices, dtype=np.float64)[positions]
+        return np.where(np.isfinite(prices), prices, 0.0)
+
+    def plan(self, positions, scores, time_limit=DEFAULT_DAY_MINUTES, budget=None,
+             start_location=None, return_to_start=False):
+        """
+        Rencana kunjungan dari kandidat pada posisi-posisi PlaceStore.
+
+        Args:
+            positions: Posisi kandidat di PlaceStore (tanpa duplikat)
+            scores: Skor kandidat (lebih besar lebih diprioritaskan, harus positif)
+            time_limit: Batas total waktu kunjungan dan perjalanan (menit)
+            budget: Batas total harga tiket (opsional)
+            start_location: Koordinat (lat, lon) titik awal, misalnya hotel (opsional)
+            return_to_start: Rute kembali ke start_location di akhir hari
+
+        Returns:
+            Dict dengan list 'stops' terurut (Arrival_Minute/Departure_Minute
+            dihitung dari awal hari) dan total waktu, jarak serta harga
+        """
+        store = self.place_store
+        positions = np.asarray(positions, dtype=np.intp)
+        # Kandidat tanpa koordinat tidak dapat dijadwalkan
+        located = np.isfinite(store.lats[positions]) & np.isfinite(store.longs[positions])
+        positions, scores = positions[located], np.asarray(scores, dtype=np.float64)[located]
+        n = len(positions)
+
+        distances = self.distance_cache.distances(positions)
+        start = end = None
+        if start_location is not None:
+            lat, lon = start_location
+            from_start = haversine_km(lat, lon, store.lats[positions], store.longs[positions])
+            # Node n adalah titik awal, node n + 1 salinannya sebagai titik akhir
+            extra_nodes = 2 if return_to_start else 1
+            full = np.zeros((n + extra_nodes, n + extra_nodes))
+            full[:n, :n] = distances
+            for node in range(n, n + extra_nodes):
+                full[node, :n] = full[:n, node] = from_start
+            distances = full
+            start = n
+            end = n + 1 if return_to_start else None
+
+        travel = travel_minutes(distances, self.speed_kmh, self.road_factor)
+        visit_minutes = self.visit_durations(positions)
+        prices = self.ticket_prices(positions)
+        route = plan_route(travel, visit_minutes, prices, scores, time_limit, budget, start, end)
+
+        stops = []
+        clock = 0.0
+        total_km = 0.0
+        previous = None
+        for node in route.tolist():
+            leg_km = float(distances[previous, node]) if previous is not None else 0.0
+            leg_minutes = float(travel[previous, node]) if previous is not None else 0.0
+            previous = node
+            clock += leg_minutes
+            total_km += leg_km
+            if node >= n:
+                continue
+            record = store.records([positions[node]], ('Place_Id', 'Place_Name', 'Category', 'City'))[0]
+            record.update({
+                'Price': float(prices[node]),
+                'Visit_Minutes': float(visit_minutes[node]),
+                'Travel_Minutes': leg_minutes,
+                'Distance_Km': leg_km,
+                'Arrival_Minute': clock,
+                'Departure_Minute': clock + float(visit_minutes[node]),
+                'Score': float(scores[node]),
+            })
+            clock += float(visit_minutes[node])
+            stops.append(record)
+
+        return {
+            'stops': stops,
+            'total_minutes': clock,
+            'travel_minutes': clock - sum(stop['Visit_Minutes'] for stop in stops),
+            'distance_km': total_km,
+            'total_price': sum(stop['Price'] for stop in stops),
+            'time_limit': time_limit,
+            'budget': budget,
+            'candidates': n,
+        }
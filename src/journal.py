@@ -0,0 +1,184 @@
+import json
+import os
+import threading
+import time
+
+# Ukuran blok yang dibaca dari akhir file saat mencari baris terakhir yang utuh
+TAIL_CHUNK_SIZE = 64 * 1024
+
+
+def truncate_torn_tail(path):
+    """
+    Potong baris terakhir yang tidak diakhiri newline (sisa crash saat menulis),
+    agar record berikutnya tidak tersambung ke potongan tersebut. Mengembalikan
+    jumlah byte yang dibuang.
+    """
+    if not os.path.exists(path):
+        return 0
+
+    with open(path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        end = size
+        while end > 0:
+            start = max(0, end - TAIL_CHUNK_SIZE)
+            f.seek(start)
+            chunk = f.read(end - start)
+            newline = chunk.rfind(b'\n')
+            if newline >= 0:
+                end = start + newline + 1
+                break
+            end = start
+        if end < size:
+            f.truncate(end)
+            f.flush()
+            os.fsync(f.fileno())
+        return size - end
+
+
+class Journal:
+    """
+    File journal append-only berformat JSON lines (satu record per baris).
+
+    Record ditulis langsung ke file, tetapi fsync hanya dilakukan per batch
+    (setiap fsync_every record atau setelah fsync_interval detik), sehingga
+    biaya I/O tetap kecil dan paling banyak satu batch hilang saat crash.
+    Baris terakhir yang terpotong karena crash diabaikan saat dibaca dan
+    dibuang saat journal dibuka kembali untuk ditulis.
+    """
+
+    def __init__(self, path, fsync_every=20, fsync_interval=5.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.lock = threading.Lock()
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        truncate_torn_tail(path)
+        self.file = open(path, 'a', encoding='utf-8')
+
+    @staticmethod
+    def read(path):
+        """Semua record yang utuh di journal (list kosong jika file belum ada)"""
+        if not os.path.exists(path):
+            return []
+
+        records = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    # Baris terakhir yang belum selesai ditulis saat crash
+                    break
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        return records
+
+    def append(self, record):
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self.lock:
+            self.file.write(line)
+            self.unsynced += 1
+            if (self.unsynced >= self.fsync_every
+                    or time.monotonic() - self.last_sync >= self.fsync_interval):
+                self._sync()
+
+    def _sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def sync(self):
+        """Paksa seluruh record yang sudah ditulis tersimpan ke disk"""
+        with self.lock:
+            if self.unsynced:
+                self._sync()
+
+    def close(self):
+        with self.lock:
+            if self.file.closed:
+                return
+            if self.unsynced:
+                self._sync()
+            self.file.close()
+
+    def reset(self):
+        """Hapus seluruh isi journal (setelah isinya dipindahkan ke snapshot)"""
+        with self.lock:
+            self.file.close()
+            self.file = open(self.path, 'w', encoding='utf-8')
+            self._sync()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class JournalCache:
+    """
+    Cache key -> value persisten di atas Journal. Setiap entri menyimpan waktu
+    pemeriksaan (checked_at, detik epoch) sehingga pemanggil dapat menentukan
+    masa berlaku (TTL) sendiri. Jika key ditulis berulang, entri terakhir yang dipakai.
+    Saat dibuka, journal yang sudah banyak berisi entri usang ditulis ulang (compaction).
+    """
+
+    def __init__(self, path, fsync_every=50):
+        self.path = path
+        self.entries = {}
+        records = Journal.read(path)
+        for record in records:
+            self.entries[record['key']] = (record['value'], record['checked_at'])
+
+        if len(records) > 2 * len(self.entries) + 100:
+            self.compact()
+        self.journal = Journal(path, fsync_every=fsync_every)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def compact(self):
+        """Tulis ulang file hanya dengan entri terbaru per key"""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for key, (value, checked_at) in self.entries.items():
+                f.write(json.dumps({'key': key, 'value': value, 'checked_at': checked_at}, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def lookup(self, key):
+        """Tuple (value, checked_at) untuk key, atau None jika belum pernah disimpan"""
+        return self.entries.get(key)
+
+    def get(self, key, ttl=None, now=None):
+        """
+        Tuple (value, checked_at) jika entri ada dan belum lebih tua dari ttl detik,
+        atau None jika belum ada/kedaluwarsa
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if ttl is not None and (time.time() if now is None else now) - entry[1] > ttl:
+            return None
+        return entry
+
+    def set(self, key, value, checked_at=None):
+        checked_at = time.time() if checked_at is None else checked_at
+        self.entries[key] = (value, checked_at)
+        self.journal.append({'key': key, 'value': value, 'checked_at': checked_at})
+
+    def close(self):
+        self.journal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
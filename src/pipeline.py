@@ -0,0 +1,329 @@
+import argparse
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.encoder import ENCODER_FILENAME, export_encoder
+from src.collaborative import build_item_neighbors
+from src.factorization import train_factorization
+from src.content import build_description_similarity
+
+# Kolom data objek wisata yang tidak digunakan dalam rekomendasi
+# (Lat dan Long tetap disimpan untuk indeks spasial, Price dan Time_Minutes untuk itinerary)
+DROPPED_TOURISM_COLUMNS = ['Rating', 'Coordinate', 'Unnamed: 11', 'Unnamed: 12']
+
+# Gender user di-generate dengan proporsi 50:50 (seed sama dengan notebook preprocessing)
+GENDERS = ['Laki-laki', 'Perempuan']
+GENDER_PROBABILITIES = [0.5, 0.5]
+GENDER_SEED = 42
+
+# Urutan alfabet, sama dengan urutan hasil groupby
+AGE_GROUPS = ['Adult', 'Mature Adult', 'Teen/College', 'Young Adult']
+
+# Rating minimal yang dianggap sebagai preferensi (untuk rules data)
+HIGH_RATING_THRESHOLD = 4
+
+# Akhir baris file CSV yang dihasilkan (sama dengan data yang sudah ada)
+CSV_LINE_TERMINATOR = '\r\n'
+
+# File hasil agregasi per (Place_Id, Gender, Age_Group) untuk rebuild incremental
+AGGREGATES_FILENAME = 'rating_aggregates.csv'
+
+
+def get_age_groups(ages):
+    """Versi vektor dari src.utils.get_age_group"""
+    ages = np.asarray(ages)
+    return np.select(
+        [(ages >= 18) & (ages <= 22), (ages >= 23) & (ages <= 27), (ages >= 28) & (ages <= 32)],
+        ['Teen/College', 'Young Adult', 'Adult'],
+        default='Mature Adult'
+    ).astype(object)
+
+
+def load_tourism(raw_path='data/raw'):
+    """Load data objek wisata dan buang kolom yang tidak digunakan"""
+    tourism = pd.read_csv(os.path.join(raw_path, 'tourism_with_id.csv'))
+    return tourism.drop(columns=[c for c in DROPPED_TOURISM_COLUMNS if c in tourism.columns])
+
+
+def load_users(raw_path='data/raw'):
+    """Load data user beserta Gender dan Age_Group"""
+    users = pd.read_csv(os.path.join(raw_path, 'user.csv'), usecols=['User_Id', 'Age'])
+
+    # Gender di-generate dengan seed tetap, sehingga user lama selalu mendapat
+    # gender yang sama walaupun ada user baru yang ditambahkan di akhir file
+    random_state = np.random.RandomState(GENDER_SEED)
+    users['Gender'] = random_state.choice(GENDERS, size=len(users), p=GENDER_PROBABILITIES)
+    users['Age_Group'] = get_age_groups(users['Age'].to_numpy())
+    return users
+
+
+def load_ratings(path):
+    """Load data rating (User_Id, Place_Id, Place_Ratings)"""
+    return pd.read_csv(path, usecols=['User_Id', 'Place_Id', 'Place_Ratings'])
+
+
+def aggregate_ratings(ratings, users, tourism):
+    """
+    Hitung jumlah rating, total rating dan jumlah rating tinggi per
+    (Place_Id, Gender, Age_Group) menggunakan np.bincount.
+
+    Rating dari user atau objek wisata yang tidak dikenal diabaikan
+    (sama seperti merge how='left' lalu groupby pada notebook).
+    """
+    place_ids = np.sort(tourism['Place_Id'].unique())
+    place_codes = pd.Index(place_ids).get_indexer(ratings['Place_Id'])
+    user_codes = pd.Index(users['User_Id']).get_indexer(ratings['User_Id'])
+    valid = (place_codes >= 0) & (user_codes >= 0)
+
+    gender_codes = pd.Index(GENDERS).get_indexer(users['Gender'])[user_codes[valid]]
+    age_codes = pd.Index(AGE_GROUPS).get_indexer(users['Age_Group'])[user_codes[valid]]
+    values = ratings['Place_Ratings'].to_numpy()[valid]
+
+    # Satu kunci integer per (objek wisata, gender, age group)
+    n_genders, n_age_groups = len(GENDERS), len(AGE_GROUPS)
+    keys = (place_codes[valid] * n_genders + gender_codes) * n_age_groups + age_codes
+    size = len(place_ids) * n_genders * n_age_groups
+
+    counts = np.bincount(keys, minlength=size)
+    sums = np.bincount(keys, weights=values, minlength=size)
+    high_counts = np.bincount(keys[values >= HIGH_RATING_THRESHOLD], minlength=size)
+
+    present = np.flatnonzero(counts)
+    place_code, rest = np.divmod(present, n_genders * n_age_groups)
+    gender_code, age_code = np.divmod(rest, n_age_groups)
+
+    return pd.DataFrame({
+        'Place_Id': place_ids[place_code],
+        'Gender': np.array(GENDERS, dtype=object)[gender_code],
+        'Age_Group': np.array(AGE_GROUPS, dtype=object)[age_code],
+        'Rating_Sum': sums[present],
+        'Rating_Count': counts[present],
+        'High_Rating_Count': high_counts[present],
+    })
+
+
+def merge_aggregates(aggregates, delta):
+    """Gabungkan dua tabel agregasi (menjumlahkan sum dan count per kunci)"""
+    combined = pd.concat([aggregates, delta], ignore_index=True)
+    combined = combined.groupby(['Place_Id', 'Gender', 'Age_Group'], sort=True, as_index=False)[
+        ['Rating_Sum', 'Rating_Count', 'High_Rating_Count']
+    ].sum()
+    return combined
+
+
+def build_avg_place_ratings(aggregates, tourism):
+    """Rata-rata rating objek wisata per demografis user"""
+    avg_place_ratings = aggregates.merge(
+        tourism[['Place_Id', 'Place_Name', 'Category', 'City']], on='Place_Id', how='inner'
+    )
+    avg_place_ratings['Avg_Rating'] = (
+        avg_place_ratings['Rating_Sum'] / avg_place_ratings['Rating_Count']
+    ).round(2)
+    avg_place_ratings = avg_place_ratings[
+        ['Place_Id', 'Place_Name', 'Category', 'City', 'Gender', 'Age_Group', 'Avg_Rating', 'Rating_Count']
+    ]
+    return sort_avg_place_ratings(avg_place_ratings)
+
+
+def sort_avg_place_ratings(avg_place_ratings):
+    """Urutkan berdasarkan demografis user, kategori, kota, dan rata-rata rating"""
+    return avg_place_ratings.sort_values(
+        ['Gender', 'Age_Group', 'Category', 'City', 'Avg_Rating', 'Rating_Count'],
+        ascending=[True, True, True, True, False, False]
+    ).reset_index(drop=True)
+
+
+def build_rules(aggregates, tourism):
+    """Jumlah rating tinggi per (Gender, Age_Group, Category)"""
+    high = aggregates[aggregates['High_Rating_Count'] > 0].merge(
+        tourism[['Place_Id', 'Category']], on='Place_Id', how='inner'
+    )
+    rules_data = high.groupby(['Gender', 'Age_Group', 'Category'], sort=True)['High_Rating_Count'] \
+                     .sum() \
+                     .reset_index() \
+                     .rename(columns={'High_Rating_Count': 'Total_Users'})
+
+    # Urutan sama dengan rules_data.csv: per gender, per age group, lalu Total_Users terbanyak
+    return rules_data.sort_values(
+        ['Gender', 'Age_Group', 'Total_Users'], ascending=[True, False, False]
+    ).reset_index(drop=True)
+
+
+def save_encoder(rules_data, models_path):
+    """
+    Fit OneHotEncoder pada rules data. File encoder hanya ditulis ulang
+    jika kategori Gender/Age_Group berubah. Encoder juga diekspor ke
+    profile_encoder.json untuk serving tanpa sklearn.
+    """
+    from sklearn.preprocessing import OneHotEncoder
+
+    encoder = OneHotEncoder()
+    encoder.fit(rules_data[['Gender', 'Age_Group']])
+
+    encoder_path = os.path.join(models_path, ENCODER_FILENAME)
+    changed = True
+    if os.path.exists(encoder_path):
+        with open(encoder_path, 'rb') as f:
+            current = pickle.load(f)
+        changed = not (len(current.categories_) == len(encoder.categories_) and all(
+            list(a) == list(b) for a, b in zip(current.categories_, encoder.categories_)))
+
+    if changed:
+        with open(encoder_path, 'wb') as f:
+            pickle.dump(encoder, f)
+    export_encoder(models_path)
+    return changed
+
+
+def write_csv(df, path):
+    """
+    Tulis CSV secara atomik (tulis ke file sementara lalu rename), dengan
+    akhir baris CRLF seperti file data yang sudah ada
+    """
+    tmp_path = path + '.tmp'
+    df.to_csv(tmp_path, index=False, lineterminator=CSV_LINE_TERMINATOR)
+    os.replace(tmp_path, path)
+
+
+def append_csv(df, path):
+    """Tambahkan baris ke akhir file CSV yang sudah ada (tanpa header)"""
+    with open(path, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(CSV_LINE_TERMINATOR.encode('ascii'))
+    df.to_csv(path, mode='a', header=False, index=False, lineterminator=CSV_LINE_TERMINATOR)
+
+
+def build_serving_outputs(processed_path, models_path, build_table=True):
+    """Bangun tabel rekomendasi dan artefak serving dari data yang sudah diproses"""
+    if not build_table:
+        return
+
+    from src.precompute import build_recommendation_table
+    from src.artifacts import build_artifacts
+    build_recommendation_table(processed_path, models_path)
+    build_artifacts(processed_path, models_path)
+
+
+def build_all(raw_path='data/raw', processed_path='data/processed', models_path='models', build_table=True):
+    """Rebuild penuh seluruh data yang sudah diproses dari data mentah"""
+    tourism = load_tourism(raw_path)
+    users = load_users(raw_path)
+    ratings = load_ratings(os.path.join(raw_path, 'tourism_rating.csv'))
+
+    aggregates = aggregate_ratings(ratings, users, tourism)
+    avg_place_ratings = build_avg_place_ratings(aggregates, tourism)
+    rules_data = build_rules(aggregates, tourism)
+
+    write_csv(tourism, os.path.join(processed_path, 'tourism_processed.csv'))
+    write_csv(rules_data, os.path.join(processed_path, 'rules_data.csv'))
+    write_csv(avg_place_ratings, os.path.join(processed_path, 'avg_place_ratings.csv'))
+    write_csv(aggregates, os.path.join(processed_path, AGGREGATES_FILENAME))
+    save_encoder(rules_data, models_path)
+    build_serving_outputs(processed_path, models_path, build_table)
+    if build_table:
+        build_item_neighbors(ratings, tourism['Place_Id'].to_numpy(), models_path)
+        train_factorization(ratings, tourism['Place_Id'].to_numpy(), users, models_path)
+        build_description_similarity(tourism, models_path)
+
+    return {
+        'ratings': len(ratings),
+        'places': len(tourism),
+        'avg_place_ratings': len(avg_place_ratings),
+        'rules': len(rules_data),
+    }
+
+
+def update_incremental(new_ratings_path, raw_path='data/raw', processed_path='data/processed',
+                       models_path='models', build_table=True):
+    """
+    Tambahkan rating baru tanpa rebuild penuh.
+
+    Agregasi rating lama dibaca dari rating_aggregates.csv, lalu hanya partisi
+    (City, Category) yang tersentuh rating baru yang dihitung ulang. Rating baru
+    juga ditambahkan ke tourism_rating.csv agar rebuild penuh tetap konsisten.
+    """
+    aggregates_path = os.path.join(processed_path, AGGREGATES_FILENAME)
+    if not os.path.exists(aggregates_path):
+        raise FileNotFoundError(
+            f"{aggregates_path} tidak ditemukan, jalankan rebuild penuh terlebih dahulu"
+        )
+
+    tourism = pd.read_csv(os.path.join(processed_path, 'tourism_processed.csv'))
+    users = load_users(raw_path)
+    new_ratings = load_ratings(new_ratings_path)
+
+    aggregates = pd.read_csv(aggregates_path)
+    delta = aggregate_ratings(new_ratings, users, tourism)
+    aggregates = merge_aggregates(aggregates, delta)
+
+    # Partisi (City, Category) yang tersentuh rating baru
+    place_partitions = tourism.set_index('Place_Id')[['City', 'Category']]
+    touched = pd.MultiIndex.from_frame(place_partitions.loc[delta['Place_Id'].unique()].drop_duplicates())
+
+    avg_place_ratings = pd.read_csv(os.path.join(processed_path, 'avg_place_ratings.csv'))
+    untouched_rows = ~pd.MultiIndex.from_frame(avg_place_ratings[['City', 'Category']]).isin(touched)
+
+    touched_aggregates = aggregates[
+        pd.MultiIndex.from_frame(place_partitions.loc[aggregates['Place_Id']]).isin(touched)
+    ]
+    avg_place_ratings = sort_avg_place_ratings(pd.concat(
+        [avg_place_ratings[untouched_rows], build_avg_place_ratings(touched_aggregates, tourism)],
+        ignore_index=True
+    ))
+    rules_data = build_rules(aggregates, tourism)
+
+    # Simpan rating baru ke data mentah
+    append_csv(new_ratings, os.path.join(raw_path, 'tourism_rating.csv'))
+
+    write_csv(rules_data, os.path.join(processed_path, 'rules_data.csv'))
+    write_csv(avg_place_ratings, os.path.join(processed_path, 'avg_place_ratings.csv'))
+    write_csv(aggregates, aggregates_path)
+    save_encoder(rules_data, models_path)
+    build_serving_outputs(processed_path, models_path, build_table)
+    if build_table:
+        # Similarity item-item dan model ALS bergantung pada seluruh rating, sehingga dihitung ulang penuh
+        all_ratings = load_ratings(os.path.join(raw_path, 'tourism_rating.csv'))
+        build_item_neighbors(all_ratings, tourism['Place_Id'].to_numpy(), models_path)
+        train_factorization(all_ratings, tourism['Place_Id'].to_numpy(), users, models_path)
+
+    return {
+        'ratings': len(new_ratings),
+        'partitions': len(touched),
+        'avg_place_ratings': len(avg_place_ratings),
+        'rules': len(rules_data),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build data yang sudah diproses dari data mentah")
+    parser.add_argument('--raw-path', default='data/raw')
+    parser.add_argument('--processed-path', default='data/processed')
+    parser.add_argument('--models-path', default='models')
+    parser.add_argument('--incremental', metavar='NEW_RATINGS_CSV',
+                        help="Tambahkan rating baru dan hitung ulang partisi yang tersentuh saja")
+    parser.add_argument('--skip-table', action='store_true',
+                        help="Jangan rebuild tabel rekomendasi, artefak serving dan model (item-item, ALS, TF-IDF)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.incremental:
+        stats = update_incremental(args.incremental, args.raw_path, args.processed_path,
+                                   args.models_path, build_table=not args.skip_table)
+    else:
+        stats = build_all(args.raw_path, args.processed_path, args.models_path,
+                          build_table=not args.skip_table)
+
+    print(f"Build selesai dalam {time.perf_counter() - start:.2f} detik")
+    for key, value in stats.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == '__main__':
+    main()
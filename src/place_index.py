@@ -0,0 +1,173 @@
+import numpy as np
+
+from src.geo import haversine_km
+
+# Kolom kunci indeks, sesuai urutan demografis di avg_place_ratings
+INDEX_KEYS = ['Gender', 'Age_Group', 'Category', 'City']
+
+# Re-rank berdasarkan jarak: skor = Avg_Rating / (1 + jarak / DISTANCE_SCALE_KM)
+DISTANCE_SCALE_KM = 10.0
+# Jumlah kandidat (rating tertinggi) per gender yang di-re-rank berdasarkan jarak
+RERANK_CANDIDATES = 50
+
+
+class PlaceIndex:
+    """
+    Indeks objek wisata per (Gender, Age_Group, Category, City).
+
+    Untuk setiap baris rating hanya disimpan posisi objek wisata di PlaceStore,
+    Avg_Rating dan Rating_Count dalam array yang berurutan per grup, dan setiap
+    kunci menunjuk ke potongan (start, end) pada array tersebut. Urutan dalam
+    satu grup sama dengan urutan baris di avg_place_ratings (sudah diurutkan
+    berdasarkan rating), sehingga top-n cukup mengambil n elemen pertama.
+    Nama, kota dan deskripsi diambil dari PlaceStore saat record disusun.
+    """
+
+    def __init__(self, avg_place_ratings, place_store, place_images=None):
+        # URL gambar per Place_Id (opsional), ditempelkan langsung ke setiap record
+        self.place_images = place_images
+        self.place_store = place_store
+
+        # Baris rating untuk Place_Id yang tidak ada di PlaceStore tidak diindeks (posisi -1
+        # akan menunjuk ke baris terakhir store dan menghasilkan record yang salah)
+        place_rows = place_store.positions(avg_place_ratings['Place_Id'].to_numpy())
+        known = np.flatnonzero(place_rows >= 0)
+        if len(known) < len(place_rows):
+            groups = avg_place_ratings.iloc[known].groupby(INDEX_KEYS, sort=False).indices
+        else:
+            known = None
+            groups = avg_place_ratings.groupby(INDEX_KEYS, sort=False).indices
+
+        self.slices = {}
+        positions = []
+        start = 0
+        for key, rows in groups.items():
+            self.slices[key] = (start, start + len(rows))
+            positions.append(rows)
+            start += len(rows)
+
+        # Posisi baris avg_place_ratings untuk setiap elemen array yang berurutan per grup
+        self.order = np.concatenate(positions) if positions else np.empty(0, dtype=np.intp)
+        if known is not None:
+            self.order = known[self.order]
+        self._set_columns(
+            place_rows[self.order],
+            avg_place_ratings['Avg_Rating'].to_numpy()[self.order],
+            avg_place_ratings['Rating_Count'].to_numpy()[self.order]
+        )
+
+    @classmethod
+    def from_arrays(cls, slices, place_rows, avg_ratings, rating_counts, place_store, place_images=None,
+                    order=None):
+        """
+        Buat indeks langsung dari array yang sudah berurutan per grup
+        (misalnya dari artefak yang di-mmap), tanpa DataFrame
+        """
+        index = cls.__new__(cls)
+        index.place_images = place_images
+        index.place_store = place_store
+        index.slices = slices
+        index.order = order
+        index._set_columns(place_rows, avg_ratings, rating_counts)
+        return index
+
+    def _set_columns(self, place_rows, avg_ratings, rating_counts):
+        self.place_rows = place_rows
+        self.avg_ratings = avg_ratings
+        self.rating_counts = rating_counts
+
+    def lookup(self, user_gender, user_age_group, category, city):
+        """Potongan (start, end) untuk kunci yang diberikan, atau (0, 0) jika tidak ada"""
+        try:
+            return self.slices.get((user_gender, user_age_group, category, city), (0, 0))
+        except TypeError:
+            return (0, 0)
+
+    def top_rows(self, user_gender, user_age_group, category, city, n_places=3):
+        """Posisi baris top-n untuk satu grup demografis (semantik sama dengan head(n))"""
+        start, end = self.lookup(user_gender, user_age_group, category, city)
+        return range(start, end)[:n_places]
+
+    def build_records(self, rows):
+        """Susun dict objek wisata dari array indeks dan PlaceStore"""
+        rows = np.asarray(rows, dtype=np.intp)
+        place_rows = self.place_rows[rows]
+        store = self.place_store
+
+        records = [
+            {
+                'Place_Id': place_id,
+                'Place_Name': place_name,
+                'City': place_city,
+                'Description': description,
+                'Avg_Rating': avg_rating,
+                'Rating_Count': rating_count
+            }
+            for place_id, place_name, place_city, description, avg_rating, rating_count in zip(
+                store.take('Place_Id', place_rows), store.take('Place_Name', place_rows),
+                store.take('City', place_rows), store.take('Description', place_rows),
+                self.avg_ratings[rows].tolist(), self.rating_counts[rows].tolist()
+            )
+        ]
+
+        if self.place_images is not None:
+            for record in records:
+                record['image_urls'] = list(self.place_images.get(record['Place_Id'], ()))
+
+        return records
+
+    def top_places(self, category, city, user_gender, user_age_group, n_places=3):
+        """Top-n objek wisata untuk demografis yang spesifik"""
+        return self.build_records(self.top_rows(user_gender, user_age_group, category, city, n_places))
+
+    def top_places_combined(self, category, city, user_genders, user_age_group, n_places=3):
+        """
+        Top-n objek wisata gabungan dari beberapa gender dengan age_group yang sama.
+        Objek wisata yang muncul lebih dari sekali hanya diambil kemunculan pertamanya,
+        lalu diurutkan berdasarkan Avg_Rating dan Rating_Count.
+        """
+        rows = []
+        seen = set()
+        for gender in user_genders:
+            for row in self.top_rows(gender, user_age_group, category, city, n_places):
+                place_row = self.place_rows[row]
+                if place_row not in seen:
+                    seen.add(place_row)
+                    rows.append(row)
+
+        rows.sort(key=lambda row: (-self.avg_ratings[row], -self.rating_counts[row]))
+        return self.build_records(rows[:n_places])
+
+    def top_places_near(self, category, city, user_genders, user_age_group, location, n_places=3,
+                        distance_scale_km=DISTANCE_SCALE_KM, candidates=RERANK_CANDIDATES):
+        """
+        Top-n objek wisata yang di-re-rank berdasarkan jarak dari location (lat, lon).
+
+        Kandidat adalah objek wisata dengan rating tertinggi untuk setiap gender
+        (kemunculan pertama jika duplikat), lalu diurutkan berdasarkan
+        Avg_Rating / (1 + jarak / distance_scale_km). Objek wisata tanpa koordinat
+        diletakkan paling akhir. Setiap record ditambah Distance_Km.
+        """
+        rows = []
+        seen = set()
+        for gender in user_genders:
+            for row in self.top_rows(gender, user_age_group, category, city, candidates):
+                place_row = self.place_rows[row]
+                if place_row not in seen:
+                    seen.add(place_row)
+                    rows.append(row)
+        if not rows:
+            return []
+
+        rows = np.array(rows, dtype=np.intp)
+        place_rows = self.place_rows[rows]
+        distances = haversine_km(location[0], location[1],
+                                 self.place_store.lats[place_rows], self.place_store.longs[place_rows])
+        scores = np.where(np.isfinite(distances),
+                          self.avg_ratings[rows] / (1 + distances / distance_scale_km), -np.inf)
+
+        top = np.lexsort((-self.rating_counts[rows], -self.avg_ratings[rows], -scores))[:n_places]
+        records = self.build_records(rows[top])
+        for record, distance in zip(records, distances[top].tolist()):
+            record['Distance_Km'] = distance
+        return records
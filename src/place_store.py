@@ -0,0 +1,199 @@
+import numpy as np
+
+# Kolom data objek wisata yang disimpan di store (urutan kolom tourism_processed.csv)
+STORE_COLUMNS = ['Place_Id', 'Place_Name', 'Description', 'Category', 'City']
+# Koordinat objek wisata (kosong/NaN jika data lama belum memiliki kolom ini)
+LOCATION_COLUMNS = ['Lat', 'Long']
+# Harga tiket dan perkiraan durasi kunjungan (menit), NaN jika tidak diketahui
+VISIT_COLUMNS = ['Price', 'Time_Minutes']
+
+
+def factorize(values):
+    """Tuple (kode integer per baris, list nilai unik) untuk array atau StringColumn"""
+    if hasattr(values, 'factorize'):
+        return values.factorize()
+    uniques, codes = np.unique(np.asarray(values, dtype=object), return_inverse=True)
+    return codes, uniques.tolist()
+
+
+def positions_by_value(values):
+    """Dict nilai -> array posisi baris (terurut menaik) yang memiliki nilai tersebut"""
+    codes, uniques = factorize(values)
+    order = np.argsort(codes, kind='stable')
+    groups = np.split(order, np.cumsum(np.bincount(codes, minlength=len(uniques)))[:-1])
+    return dict(zip(uniques, groups))
+
+
+class IdLookup:
+    """
+    Posisi berdasarkan id (kemunculan pertama jika ada duplikat), dicari dengan
+    binary search pada array id yang terurut. Hanya berisi array NumPy (bukan
+    dict Python per id), sehingga dapat berupa view di atas file mmap yang
+    dibagi antar proses worker.
+    """
+
+    def __init__(self, sorted_ids, order=None):
+        # order[i] adalah posisi asli dari sorted_ids[i] (None jika id sudah terurut)
+        self.sorted_ids = sorted_ids
+        self.order = order
+        self.n_unique = int(np.count_nonzero(sorted_ids[1:] != sorted_ids[:-1])) + 1 if len(sorted_ids) else 0
+
+    @staticmethod
+    def sort_ids(ids):
+        """Tuple (id terurut, order) untuk disimpan di artefak; order None jika id sudah terurut"""
+        ids = np.asarray(ids)
+        if len(ids) < 2 or np.all(ids[1:] >= ids[:-1]):
+            return ids, None
+        order = np.argsort(ids, kind='stable')
+        return ids[order], order
+
+    @classmethod
+    def from_ids(cls, ids):
+        return cls(*cls.sort_ids(ids))
+
+    def __len__(self):
+        return self.n_unique
+
+    def position(self, place_id):
+        """Posisi untuk satu id, atau None jika tidak ada"""
+        try:
+            i = self.sorted_ids.searchsorted(place_id)
+            # Id berupa list/array bukan id tunggal
+            if isinstance(i, np.ndarray) or i == len(self.sorted_ids) or self.sorted_ids[i] != place_id:
+                return None
+        except (TypeError, ValueError):
+            return None
+        return int(self.order[i]) if self.order is not None else int(i)
+
+    def positions(self, ids):
+        """Posisi untuk banyak id sekaligus (-1 untuk id yang tidak ada)"""
+        ids = np.asarray(ids)
+        if not len(self.sorted_ids):
+            return np.full(len(ids), -1, dtype=np.int32)
+        i = np.minimum(np.searchsorted(self.sorted_ids, ids), len(self.sorted_ids) - 1)
+        found = self.sorted_ids[i] == ids
+        positions = self.order[i] if self.order is not None else i
+        return np.where(found, positions, -1).astype(np.int32)
+
+
+class PlaceStore:
+    """
+    Penyimpanan kanonik data objek wisata: satu baris per Place_Id.
+
+    Kolom disimpan sebagai array (atau kolom string dari artefak), dan indeks
+    lain (PlaceIndex, mapping prepare_data) cukup menyimpan posisi baris
+    (integer) di store ini. Teks seperti nama dan deskripsi hanya ada satu
+    salinan per objek wisata, tidak diulang untuk setiap baris demografis.
+    """
+
+    def __init__(self, columns, id_lookup=None):
+        self.columns = columns
+        self.place_ids = columns['Place_Id']
+        self.names = columns['Place_Name']
+        self.descriptions = columns['Description']
+        self.categories = columns['Category']
+        self.cities = columns['City']
+        self.lats = columns.get('Lat')
+        self.longs = columns.get('Long')
+        self.prices = columns.get('Price')
+        self.visit_minutes = columns.get('Time_Minutes')
+
+        # Posisi baris per Place_Id (kemunculan pertama jika ada duplikat)
+        self.id_lookup = id_lookup if id_lookup is not None else IdLookup.from_ids(self.place_ids)
+        # Posisi baris (terurut menaik) per kota
+        self.city_positions = positions_by_value(self.cities)
+
+    @classmethod
+    def from_frame(cls, tourism_df):
+        """Bangun store dari tourism_df (satu baris per Place_Id)"""
+        places = tourism_df.drop_duplicates('Place_Id')
+        columns = {column: places[column].to_numpy() for column in STORE_COLUMNS}
+        for column in LOCATION_COLUMNS + VISIT_COLUMNS:
+            columns[column] = (places[column].to_numpy(dtype=np.float64) if column in places
+                               else np.full(len(places), np.nan))
+        return cls(columns)
+
+    def __len__(self):
+        return len(self.id_lookup)
+
+    def __contains__(self, place_id):
+        return self.position(place_id) is not None
+
+    def position(self, place_id):
+        """Posisi baris untuk Place_Id, atau None jika tidak ada"""
+        return self.id_lookup.position(place_id)
+
+    def positions(self, place_ids):
+        """Posisi baris untuk banyak Place_Id sekaligus (-1 untuk Place_Id yang tidak ada)"""
+        return self.id_lookup.positions(place_ids)
+
+    def take(self, column, positions):
+        """Nilai satu kolom untuk posisi-posisi yang diberikan, sebagai list Python"""
+        return self.columns[column][np.asarray(positions, dtype=np.intp)].tolist()
+
+    def records(self, positions, columns=('Place_Id', 'Place_Name', 'City', 'Description')):
+        """List dict objek wisata untuk posisi-posisi yang diberikan"""
+        values = [self.take(column, positions) for column in columns]
+        return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+class PlaceDetails:
+    """
+    Detail objek wisata (nama, kota, deskripsi, URL gambar) per Place_Id,
+    dibaca dari PlaceStore. Detail yang sudah diambil disimpan di cache.
+    """
+
+    def __init__(self, place_store, place_images):
+        self.place_store = place_store
+        self.place_images = place_images
+        self._cache = {}
+
+    def __getitem__(self, place_id):
+        try:
+            return self._cache[place_id]
+        except (KeyError, TypeError):
+            pass
+
+        position = self.place_store.position(place_id)
+        if position is None:
+            raise KeyError(place_id)
+        store = self.place_store
+        details = (store.names[position], store.cities[position], store.descriptions[position],
+                   self.place_images.get(place_id, ()))
+        self._cache[place_id] = details
+        return details
+
+    def __contains__(self, place_id):
+        return place_id in self.place_store
+
+
+def group_places(tourism_df, place_store):
+    """
+    Kelompokkan objek wisata per kategori dan per (kota, kategori) dalam satu
+    kali grouping (linear terhadap jumlah baris, berapa pun jumlah kota).
+
+    Urutan kunci mengikuti urutan kemunculan pertama di tourism_df, dan setiap
+    grup berisi posisi baris di place_store dengan urutan baris tourism_df.
+
+    Returns:
+        Tuple (category_to_places, city_to_categories, city_category_places)
+    """
+    place_rows = place_store.positions(tourism_df['Place_Id'].to_numpy())
+
+    def groups_in_order(keys):
+        # Urutkan grup berdasarkan baris pertamanya (= urutan kemunculan pertama)
+        groups = tourism_df.groupby(keys, sort=False).indices
+        return sorted(groups.items(), key=lambda item: item[1][0])
+
+    category_to_places = {category: place_rows[rows] for category, rows in groups_in_order('Category')}
+
+    city_to_categories = {}
+    city_category_places = {}
+    for (city, category), rows in groups_in_order(['City', 'Category']):
+        if city not in city_category_places:
+            city_to_categories[city] = {}
+            city_category_places[city] = {}
+        city_to_categories[city][category] = len(rows)
+        city_category_places[city][category] = place_rows[rows]
+
+    return category_to_places, city_to_categories, city_category_places
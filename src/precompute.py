@@ -0,0 +1,193 @@
+import hashlib
+import itertools
+import os
+import pickle
+
+from src.utils import GENDER_OPTIONS, AGE_GROUP_OPTIONS, CITY_OPTIONS, TRIP_TYPE_OPTIONS
+
+# Versi format tabel, naikkan jika struktur atau logika rekomendasi berubah
+TABLE_VERSION = 1
+TABLE_FILENAME = 'recommendation_table.pkl'
+
+# File sumber yang menentukan isi tabel rekomendasi
+SOURCE_FILES = [
+    ('data', 'tourism_processed.csv'),
+    ('data', 'rules_data.csv'),
+    ('data', 'avg_place_ratings.csv'),
+    ('models', 'encoder.pkl'),
+]
+
+
+def compute_data_fingerprint(data_path='data/processed', models_path='models'):
+    """
+    Menghitung sidik jari (hash) dari seluruh file sumber, sehingga tabel
+    yang dibangun dari data lama tidak dipakai lagi setelah data berubah
+    """
+    digest = hashlib.sha1()
+    base_paths = {'data': data_path, 'models': models_path}
+    for base, filename in SOURCE_FILES:
+        path = os.path.join(base_paths[base], filename)
+        digest.update(filename.encode('utf-8'))
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class RecommendationTable:
+    """
+    Tabel hasil rekomendasi untuk setiap kombinasi profil
+    (gender x kelompok usia x kota x tipe perjalanan).
+
+    Hasil disimpan dalam bentuk ringkas: hanya skor kategori dan
+    (Place_Id, Avg_Rating, Rating_Count) per objek wisata. Detail objek wisata
+    (nama, kota, deskripsi, gambar) diambil dari data recommender saat lookup.
+    """
+
+    def __init__(self, entries, fingerprint, n_places_options):
+        self.entries = entries
+        self.fingerprint = fingerprint
+        self.n_places_options = tuple(n_places_options)
+
+    @classmethod
+    def build(cls, recommender, fingerprint, n_places_options=(3,),
+              genders=GENDER_OPTIONS, age_groups=AGE_GROUP_OPTIONS,
+              cities=CITY_OPTIONS, trip_types=TRIP_TYPE_OPTIONS):
+        """
+        Menjalankan perhitungan rekomendasi untuk semua kombinasi profil sekali saja
+        """
+        # Semua kategori disimpan, n_categories cukup dipotong saat lookup
+        n_categories = recommender.rules_df['Category'].nunique()
+
+        entries = {}
+        for gender, age_group, city, trip_type, n_places in itertools.product(
+                genders, age_groups, cities, trip_types, n_places_options):
+            recommendations = recommender.compute_recommendations(
+                gender, age_group, city, trip_type,
+                n_categories=n_categories, n_places_per_category=n_places
+            )
+            entries[(gender, age_group, city, trip_type, n_places)] = tuple(
+                cls._compact(rec) for rec in recommendations
+            )
+
+        return cls(entries, fingerprint, n_places_options)
+
+    @staticmethod
+    def _compact(rec):
+        """Ubah satu rekomendasi kategori ke bentuk tuple yang ringkas"""
+        score = rec['score']
+        places = tuple(
+            (place['Place_Id'], place['Avg_Rating'], place['Rating_Count'])
+            for place in rec['places']
+        )
+        return (
+            rec['category'],
+            score['similarity'],
+            score['collaborative_score'],
+            score['context_score'],
+            score['final_score'],
+            rec['user_match']['gender'],
+            rec['user_match']['age_group'],
+            places,
+        )
+
+    def lookup(self, user_gender, user_age_group, target_city, user_trip_type,
+               n_categories, n_places_per_category, place_details):
+        """
+        Mengambil rekomendasi dari tabel. Mengembalikan None jika kombinasi
+        input tidak ada di tabel (pemanggil harus menghitung secara langsung).
+        """
+        try:
+            entry = self.entries.get((user_gender, user_age_group, target_city,
+                                      user_trip_type, n_places_per_category))
+        except TypeError:
+            # Input yang tidak hashable tidak mungkin ada di tabel
+            return None
+        if entry is None:
+            return None
+
+        recommendations = []
+        for (category, similarity, collaborative_score, context_score, final_score,
+             match_gender, match_age_group, places) in entry[:n_categories]:
+            places_list = []
+            for place_id, avg_rating, rating_count in places:
+                place_name, city, description, image_urls = place_details[place_id]
+                places_list.append({
+                    'Place_Id': place_id,
+                    'Place_Name': place_name,
+                    'City': city,
+                    'Description': description,
+                    'Avg_Rating': avg_rating,
+                    'Rating_Count': rating_count,
+                    'image_urls': list(image_urls)
+                })
+
+            recommendations.append({
+                'category': category,
+                'score': {
+                    'similarity': similarity,
+                    'collaborative_score': collaborative_score,
+                    'context_score': context_score,
+                    'final_score': final_score
+                },
+                'user_match': {
+                    'gender': match_gender,
+                    'age_group': match_age_group,
+                    'trip_type': user_trip_type
+                },
+                'places': places_list,
+                'places_found': len(places_list),
+                'places_requested': n_places_per_category
+            })
+
+        return recommendations
+
+    def save(self, path):
+        """Simpan tabel ke file pickle"""
+        payload = {
+            'version': TABLE_VERSION,
+            'fingerprint': self.fingerprint,
+            'n_places_options': self.n_places_options,
+            'entries': self.entries,
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, fingerprint=None):
+        """
+        Load tabel dari file. Mengembalikan None jika file tidak ada,
+        versinya berbeda, atau dibangun dari data yang sudah berubah.
+        """
+        if not os.path.exists(path):
+            return None
+
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+
+        if payload.get('version') != TABLE_VERSION:
+            return None
+        if fingerprint is not None and payload.get('fingerprint') != fingerprint:
+            return None
+
+        return cls(payload['entries'], payload['fingerprint'], payload['n_places_options'])
+
+
+def build_recommendation_table(data_path='data/processed', models_path='models', n_places_options=(3,)):
+    """Bangun tabel rekomendasi dari data terbaru dan simpan ke folder models"""
+    from src.recommender import TourismRecommender
+
+    recommender = TourismRecommender(data_path, models_path, use_precomputed=False)
+    fingerprint = compute_data_fingerprint(data_path, models_path)
+    table = RecommendationTable.build(recommender, fingerprint, n_places_options)
+
+    output_path = os.path.join(models_path, TABLE_FILENAME)
+    table.save(output_path)
+    return output_path, len(table.entries)
+
+
+if __name__ == '__main__':
+    output_path, total_entries = build_recommendation_table()
+    print(f"Tabel rekomendasi berhasil dibuat: {output_path} ({total_entries} kombinasi)")
@@ -1,303 +1,619 @@
-import pandas as pd
-import numpy as np
-import pickle
-from sklearn.metrics.pairwise import cosine_similarity
-import time
-
-class TourismRecommender:
-    def __init__(self, data_path='data/processed', models_path='models'):
-        """
-        Inisialisasi Tourism Recommender System yang menggabungkan
-        content-based, collaborative dan context-based filtering
-        """
-        # Load data yang sudah diproses
-        self.tourism_df = pd.read_csv(f'{data_path}/tourism_processed.csv')
-        self.rules_df = pd.read_csv(f'{data_path}/rules_data.csv')
-        self.avg_place_ratings = pd.read_csv(f'{data_path}/avg_place_ratings.csv')
-
-        # Manggabungkan deskripsi objek wisata ke dalam avg_place_ratings
-        self.avg_place_ratings = self.avg_place_ratings.merge(
-        self.tourism_df[['Place_Id', 'Description']], 
-        on='Place_Id', 
-        how='left'
-    )
-
-        # Load encoder
-        with open(f'{models_path}/encoder.pkl', 'rb') as f:
-            self.encoder = pickle.load(f)
-        
-        # Siapkan data untuk rekomendasi yang cepat
-        self.prepare_data()
-    
-    def prepare_data(self):
-        """Siapkan struktur data untuk akses cepat"""
-        # Pemetaan kategori ke objek wisata
-        self.category_to_places = {}
-        # Pemetaan kota ke objek wisata per kategori
-        self.city_to_categories = {}
-        
-        # Buat mapping objek wisata per kategori
-        for category in self.tourism_df['Category'].unique():
-            places = self.tourism_df[self.tourism_df['Category'] == category]
-            self.category_to_places[category] = places[['Place_Id', 'Place_Name', 'City', 'Description']].to_dict('records')
-        
-        # Buat mapping kategori per kota
-        for city in self.tourism_df['City'].unique():
-            city_places = self.tourism_df[self.tourism_df['City'] == city]
-            
-            # Simpan kategori dan jumlah objek wisata per kategori dalam kota ini
-            category_counts = {}
-            for category in city_places['Category'].unique():
-                category_places = city_places[city_places['Category'] == category]
-                category_counts[category] = len(category_places)
-            
-            # Simpan mapping kota ke kategori dan jumlah objek
-            self.city_to_categories[city] = category_counts
-        
-        # Pemetaan kota ke objek wisata per kategori
-        self.city_category_places = {}
-        for city in self.tourism_df['City'].unique():
-            self.city_category_places[city] = {}
-            city_places = self.tourism_df[self.tourism_df['City'] == city]
-            
-            for category in city_places['Category'].unique():
-                category_places = city_places[city_places['Category'] == category]
-                self.city_category_places[city][category] = category_places[['Place_Id', 'Place_Name', 'City', 'Description']].to_dict('records')
-    
-    def get_category_recommendations(self, user_gender, user_age_group):
-        """
-        Mendapatkan rekomendasi kategori berdasarkan profil pengguna
-        menggunakan content-based filtering (cosine similarity)
-        """
-        if user_gender == "Tidak ingin menyebutkan":
-            # Pendekatan vektor untuk "Tidak ingin menyebutkan"
-            # Dapatkan representasi vektor untuk kedua gender
-            male_df = pd.DataFrame([["Laki-laki", user_age_group]], columns=['Gender', 'Age_Group'])
-            female_df = pd.DataFrame([["Perempuan", user_age_group]], columns=['Gender', 'Age_Group'])
-
-            encoded_male = self.encoder.transform(male_df).toarray()
-            encoded_female = self.encoder.transform(female_df).toarray()
-
-            # Buat vektor representasi netral dengan mengambil rata-rata
-            # Ini memberikan probabilitas 0.5 untuk setiap gender
-            encoded_neutral = (encoded_male + encoded_female) / 2
-
-            # Transformasi fitur rules
-            rule_features = self.encoder.transform(self.rules_df[['Gender', 'Age_Group']]).toarray()
-
-            # Hitung similarity dengan vektor netral
-            similarities = cosine_similarity(rule_features, encoded_neutral).flatten()
-        else:
-            # Original code untuk gender standard
-            user_df = pd.DataFrame([[user_gender, user_age_group]], columns=['Gender', 'Age_Group'])
-            encoded_user = self.encoder.transform(user_df).toarray()
-
-            # Transformasi fitur rules
-            rule_features = self.encoder.transform(self.rules_df[['Gender', 'Age_Group']]).toarray()
-
-            # Hitung similarity
-            similarities = cosine_similarity(rule_features, encoded_user).flatten()
-
-        # Tambahkan similarity ke dataframe rules
-        rules_with_sim = self.rules_df.copy()
-        rules_with_sim['Similarity'] = similarities
-
-        # Ambil best rule untuk tiap kategori
-        best_rules = rules_with_sim.sort_values('Similarity', ascending=False) \
-                              .groupby('Category') \
-                              .first() \
-                              .reset_index() \
-                              .sort_values('Total_Users', ascending=False)
-        
-        # Tambahkan kolom Collaborative_Score berdasarkan urutan Total_Users
-        collaborative_scores = []
-        
-        for i in range(len(best_rules)):
-            # Skor dimulai dari 6 untuk urutan pertama, turun sampai minimum 1
-            score = max(1, 6 - i)
-            collaborative_scores.append(score)
-        
-        best_rules['Collaborative_Score'] = collaborative_scores
-
-        return best_rules
-    
-    def apply_context_boost(self, best_rules, user_trip_type):
-        """
-        Menerapkan context-based filtering dengan memberikan
-        bobot tambahan berdasarkan tipe perjalanan
-        """
-
-        # Buat salinan dari best_rules untuk menambahkan kolom boost
-        rules_with_boost = best_rules.copy()
-        
-        # Definisi bobot untuk tipe perjalanan per kategori
-        trip_type_weights = {
-            'Solo Trip': {
-                'Cagar Alam': 6,
-                'Tempat Ibadah': 5,
-                'Budaya': 4,
-                'Bahari': 3,
-                'Taman Hiburan': 2,
-                'Pusat Perbelanjaan': 1
-            },
-            'Family Trip': {
-                'Taman Hiburan': 6,
-                'Pusat Perbelanjaan': 5,
-                'Bahari': 4,
-                'Budaya': 3,
-                'Cagar Alam': 2,
-                'Tempat Ibadah': 1
-            },
-            'Couple Trip': {
-                'Bahari': 6,
-                'Budaya': 5,
-                'Taman Hiburan': 4,
-                'Cagar Alam': 3,
-                'Pusat Perbelanjaan': 2,
-                'Tempat Ibadah': 1
-            },
-            'Friends Trip': {
-                'Taman Hiburan': 6, 
-                'Budaya': 5,
-                'Cagar Alam': 4,
-                'Pusat Perbelanjaan': 3,
-                'Bahari': 2,
-                'Tempat Ibadah': 1
-            }
-        }
-        
-        # Terapkan boosting berdasarkan tipe perjalanan
-        def get_trip_type_boost(row):
-            category = row['Category']
-            boost = 0
-            
-            # Boost berdasarkan kesesuaian tipe perjalanan dengan kategori
-            category_weight = trip_type_weights.get(user_trip_type, {}).get(category, 0)
-            boost += category_weight
-                
-            return boost
-        
-        # Hitung boost score
-        rules_with_boost['Context_Score'] = rules_with_boost.apply(get_trip_type_boost, axis=1)
-
-        # Hitung final score
-        rules_with_boost['Final_Score'] = (
-            rules_with_boost['Collaborative_Score'] + 
-            rules_with_boost['Context_Score']
-        )
-
-        # Urutkan berdasarkan final score
-        return rules_with_boost.sort_values('Final_Score', ascending=False)
-    
-    def get_places_for_category_in_city(self, category, city, user_gender, user_age_group, n_places=3):
-        """
-        Mendapatkan objek wisata untuk kategori tertentu di kota tertentu 
-        berdasarkan rating tertinggi dari user dengan demografis serupa.
-        """
-        if user_gender == "Tidak ingin menyebutkan":
-        # Ambil top places dari kedua gender dengan age_group serupa
-            male_places = self.avg_place_ratings[
-                (self.avg_place_ratings['Gender'] == 'Laki-laki') &
-                (self.avg_place_ratings['Age_Group'] == user_age_group) &
-                (self.avg_place_ratings['Category'] == category) &
-                (self.avg_place_ratings['City'] == city)
-            ].head(n_places)
-            
-            female_places = self.avg_place_ratings[
-                (self.avg_place_ratings['Gender'] == 'Perempuan') &
-                (self.avg_place_ratings['Age_Group'] == user_age_group) &
-                (self.avg_place_ratings['Category'] == category) &
-                (self.avg_place_ratings['City'] == city)
-            ].head(n_places)
-            
-            # Gabungkan dan sort berdasarkan rating
-            combined_places = pd.concat([male_places, female_places]).drop_duplicates('Place_Id')
-            combined_places = combined_places.sort_values(['Avg_Rating', 'Rating_Count'], ascending=[False, False]).head(n_places)
-            
-            # Convert ke format yang dibutuhkan
-            places_list = []
-            for _, place in combined_places.iterrows():
-                places_list.append({
-                    'Place_Id': place['Place_Id'],
-                    'Place_Name': place['Place_Name'],
-                    'City': place['City'],
-                    'Description': place.get('Description', 'Tidak ada deskripsi.'),
-                    'Avg_Rating': place['Avg_Rating'],
-                    'Rating_Count': place['Rating_Count']
-                })
-            
-            return places_list
-        else:
-            # Filter berdasarkan demografis user yang spesifik
-            filtered_places = self.avg_place_ratings[
-                (self.avg_place_ratings['Gender'] == user_gender) &
-                (self.avg_place_ratings['Age_Group'] == user_age_group) &
-                (self.avg_place_ratings['Category'] == category) &
-                (self.avg_place_ratings['City'] == city)
-            ].head(n_places)
-            
-            # Convert ke format yang dibutuhkan
-            places_list = []
-            for _, place in filtered_places.iterrows():
-                places_list.append({
-                    'Place_Id': place['Place_Id'],
-                    'Place_Name': place['Place_Name'],
-                    'City': place['City'],
-                    'Description': place.get('Description', 'Tidak ada deskripsi.'),
-                    'Avg_Rating': place['Avg_Rating'],
-                    'Rating_Count': place['Rating_Count']
-                })
-            
-            return places_list
-    
-    def get_recommendations(self, user_gender, user_age_group, target_city, user_trip_type, n_categories=6, n_places_per_category=3):
-        """
-        Generate rekomendasi lengkap untuk user.
-        
-        Args:
-            user_gender: Jenis kelamin pengguna
-            user_age_group: Kelompok usia pengguna
-            target_city: Kota tujuan wisata
-            user_trip_type: Tipe perjalanan pengguna
-            n_categories: Jumlah kategori yang direkomendasikan
-            n_places_per_category: Jumlah objek wisata per kategori
-            
-        Returns:
-            List rekomendasi dengan kategori dan objek wisata
-        """
-        
-        # 1. Dapatkan rekomendasi kategori berdasarkan content-based filtering (ambil semua kategori)
-        all_categories = self.get_category_recommendations(user_gender, user_age_group)
-        
-        # 2. Terapkan context boosting berdasarkan tipe perjalanan
-        boosted_categories = self.apply_context_boost(all_categories, user_trip_type)
-        
-        # 3. Ambil semua kategori dengan skor tertinggi (6 kategori)
-        top_categories = boosted_categories.head(n_categories)
-
-        # 4. Dapatkan objek wisata untuk setiap kategori
-        recommendations = []
-
-        for _, row in top_categories.iterrows():
-            category = row['Category']
-            places = self.get_places_for_category_in_city(category, target_city, user_gender, user_age_group, n_places=n_places_per_category)
-            
-            recommendations.append({
-                'category': category,
-                'score': {
-                    'similarity': row['Similarity'],
-                    'collaborative_score': row['Collaborative_Score'], 
-                    'context_score': row['Context_Score'],
-                    'final_score': row['Final_Score']
-                },
-                'user_match': {
-                    'gender': row['Gender'],
-                    'age_group': row['Age_Group'],
-                    'trip_type': user_trip_type
-                },
-                'places': places,
-                'places_found': len(places),  
-                'places_requested': n_places_per_category  
-            })
-    
-        return recommendations
\ No newline at end of file
+import pandas as pd
+import numpy as np
+import os
+
+from src.precompute import RecommendationTable, TABLE_FILENAME, compute_data_fingerprint
+from src.scoring import CategoryScorer, TRIP_TYPE_WEIGHTS
+from src.encoder import load_encoder
+from src.place_index import PlaceIndex
+from src.place_store import PlaceStore, PlaceDetails, group_places
+from src.geo import SpatialGrid
+from src.itinerary import ItineraryPlanner, DEFAULT_DAY_MINUTES
+from src.cache import ResultCache, DEFAULT_MAX_SIZE
+from src.utils import load_place_images
+from src.artifacts import ServingArtifacts, ARTIFACTS_DIRNAME
+from src.collaborative import ItemNeighbors, NEIGHBORS_FILENAME
+from src.factorization import FactorizationModel, FACTORIZATION_FILENAME
+from src.content import DescriptionSimilarity, SIMILARITY_FILENAME
+from src.instrumentation import (StageTimings, as_sink, STAGE_TABLE_LOOKUP, STAGE_CATEGORY_SCORING,
+                                 STAGE_CONTEXT_BOOST, STAGE_PLACE_LOOKUP, STAGE_CACHE_LOOKUP)
+
+# Atribut yang pada mode artefak baru dibuat saat pertama kali diakses
+LAZY_FRAME_ATTRIBUTES = ('tourism_df', 'rules_df', 'avg_place_ratings')
+LAZY_PREPARED_ATTRIBUTES = ('category_to_places', 'city_to_categories', 'city_category_places')
+
+def copy_place(place):
+    """Salinan dict objek wisata (list image_urls ikut disalin)"""
+    return dict(place, image_urls=list(place['image_urls'])) if 'image_urls' in place else dict(place)
+
+
+def copy_recommendations(recommendations):
+    """Salinan hasil get_recommendations (dict dan list di dalamnya ikut disalin)"""
+    return [
+        dict(rec, score=dict(rec['score']), user_match=dict(rec['user_match']),
+             places=[copy_place(place) for place in rec['places']])
+        for rec in recommendations
+    ]
+
+
+class TourismRecommender:
+    def __init__(self, data_path='data/processed', models_path='models', use_precomputed=True, use_artifacts=True,
+                 timing_sink=None, result_cache_size=DEFAULT_MAX_SIZE, result_cache_ttl=None):
+        """
+        Inisialisasi Tourism Recommender System yang menggabungkan
+        content-based, collaborative dan context-based filtering
+
+        Jika use_artifacts aktif dan artefak serving (models/serving) masih sesuai
+        dengan data, struktur data dibuka langsung dari artefak dengan mmap tanpa
+        membaca CSV. Jika use_precomputed aktif dan file tabel rekomendasi di folder
+        models masih sesuai dengan data, rekomendasi dijawab langsung dari tabel.
+
+        timing_sink (opsional) menerima durasi setiap stage get_recommendations,
+        lihat set_timing_sink.
+
+        Hasil get_recommendations disimpan di cache LRU berukuran result_cache_size
+        (0 untuk menonaktifkan) dengan TTL result_cache_ttl detik (None = tanpa TTL).
+        """
+        self.data_path = data_path
+        self.models_path = models_path
+        self.timing_sink = as_sink(timing_sink)
+        self.result_cache = ResultCache(result_cache_size, result_cache_ttl) if result_cache_size > 0 else None
+
+        self.artifacts = None
+        if use_artifacts:
+            self.artifacts = ServingArtifacts.open(
+                os.path.join(models_path, ARTIFACTS_DIRNAME), data_path, models_path
+            )
+
+        if self.artifacts is not None:
+            self.load_artifacts()
+            fingerprint = self.artifacts.table_fingerprint
+        else:
+            self.load_data()
+            fingerprint = compute_data_fingerprint(data_path, models_path) if use_precomputed else None
+
+        # Load tabel rekomendasi yang sudah dihitung sebelumnya (jika ada)
+        self.recommendation_table = None
+        if use_precomputed:
+            self.recommendation_table = RecommendationTable.load(
+                os.path.join(models_path, TABLE_FILENAME), fingerprint
+            )
+
+        # Tetangga item-item dari rating user (None jika belum dibangun)
+        self.item_neighbors = ItemNeighbors.load(os.path.join(models_path, NEIGHBORS_FILENAME))
+
+        # Objek wisata dengan deskripsi paling mirip (None jika indeks belum dibangun)
+        self.description_similarity = DescriptionSimilarity.load(os.path.join(models_path, SIMILARITY_FILENAME))
+
+        # Model matrix factorization dengan blok faktor per kota (None jika belum dilatih)
+        self.factorization = FactorizationModel.load(
+            os.path.join(models_path, FACTORIZATION_FILENAME), self.place_store
+        )
+
+    def set_timing_sink(self, sink):
+        """
+        Aktifkan (atau matikan dengan None) pencatatan durasi per stage di
+        get_recommendations: pencarian tabel, scoring kategori, context boost dan
+        pencarian objek wisata per kategori.
+
+        sink dapat berupa HistogramSink, LogSink, CallbackSink (src.instrumentation)
+        atau fungsi biasa yang menerima StageTimings.
+        """
+        self.timing_sink = as_sink(sink)
+
+    def load_data(self):
+        """Load data dari file CSV dan siapkan seluruh struktur data serving"""
+        data_path, models_path = self.data_path, self.models_path
+
+        # Load data yang sudah diproses
+        self.tourism_df = pd.read_csv(f'{data_path}/tourism_processed.csv')
+        self.rules_df = pd.read_csv(f'{data_path}/rules_data.csv')
+        self.avg_place_ratings = pd.read_csv(f'{data_path}/avg_place_ratings.csv')
+
+        # Data objek wisata (nama, kota, deskripsi) disimpan sekali per Place_Id;
+        # indeks lain hanya menyimpan posisi baris di store ini
+        self.place_store = PlaceStore.from_frame(self.tourism_df)
+
+        # Load encoder profil (tanpa sklearn jika sudah diekspor ke JSON)
+        self.encoder = load_encoder(models_path)
+
+        # Encode rules sekali saja untuk scoring kategori
+        self.category_scorer = CategoryScorer(self.rules_df, self.encoder)
+        
+        # URL gambar per Place_Id, ditempelkan langsung ke hasil rekomendasi
+        self.place_images = load_place_images(f'{data_path}/tourism_with_images.csv')
+
+        # Indeks objek wisata per demografis, kategori dan kota
+        self.place_index = PlaceIndex(self.avg_place_ratings, self.place_store, self.place_images)
+
+        # Indeks spasial objek wisata berdasarkan koordinat
+        self.spatial_index = SpatialGrid(self.place_store.lats, self.place_store.longs)
+
+        # Perencana itinerary (cache matriks jarak per kota)
+        self.itinerary_planner = ItineraryPlanner(self.place_store)
+
+        # Siapkan data untuk rekomendasi yang cepat
+        self.prepare_data()
+
+        # Detail objek wisata per Place_Id untuk menyusun hasil dari tabel rekomendasi
+        self.place_details = PlaceDetails(self.place_store, self.place_images)
+
+    def load_artifacts(self):
+        """
+        Siapkan struktur data serving langsung dari artefak yang di-mmap.
+        DataFrame, encoder dan mapping prepare_data baru dibuat saat diakses.
+        """
+        self.category_scorer = self.artifacts.category_scorer(self.encoder)
+        self.place_images = self.artifacts.place_images()
+        self.place_store = self.artifacts.place_store()
+        self.place_index = self.artifacts.place_index(self.place_store, self.place_images)
+        self.spatial_index = SpatialGrid(self.place_store.lats, self.place_store.longs)
+        self.itinerary_planner = ItineraryPlanner(self.place_store)
+        self.place_details = PlaceDetails(self.place_store, self.place_images)
+
+    def __getattr__(self, name):
+        # Hanya dipanggil jika atribut belum ada, yaitu atribut lazy pada mode artefak
+        artifacts = self.__dict__.get('artifacts')
+        if artifacts is None:
+            raise AttributeError(name)
+
+        if name in LAZY_FRAME_ATTRIBUTES:
+            value = getattr(artifacts, name)()
+        elif name == 'encoder':
+            value = load_encoder(self.models_path)
+        elif name in LAZY_PREPARED_ATTRIBUTES:
+            self.prepare_data()
+            return self.__dict__[name]
+        else:
+            raise AttributeError(name)
+
+        setattr(self, name, value)
+        return value
+    
+    def prepare_data(self):
+        """
+        Siapkan struktur data untuk akses cepat. Objek wisata direferensikan
+        sebagai array posisi baris di place_store (lihat PlaceStore.records).
+        """
+        # Pemetaan kategori ke objek wisata, kota ke jumlah objek wisata per kategori,
+        # dan kota ke objek wisata per kategori (dibangun dalam satu kali grouping)
+        self.category_to_places, self.city_to_categories, self.city_category_places = \
+            group_places(self.tourism_df, self.place_store)
+    
+    def get_category_recommendations(self, user_gender, user_age_group):
+        """
+        Mendapatkan rekomendasi kategori berdasarkan profil pengguna
+        menggunakan content-based filtering (cosine similarity)
+        """
+        category_indices, best, similarities, collaborative = \
+            self.category_scorer.rank_categories(user_gender, user_age_group)
+
+        # Ambil best rule untuk tiap kategori, diurutkan berdasarkan Total_Users
+        best_rules = pd.DataFrame({
+            'Category': self.category_scorer.categories[category_indices],
+            'Gender': self.category_scorer.rule_genders[best],
+            'Age_Group': self.category_scorer.rule_age_groups[best],
+            'Total_Users': self.category_scorer.total_users[best],
+            'Similarity': similarities,
+            'Collaborative_Score': collaborative
+        }, index=category_indices)
+
+        return best_rules
+    
+    def apply_context_boost(self, best_rules, user_trip_type):
+        """
+        Menerapkan context-based filtering dengan memberikan
+        bobot tambahan berdasarkan tipe perjalanan
+        """
+
+        # Buat salinan dari best_rules untuk menambahkan kolom boost
+        rules_with_boost = best_rules.copy()
+        
+        # Hitung boost score berdasarkan kesesuaian tipe perjalanan dengan kategori
+        category_weights = TRIP_TYPE_WEIGHTS.get(user_trip_type, {})
+        rules_with_boost['Context_Score'] = rules_with_boost['Category'].map(
+            lambda category: category_weights.get(category, 0)
+        ).astype(int)
+
+        # Hitung final score
+        rules_with_boost['Final_Score'] = (
+            rules_with_boost['Collaborative_Score'] + 
+            rules_with_boost['Context_Score']
+        )
+
+        # Urutkan berdasarkan final score
+        return rules_with_boost.sort_values('Final_Score', ascending=False)
+    
+    def get_places_for_category_in_city(self, category, city, user_gender, user_age_group, n_places=3,
+                                        user_location=None):
+        """
+        Mendapatkan objek wisata untuk kategori tertentu di kota tertentu 
+        berdasarkan rating tertinggi dari user dengan demografis serupa.
+
+        Jika user_location (lat, lon) diberikan, objek wisata dengan rating
+        tertinggi di-re-rank sehingga objek wisata yang lebih dekat diutamakan
+        (lihat PlaceIndex.top_places_near).
+        """
+        if user_location is not None:
+            genders = ['Laki-laki', 'Perempuan'] if user_gender == "Tidak ingin menyebutkan" else [user_gender]
+            return self.place_index.top_places_near(
+                category, city, genders, user_age_group, user_location, n_places
+            )
+
+        if user_gender == "Tidak ingin menyebutkan":
+            # Ambil top places dari kedua gender dengan age_group serupa,
+            # gabungkan dan sort berdasarkan rating
+            return self.place_index.top_places_combined(
+                category, city, ['Laki-laki', 'Perempuan'], user_age_group, n_places
+            )
+        else:
+            # Ambil top places dari demografis user yang spesifik
+            return self.place_index.top_places(category, city, user_gender, user_age_group, n_places)
+    
+    def nearby(self, place_id=None, lat=None, lon=None, radius_km=5.0, k=10):
+        """
+        Objek wisata terdekat dari sebuah objek wisata (place_id) atau dari
+        koordinat (lat, lon), dalam radius radius_km.
+
+        Returns:
+            List dict objek wisata dengan Distance_Km, terurut dari yang terdekat
+
+        Raises:
+            KeyError: Jika place_id tidak dikenal
+            ValueError: Jika place_id maupun lat/lon tidak diberikan
+        """
+        store = self.place_store
+        exclude = None
+        if place_id is not None:
+            position = store.position(place_id)
+            if position is None:
+                raise KeyError(place_id)
+            lat, lon, exclude = float(store.lats[position]), float(store.longs[position]), position
+        elif lat is None or lon is None:
+            raise ValueError("place_id atau lat dan lon wajib diisi")
+
+        positions, distances = self.spatial_index.query(lat, lon, radius_km, k, exclude)
+        records = store.records(positions)
+        for record, distance in zip(records, distances.tolist()):
+            record['Distance_Km'] = distance
+            record['image_urls'] = list(self.place_images.get(record['Place_Id'], ()))
+        return records
+
+    def plan_itinerary(self, user_gender, user_age_group, target_city, user_trip_type,
+                       time_limit=DEFAULT_DAY_MINUTES, budget=None, start_location=None,
+                       return_to_start=False, n_categories=6, n_candidates_per_category=15):
+        """
+        Rencana kunjungan satu hari dari kandidat hasil get_recommendations,
+        dengan batas waktu (menit) dan anggaran tiket (lihat src.itinerary).
+
+        Skor kandidat adalah Avg_Rating objek wisata dikali bobot kategorinya
+        (1 + final_score kategori / final_score tertinggi), sehingga objek
+        wisata dari kategori yang lebih cocok lebih diprioritaskan.
+
+        Args:
+            user_gender, user_age_group, target_city, user_trip_type: Sama dengan get_recommendations
+            time_limit: Batas total waktu kunjungan dan perjalanan (menit)
+            budget: Batas total harga tiket (opsional)
+            start_location: Koordinat (lat, lon) titik awal, misalnya hotel (opsional)
+            return_to_start: Rute kembali ke start_location di akhir hari
+            n_categories: Jumlah kategori kandidat
+            n_candidates_per_category: Jumlah kandidat objek wisata per kategori
+
+        Returns:
+            Dict dengan list 'stops' terurut beserta total waktu, jarak dan harga
+        """
+        recommendations = self.get_recommendations(
+            user_gender, user_age_group, target_city, user_trip_type,
+            n_categories=n_categories, n_places_per_category=n_candidates_per_category,
+            user_location=start_location
+        )
+
+        store = self.place_store
+        top_score = max((rec['score']['final_score'] for rec in recommendations), default=0)
+        candidates = {}
+        for rec in recommendations:
+            weight = 1 + (rec['score']['final_score'] / top_score if top_score > 0 else 0)
+            for place in rec['places']:
+                position = store.position(place['Place_Id'])
+                if position is not None and position not in candidates:
+                    candidates[position] = place['Avg_Rating'] * weight
+
+        itinerary = self.itinerary_planner.plan(
+            list(candidates), list(candidates.values()), time_limit, budget,
+            start_location, return_to_start and start_location is not None
+        )
+        for stop in itinerary['stops']:
+            stop['image_urls'] = list(self.place_images.get(stop['Place_Id'], ()))
+        return itinerary
+
+    def get_because_you_liked(self, place_ids, n_places=5, target_city=None):
+        """
+        Rekomendasi "karena Anda menyukai X" menggunakan item-item collaborative
+        filtering: objek wisata yang diberi rating serupa oleh user yang juga
+        merating objek wisata yang disukai (lihat src.collaborative).
+
+        Args:
+            place_ids: Place_Id (atau list Place_Id) objek wisata yang disukai
+            n_places: Jumlah objek wisata yang direkomendasikan
+            target_city: Hanya rekomendasikan objek wisata di kota ini (opsional)
+
+        Returns:
+            List dict objek wisata dengan skor Similarity, terurut dari yang paling mirip.
+            List kosong jika tetangga item-item belum dibangun.
+        """
+        if self.item_neighbors is None:
+            return []
+        if np.ndim(place_ids) == 0:
+            place_ids = [place_ids]
+
+        store = self.place_store
+
+        def allowed(place_id):
+            position = store.position(place_id)
+            return position is not None and (target_city is None or store.cities[position] == target_city)
+
+        similar = self.item_neighbors.because_you_liked(place_ids, n_places, allowed)
+        records = store.records([store.position(place_id) for place_id, _ in similar])
+        for record, (_, score) in zip(records, similar):
+            record['Similarity'] = score
+            record['image_urls'] = list(self.place_images.get(record['Place_Id'], ()))
+        return records
+
+    def similar_places(self, place_id, k=5, same_city=False):
+        """
+        Objek wisata dengan deskripsi paling mirip ("more like this"), dari indeks
+        TF-IDF yang sudah dihitung sebelumnya (lihat src.content).
+
+        Args:
+            place_id: Place_Id objek wisata acuan
+            k: Jumlah objek wisata yang dikembalikan
+            same_city: Hanya objek wisata di kota yang sama
+
+        Returns:
+            List dict objek wisata dengan skor Similarity, terurut dari yang paling mirip.
+            List kosong jika indeks belum dibangun atau Place_Id tidak dikenal.
+        """
+        if self.description_similarity is None:
+            return []
+
+        store = self.place_store
+        similar = [(store.position(similar_id), score)
+                   for similar_id, score in self.description_similarity.similar(place_id, k, same_city)]
+        similar = [(position, score) for position, score in similar if position is not None]
+
+        records = store.records([position for position, _ in similar])
+        for record, (_, score) in zip(records, similar):
+            record['Similarity'] = score
+            record['image_urls'] = list(self.place_images.get(record['Place_Id'], ()))
+        return records
+
+    def get_personalized_places(self, target_city, user_id=None, user_gender=None, user_age_group=None,
+                                n_places=10, exclude_rated=True):
+        """
+        Objek wisata di kota tujuan dengan prediksi rating tertinggi menurut model
+        matrix factorization (lihat src.factorization).
+
+        User dengan riwayat rating (user_id) memakai vektor faktornya sendiri; user
+        yang hanya mengisi profil memakai prior demografis (gender, kelompok usia).
+
+        Returns:
+            List dict objek wisata dengan Predicted_Rating, terurut menurun.
+            List kosong jika model belum dilatih.
+        """
+        model = self.factorization
+        if model is None:
+            return []
+
+        vector = model.user_vector(user_id, user_gender, user_age_group)
+        exclude = model.rated_by(user_id) if exclude_rated else None
+        items, predicted = model.top_items(vector, target_city, n_places, exclude)
+
+        records = self.place_store.records(model.store_positions[items])
+        for record, rating in zip(records, predicted.tolist()):
+            record['Predicted_Rating'] = rating
+            record['image_urls'] = list(self.place_images.get(record['Place_Id'], ()))
+        return records
+
+    def get_recommendations(self, user_gender, user_age_group, target_city, user_trip_type, n_categories=6, n_places_per_category=3,
+                            user_location=None):
+        """
+        Generate rekomendasi lengkap untuk user.
+        
+        Args:
+            user_gender: Jenis kelamin pengguna
+            user_age_group: Kelompok usia pengguna
+            target_city: Kota tujuan wisata
+            user_trip_type: Tipe perjalanan pengguna
+            n_categories: Jumlah kategori yang direkomendasikan
+            n_places_per_category: Jumlah objek wisata per kategori
+            user_location: Koordinat (lat, lon) pengguna untuk re-rank berdasarkan jarak (opsional)
+            
+        Returns:
+            List rekomendasi dengan kategori dan objek wisata
+        """
+        # Pencatatan durasi per stage hanya dibuat jika timing sink aktif
+        timings = None
+        if self.timing_sink is not None:
+            timings = StageTimings((user_gender, user_age_group, target_city, user_trip_type))
+
+        # Hasil dengan lokasi pengguna tidak di-cache (koordinat hampir selalu berbeda)
+        key = None
+        if self.result_cache is not None and user_location is None:
+            key = (user_gender, user_age_group, target_city, user_trip_type, n_categories, n_places_per_category)
+            try:
+                hash(key)
+            except TypeError:
+                key = None
+
+        if key is None:
+            return self._get_recommendations(user_gender, user_age_group, target_city, user_trip_type,
+                                             n_categories, n_places_per_category, user_location, timings)
+
+        computed = []
+
+        def compute():
+            computed.append(True)
+            return self._get_recommendations(user_gender, user_age_group, target_city, user_trip_type,
+                                             n_categories, n_places_per_category, None, timings)
+
+        recommendations = self.result_cache.get_or_compute(key, compute)
+        if timings is not None and not computed:
+            timings.lap(STAGE_CACHE_LOOKUP)
+            self._record_timings(timings, 'cache')
+        # Hasil di cache dipakai bersama, pemanggil menerima salinan yang boleh diubah
+        return copy_recommendations(recommendations)
+
+    def _get_recommendations(self, user_gender, user_age_group, target_city, user_trip_type, n_categories,
+                             n_places_per_category, user_location, timings):
+        """get_recommendations tanpa cache hasil"""
+        # Jawab dari tabel rekomendasi jika kombinasi input tersedia
+        # (tabel tidak memperhitungkan lokasi pengguna)
+        if self.recommendation_table is not None and user_location is None:
+            recommendations = self.recommendation_table.lookup(
+                user_gender, user_age_group, target_city, user_trip_type,
+                n_categories, n_places_per_category, self.place_details
+            )
+            if timings is not None:
+                timings.lap(STAGE_TABLE_LOOKUP)
+            if recommendations is not None:
+                if timings is not None:
+                    self._record_timings(timings, 'table')
+                return recommendations
+
+        recommendations = self.compute_recommendations(
+            user_gender, user_age_group, target_city, user_trip_type,
+            n_categories=n_categories, n_places_per_category=n_places_per_category, timings=timings,
+            user_location=user_location
+        )
+        if timings is not None:
+            self._record_timings(timings, 'computed')
+        return recommendations
+
+    def _record_timings(self, timings, source):
+        timings.finish(source)
+        self.timing_sink.record(timings)
+
+    def compute_recommendations(self, user_gender, user_age_group, target_city, user_trip_type, n_categories=6, n_places_per_category=3,
+                                timings=None, user_location=None):
+        """
+        Menghitung rekomendasi secara langsung tanpa tabel rekomendasi.
+        Parameter dan hasil sama dengan get_recommendations; timings (StageTimings,
+        opsional) diisi durasi setiap stage.
+        """
+        # 1. Dapatkan skor kategori (content-based dan collaborative)
+        ranked = self.category_scorer.rank_categories(user_gender, user_age_group)
+        if timings is not None:
+            timings.lap(STAGE_CATEGORY_SCORING)
+
+        # 2. Terapkan context boosting berdasarkan tipe perjalanan
+        category_indices, best, similarities, collaborative, context, final = \
+            self.category_scorer.boost(ranked, user_trip_type)
+
+        # 3. Ambil semua kategori dengan skor tertinggi (6 kategori)
+        top = slice(None, n_categories)
+        categories = self.category_scorer.categories[category_indices[top]].tolist()
+        genders = self.category_scorer.rule_genders[best[top]].tolist()
+        age_groups = self.category_scorer.rule_age_groups[best[top]].tolist()
+        if timings is not None:
+            timings.lap(STAGE_CONTEXT_BOOST)
+
+        # 4. Dapatkan objek wisata untuk setiap kategori
+        recommendations = []
+
+        for i, category in enumerate(categories):
+            if timings is not None:
+                timings.mark()
+            places = self.get_places_for_category_in_city(category, target_city, user_gender, user_age_group,
+                                                          n_places=n_places_per_category, user_location=user_location)
+            if timings is not None:
+                timings.lap(STAGE_PLACE_LOOKUP, category)
+            
+            recommendations.append(self._category_recommendation(
+                category, similarities[i].item(), collaborative[i].item(), context[i].item(), final[i].item(),
+                genders[i], age_groups[i], user_trip_type, places, n_places_per_category
+            ))
+    
+        return recommendations
+
+    def get_recommendations_batch(self, profiles, n_categories=6, n_places_per_category=3):
+        """
+        Generate rekomendasi untuk banyak profil sekaligus.
+
+        Similarity kategori seluruh profil dihitung dalam satu perkalian matriks,
+        dan objek wisata hanya dicari sekali per kombinasi
+        (gender, kelompok usia, kota, kategori) yang unik.
+
+        Args:
+            profiles: Iterable berisi tuple (gender, age_group, city, trip_type)
+            n_categories: Jumlah kategori yang direkomendasikan
+            n_places_per_category: Jumlah objek wisata per kategori
+
+        Returns:
+            List berisi hasil rekomendasi per profil (urutan sama dengan input),
+            masing-masing dengan format yang sama seperti get_recommendations
+        """
+        profiles = [tuple(profile) for profile in profiles]
+        if not profiles:
+            return []
+
+        user_genders, user_age_groups, target_cities, user_trip_types = (list(column) for column in zip(*profiles))
+
+        # 1-2. Skor kategori untuk semua profil sekaligus
+        category_indices, best, similarities, collaborative, context, final = \
+            self.category_scorer.score_batch(user_genders, user_age_groups, user_trip_types)
+
+        # 3. Ambil kategori dengan skor tertinggi per profil
+        top = slice(None, n_categories)
+        categories = self.category_scorer.categories[category_indices[:, top]].tolist()
+        genders = self.category_scorer.rule_genders[best[:, top]].tolist()
+        age_groups = self.category_scorer.rule_age_groups[best[:, top]].tolist()
+        similarities = similarities[:, top].tolist()
+        collaborative = collaborative[:, top].tolist()
+        context = context[:, top].tolist()
+        final = final[:, top].tolist()
+
+        # 4. Dapatkan objek wisata, dikelompokkan per kombinasi yang unik
+        grouped_places = {}
+        results = []
+
+        for i, (user_gender, user_age_group, target_city, user_trip_type) in enumerate(profiles):
+            recommendations = []
+
+            for j, category in enumerate(categories[i]):
+                key = (user_gender, user_age_group, target_city, category)
+                places = grouped_places.get(key)
+                if places is None:
+                    places = grouped_places[key] = self.get_places_for_category_in_city(
+                        category, target_city, user_gender, user_age_group, n_places=n_places_per_category
+                    )
+
+                recommendations.append(self._category_recommendation(
+                    category, similarities[i][j], collaborative[i][j], context[i][j], final[i][j],
+                    genders[i][j], age_groups[i][j], user_trip_type,
+                    [copy_place(place) for place in places], n_places_per_category
+                ))
+
+            results.append(recommendations)
+
+        return results
+
+    def _category_recommendation(self, category, similarity, collaborative_score, context_score, final_score,
+                                 match_gender, match_age_group, user_trip_type, places, n_places_per_category):
+        """Susun hasil rekomendasi untuk satu kategori"""
+        return {
+            'category': category,
+            'score': {
+                'similarity': similarity,
+                'collaborative_score': collaborative_score, 
+                'context_score': context_score,
+                'final_score': final_score
+            },
+            'user_match': {
+                'gender': match_gender,
+                'age_group': match_age_group,
+                'trip_type': user_trip_type
+            },
+            'places': places,
+            'places_found': len(places),  
+            'places_requested': n_places_per_category  
+        }
\ No newline at end of file
@@ -0,0 +1,242 @@
+"""
+Hot reload data serving tanpa restart proses.
+
+HotReloader menyimpan satu snapshot aktif (versi, TourismRecommender, tanda
+file sumber). Thread watcher memeriksa ukuran dan waktu modifikasi file yang
+dibaca recommender secara berkala; jika berubah dan sudah stabil selama
+settle detik (pipeline selesai menulis), recommender baru dibangun di thread
+watcher lalu ditukar dengan satu assignment referensi.
+
+Request yang sedang berjalan tetap memakai snapshot lama sampai selesai
+(method yang sudah diambil memegang referensi ke recommender lama, dan
+pinned() mengunci snapshot untuk beberapa akses dalam satu request). Setelah
+tidak ada yang memegangnya, snapshot lama dibebaskan oleh reference counting
+Python, termasuk file artefak yang di-mmap.
+
+Contoh:
+    reloader = HotReloader().start()
+    reloader.get_recommendations(...)   # didelegasikan ke snapshot aktif
+"""
+import contextlib
+import logging
+import os
+import threading
+import time
+import weakref
+
+from src.precompute import TABLE_FILENAME
+from src.artifacts import SOURCE_FILES, ARTIFACTS_DIRNAME, MANIFEST_FILENAME
+from src.collaborative import NEIGHBORS_FILENAME
+from src.factorization import FACTORIZATION_FILENAME
+from src.content import SIMILARITY_FILENAME
+from src.encoder import PROFILE_ENCODER_FILENAME
+
+logger = logging.getLogger(__name__)
+
+# File yang dibaca TourismRecommender; perubahan salah satunya memicu reload
+WATCHED_FILES = SOURCE_FILES + [
+    ('models', TABLE_FILENAME),
+    ('models', os.path.join(ARTIFACTS_DIRNAME, MANIFEST_FILENAME)),
+    ('models', NEIGHBORS_FILENAME),
+    ('models', FACTORIZATION_FILENAME),
+    ('models', SIMILARITY_FILENAME),
+    ('models', PROFILE_ENCODER_FILENAME),
+]
+
+# Interval pemeriksaan file (detik) dan lama file harus tidak berubah sebelum reload
+DEFAULT_INTERVAL = 5.0
+DEFAULT_SETTLE = 2.0
+
+
+def source_signature(data_path='data/processed', models_path='models'):
+    """Tuple (nama file, ukuran, waktu modifikasi) semua file yang diawasi (None jika file tidak ada)"""
+    base_paths = {'data': data_path, 'models': models_path}
+    signature = []
+    for base, filename in WATCHED_FILES:
+        try:
+            stat = os.stat(os.path.join(base_paths[base], filename))
+        except FileNotFoundError:
+            signature.append((filename, None, None))
+            continue
+        signature.append((filename, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+class Snapshot:
+    """Satu versi data serving yang sudah dimuat"""
+
+    def __init__(self, version, recommender, signature):
+        self.version = version
+        self.recommender = recommender
+        self.signature = signature
+        self.loaded_at = time.time()
+
+
+class HotReloader:
+    """
+    Pembungkus TourismRecommender yang memuat ulang data di background.
+
+    Atribut dan method yang tidak dikenal didelegasikan ke recommender pada
+    snapshot aktif, sehingga dapat dipakai sebagai pengganti TourismRecommender
+    (misalnya di RecommendationService atau app.py).
+    """
+
+    def __init__(self, data_path='data/processed', models_path='models', interval=DEFAULT_INTERVAL,
+                 settle=DEFAULT_SETTLE, factory=None, **recommender_kwargs):
+        """
+        Args:
+            interval: Interval pemeriksaan file oleh thread watcher (detik)
+            settle: Lama file harus tidak berubah sebelum dimuat ulang (detik)
+            factory: Fungsi tanpa argumen yang membuat recommender baru
+                (default TourismRecommender(data_path, models_path, **recommender_kwargs))
+        """
+        if factory is None:
+            def factory():
+                from src.recommender import TourismRecommender
+                return TourismRecommender(data_path, models_path, **recommender_kwargs)
+
+        self.data_path = data_path
+        self.models_path = models_path
+        self.interval = interval
+        self.settle = settle
+        self.factory = factory
+
+        self.reloads = 0
+        self.failures = 0
+        self.last_error = None
+        self._retired = []
+        self._pending = None
+        self._failed_signature = None
+        self._reload_lock = threading.Lock()
+        self._local = threading.local()
+        self._stop = threading.Event()
+        self._thread = None
+
+        signature = source_signature(data_path, models_path)
+        self._snapshot = Snapshot(1, factory(), signature)
+
+    def __getattr__(self, name):
+        # Hanya dipanggil untuk atribut yang tidak ada di HotReloader
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.current().recommender, name)
+
+    def current(self):
+        """Snapshot yang di-pin thread ini (lihat pinned), atau snapshot aktif"""
+        snapshot = getattr(self._local, 'snapshot', None)
+        return snapshot if snapshot is not None else self._snapshot
+
+    @property
+    def recommender(self):
+        return self.current().recommender
+
+    @property
+    def version(self):
+        return self.current().version
+
+    @contextlib.contextmanager
+    def pinned(self):
+        """Semua akses di dalam blok ini (di thread yang sama) memakai snapshot yang sama"""
+        if getattr(self._local, 'snapshot', None) is not None:
+            yield self._local.snapshot
+            return
+        self._local.snapshot = self._snapshot
+        try:
+            yield self._local.snapshot
+        finally:
+            self._local.snapshot = None
+
+    def check(self):
+        """
+        Periksa file sumber sekali dan muat ulang jika berubah dan sudah stabil.
+        Mengembalikan True jika snapshot baru dipasang.
+        """
+        signature = source_signature(self.data_path, self.models_path)
+        if signature in (self._snapshot.signature, self._failed_signature):
+            self._pending = None
+            return False
+
+        now = time.monotonic()
+        if self._pending is None or self._pending[0] != signature:
+            # Perubahan baru terlihat: tunggu sampai file tidak berubah selama settle detik
+            self._pending = (signature, now)
+        if now - self._pending[1] < self.settle:
+            return False
+
+        self._pending = None
+        return self.reload(signature)
+
+    def reload(self, signature=None):
+        """
+        Bangun recommender baru dan pasang sebagai snapshot aktif. Request
+        tidak pernah menunggu proses ini; jika gagal, snapshot lama tetap dipakai.
+        """
+        with self._reload_lock:
+            if signature is None:
+                signature = source_signature(self.data_path, self.models_path)
+            start = time.perf_counter()
+            try:
+                recommender = self.factory()
+            except Exception as e:
+                self.failures += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                # Jangan dicoba lagi sampai file berubah lagi
+                self._failed_signature = signature
+                logger.exception("Reload data serving gagal, snapshot versi %d tetap dipakai",
+                                 self._snapshot.version)
+                return False
+
+            previous = self._snapshot
+            self._snapshot = Snapshot(previous.version + 1, recommender, signature)
+            self._failed_signature = None
+            self.reloads += 1
+
+            self._retired = [ref for ref in self._retired if ref() is not None]
+            self._retired.append(weakref.ref(previous.recommender))
+            logger.info("Snapshot data serving versi %d dipasang (%.2f detik)",
+                        self._snapshot.version, time.perf_counter() - start)
+            return True
+
+    def retired_alive(self):
+        """Jumlah recommender dari snapshot lama yang masih dipegang (belum dibebaskan)"""
+        return sum(ref() is not None for ref in self._retired)
+
+    def stats(self):
+        snapshot = self._snapshot
+        return {
+            'version': snapshot.version,
+            'loaded_at': snapshot.loaded_at,
+            'reloads': self.reloads,
+            'failures': self.failures,
+            'last_error': self.last_error,
+            'retired_alive': self.retired_alive(),
+        }
+
+    # Thread watcher
+
+    def start(self):
+        """Mulai thread watcher (daemon); mengembalikan self"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name='recommender-reload', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Pemeriksaan file data serving gagal")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,287 @@
+import numpy as np
+
+from src.encoder import ProfileEncoder
+
+NEUTRAL_GENDER = "Tidak ingin menyebutkan"
+
+# Definisi bobot untuk tipe perjalanan per kategori
+TRIP_TYPE_WEIGHTS = {
+    'Solo Trip': {
+        'Cagar Alam': 6,
+        'Tempat Ibadah': 5,
+        'Budaya': 4,
+        'Bahari': 3,
+        'Taman Hiburan': 2,
+        'Pusat Perbelanjaan': 1
+    },
+    'Family Trip': {
+        'Taman Hiburan': 6,
+        'Pusat Perbelanjaan': 5,
+        'Bahari': 4,
+        'Budaya': 3,
+        'Cagar Alam': 2,
+        'Tempat Ibadah': 1
+    },
+    'Couple Trip': {
+        'Bahari': 6,
+        'Budaya': 5,
+        'Taman Hiburan': 4,
+        'Cagar Alam': 3,
+        'Pusat Perbelanjaan': 2,
+        'Tempat Ibadah': 1
+    },
+    'Friends Trip': {
+        'Taman Hiburan': 6,
+        'Budaya': 5,
+        'Cagar Alam': 4,
+        'Pusat Perbelanjaan': 3,
+        'Bahari': 2,
+        'Tempat Ibadah': 1
+    }
+}
+
+
+def argsort_descending(values):
+    """
+    Urutan indeks dari nilai terbesar ke terkecil dengan aturan yang sama
+    persis seperti DataFrame.sort_values(ascending=False), termasuk urutan
+    untuk nilai yang sama (seri). Untuk array 2D, diurutkan per baris.
+    """
+    values = np.asarray(values)
+    n = values.shape[-1]
+    reversed_index = np.arange(n)[::-1]
+    return reversed_index[values[..., ::-1].argsort(axis=-1, kind='quicksort')][..., ::-1]
+
+
+def collaborative_scores(n):
+    """Skor dimulai dari 6 untuk urutan pertama, turun sampai minimum 1"""
+    return np.maximum(1, 6 - np.arange(n))
+
+
+class CategoryScorer:
+    """
+    Mesin scoring kategori berbasis content-based filtering (cosine similarity).
+
+    Rules di-encode sekali saat inisialisasi dan disimpan sebagai matriks NumPy
+    yang sudah dinormalisasi, sehingga setiap request cukup melakukan satu
+    perkalian matriks-vektor tanpa membuat DataFrame baru.
+    """
+
+    def __init__(self, rules_df, encoder):
+        # OneHotEncoder sklearn dikonversi ke encoder ringan dengan hasil yang sama
+        if not isinstance(encoder, ProfileEncoder):
+            encoder = ProfileEncoder.from_sklearn(encoder)
+        self.encoder = encoder
+
+        # Encode dan normalisasi fitur rules (L2 per baris) sekali saja
+        rule_features = self.encoder.transform(rules_df[['Gender', 'Age_Group']])
+
+        self._setup(
+            rules_df['Gender'].to_numpy(dtype=object),
+            rules_df['Age_Group'].to_numpy(dtype=object),
+            rules_df['Category'].to_numpy(dtype=object),
+            rules_df['Total_Users'].to_numpy(),
+            self._normalize(rule_features),
+            {}
+        )
+
+    @classmethod
+    def from_arrays(cls, rule_genders, rule_age_groups, rule_categories, total_users, rule_matrix,
+                    user_vectors, encoder=None):
+        """
+        Buat scorer dari array yang sudah di-encode (misalnya dari artefak).
+
+        user_vectors berisi vektor profil yang sudah dinormalisasi per
+        (gender, age_group). Jika encoder tidak diberikan, profil di luar
+        user_vectors dianggap tidak dikenal.
+        """
+        scorer = cls.__new__(cls)
+        scorer.encoder = encoder
+        scorer._setup(rule_genders, rule_age_groups, rule_categories, total_users, rule_matrix,
+                      dict(user_vectors))
+        return scorer
+
+    def _setup(self, rule_genders, rule_age_groups, rule_categories, total_users, rule_matrix, user_vectors):
+        self.rule_genders = rule_genders
+        self.rule_age_groups = rule_age_groups
+        self.total_users = total_users
+        self.rule_matrix = rule_matrix
+
+        # Indeks kategori (urut alfabet seperti groupby) dan segmen rules per kategori
+        self.categories, self.rule_category_codes = np.unique(rule_categories, return_inverse=True)
+        self.segment_order = np.argsort(self.rule_category_codes, kind='stable')
+        self.segment_starts = np.searchsorted(
+            self.rule_category_codes[self.segment_order], np.arange(len(self.categories))
+        )
+
+        # Bobot tipe perjalanan per kategori dalam bentuk array
+        self.trip_type_weights = {
+            trip_type: np.array([weights.get(category, 0) for category in self.categories])
+            for trip_type, weights in TRIP_TYPE_WEIGHTS.items()
+        }
+        self.no_trip_type_weights = np.zeros(len(self.categories), dtype=int)
+
+        # Matriks bobot (tipe perjalanan x kategori) untuk scoring batch,
+        # baris terakhir untuk tipe perjalanan yang tidak dikenal
+        self.trip_type_index = {trip_type: i for i, trip_type in enumerate(self.trip_type_weights)}
+        self.trip_type_matrix = np.vstack(
+            list(self.trip_type_weights.values()) + [self.no_trip_type_weights]
+        )
+
+        # Cache vektor user yang sudah di-encode per (gender, age_group)
+        self._user_vectors = user_vectors
+
+    @staticmethod
+    def _normalize(features):
+        """Normalisasi L2 per baris seperti sklearn.preprocessing.normalize"""
+        norms = np.sqrt(np.einsum('ij,ij->i', features, features))
+        norms[norms == 0.0] = 1.0
+        return features / norms[:, np.newaxis]
+
+    def encode_user(self, user_gender, user_age_group):
+        """Vektor profil user yang sudah dinormalisasi (disimpan di cache)"""
+        key = (user_gender, user_age_group)
+        vector = self._user_vectors.get(key)
+        if vector is None:
+            if self.encoder is None:
+                raise ValueError(f"Found unknown categories in profile {key}")
+            if user_gender == NEUTRAL_GENDER:
+                # Vektor netral: rata-rata vektor kedua gender
+                # Ini memberikan probabilitas 0.5 untuk setiap gender
+                encoded = self.encoder.transform(
+                    [("Laki-laki", user_age_group), ("Perempuan", user_age_group)]
+                )
+                encoded = (encoded[[0]] + encoded[[1]]) / 2
+            else:
+                encoded = self.encoder.transform([(user_gender, user_age_group)])
+
+            vector = self._normalize(encoded)[0]
+            self._user_vectors[key] = vector
+        return vector
+
+    def known_profiles(self):
+        """Semua kombinasi (gender, age_group) yang dikenal encoder, termasuk gender netral"""
+        genders, age_groups = self.encoder.categories_[:2]
+        return [
+            (gender, age_group)
+            for gender in list(genders) + [NEUTRAL_GENDER]
+            for age_group in age_groups
+        ]
+
+    def encode_users(self, user_genders, user_age_groups):
+        """Matriks vektor profil untuk banyak user sekaligus (satu baris per user)"""
+        vectors = {}
+        rows = []
+        for key in zip(user_genders, user_age_groups):
+            vector = vectors.get(key)
+            if vector is None:
+                vector = vectors[key] = self.encode_user(*key)
+            rows.append(vector)
+        if not rows:
+            return np.empty((0, self.rule_matrix.shape[1]))
+        return np.vstack(rows)
+
+    def similarities(self, user_gender, user_age_group):
+        """Cosine similarity antara profil user dan setiap rule"""
+        return self.similarities_batch([user_gender], [user_age_group])[0]
+
+    def similarities_batch(self, user_genders, user_age_groups):
+        """Cosine similarity untuk banyak profil sekaligus dalam satu perkalian matriks"""
+        user_matrix = self.encode_users(user_genders, user_age_groups)
+        return (self.rule_matrix @ user_matrix.T).T
+
+    def best_rules(self, similarities):
+        """
+        Indeks rule terbaik per kategori (urut alfabet kategori).
+
+        Rule terbaik adalah rule dengan similarity tertinggi; jika seri, dipilih
+        rule yang muncul lebih dulu setelah diurutkan menurun. Peringkat tiap rule
+        dikelompokkan per segmen kategori lalu diambil yang terbaik per segmen.
+        Untuk array 2D, dihitung per baris.
+        """
+        similarities = np.asarray(similarities)
+        order = argsort_descending(similarities)
+        positions = np.broadcast_to(np.arange(order.shape[-1]), order.shape)
+        rank = np.empty_like(order)
+        np.put_along_axis(rank, order, positions, axis=-1)
+
+        best_rank = np.minimum.reduceat(rank[..., self.segment_order], self.segment_starts, axis=-1)
+        return np.take_along_axis(order, best_rank, axis=-1)
+
+    def rank_categories(self, user_gender, user_age_group):
+        """
+        Ranking kategori untuk profil user.
+
+        Returns:
+            Tuple (indeks kategori, indeks rule terbaik, similarity, collaborative score),
+            diurutkan berdasarkan Total_Users dari rule terbaik
+        """
+        ranked = self.rank_categories_batch([user_gender], [user_age_group])
+        return tuple(values[0] for values in ranked)
+
+    def rank_categories_batch(self, user_genders, user_age_groups):
+        """Versi batch dari rank_categories, satu baris per profil"""
+        similarities = self.similarities_batch(user_genders, user_age_groups)
+        best = self.best_rules(similarities)
+
+        # Urutkan kategori berdasarkan Total_Users
+        category_order = argsort_descending(self.total_users[best])
+        best = np.take_along_axis(best, category_order, axis=-1)
+
+        collaborative = np.broadcast_to(collaborative_scores(best.shape[-1]), best.shape)
+        return (
+            category_order,
+            best,
+            np.take_along_axis(similarities, best, axis=-1),
+            collaborative
+        )
+
+    def context_scores(self, category_indices, user_trip_type):
+        """Bobot tipe perjalanan untuk kategori yang diberikan"""
+        weights = self.trip_type_weights.get(user_trip_type, self.no_trip_type_weights)
+        return weights[category_indices]
+
+    def score(self, user_gender, user_age_group, user_trip_type):
+        """
+        Skor lengkap (content-based, collaborative dan context-based) per kategori,
+        diurutkan berdasarkan final score
+
+        Returns:
+            Tuple (indeks kategori, indeks rule, similarity, collaborative score,
+            context score, final score)
+        """
+        scores = self.score_batch([user_gender], [user_age_group], [user_trip_type])
+        return tuple(values[0] for values in scores)
+
+    def score_batch(self, user_genders, user_age_groups, user_trip_types):
+        """Versi batch dari score, satu baris per profil"""
+        ranked = self.rank_categories_batch(user_genders, user_age_groups)
+        return self.boost_batch(ranked, user_trip_types)
+
+    def boost(self, ranked, user_trip_type):
+        """
+        Context boosting untuk hasil rank_categories satu profil.
+        Hasil sama dengan score untuk profil tersebut.
+        """
+        scores = self.boost_batch(tuple(values[np.newaxis] for values in ranked), [user_trip_type])
+        return tuple(values[0] for values in scores)
+
+    def boost_batch(self, ranked, user_trip_types):
+        """
+        Context boosting untuk hasil rank_categories_batch: tambahkan bobot tipe
+        perjalanan ke collaborative score lalu urutkan berdasarkan final score
+        """
+        category_indices, best, similarities, collaborative = ranked
+
+        # Bobot tipe perjalanan per profil (tipe yang tidak dikenal mendapat bobot 0)
+        unknown = len(self.trip_type_index)
+        trip_rows = np.array([self.trip_type_index.get(trip_type, unknown) for trip_type in user_trip_types],
+                             dtype=np.intp)
+        context = self.trip_type_matrix[trip_rows[:, np.newaxis], category_indices]
+        final = collaborative + context
+
+        order = argsort_descending(final)
+        return tuple(
+            np.take_along_axis(values, order, axis=-1)
+            for values in (category_indices, best, similarities, collaborative, context, final)
+        )
@@ -0,0 +1,174 @@
+"""
+Utilitas HTTP bersama untuk script scraping dan pembersihan gambar:
+session dengan connection pooling, rate limit token bucket per host,
+dan request dengan retry + exponential backoff.
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Status HTTP yang layak dicoba ulang (rate limit dan error sementara di server)
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe: rata-rata `rate` request per detik dengan
+    lonjakan maksimal `capacity` request sekaligus.
+    """
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate harus lebih besar dari 0")
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = self.capacity
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def _reserve(self):
+        """Ambil satu token; kembalikan lama waktu tunggu sampai token tersebut tersedia"""
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """Tunggu sampai boleh mengirim satu request, kembalikan lama waktu tunggu (detik)"""
+        wait = self._reserve()
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """Token bucket terpisah untuk setiap host, dibuat saat host pertama kali diakses"""
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, host):
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate, self.capacity, self.clock, self.sleep)
+            return bucket
+
+    def acquire(self, url):
+        return self.bucket(urlsplit(url).netloc.lower()).acquire()
+
+
+class HostConcurrencyLimiter:
+    """Batasi jumlah request yang berjalan bersamaan ke satu host"""
+
+    def __init__(self, max_per_host):
+        self.max_per_host = max_per_host
+        self.semaphores = {}
+        self.lock = threading.Lock()
+
+    def semaphore(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self.lock:
+            semaphore = self.semaphores.get(host)
+            if semaphore is None:
+                semaphore = self.semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return semaphore
+
+
+def create_session(pool_size=10, headers=None):
+    """
+    Session requests dengan connection pool yang cukup untuk pool_size thread
+    sekaligus, sehingga koneksi (dan handshake TLS) dipakai ulang antar request
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def _retry_after_seconds(response):
+    """Nilai header Retry-After dalam detik (None jika tidak ada atau tidak valid)"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt, base=1.0, maximum=30.0):
+    """Exponential backoff dengan jitter: base * 2^attempt, diacak antara 50% sampai 100%"""
+    delay = min(maximum, base * (2 ** attempt))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def request_with_retries(session, method, url, limiter=None, max_retries=2, backoff_base=1.0,
+                         backoff_max=30.0, retry_statuses=RETRY_STATUSES, sleep=time.sleep, **kwargs):
+    """
+    Kirim request dengan rate limit per host dan retry.
+
+    Error koneksi/timeout dan status di retry_statuses dicoba ulang maksimal
+    max_retries kali dengan exponential backoff (atau sesuai header Retry-After).
+    Response terakhir dikembalikan apa adanya; exception terakhir dilempar ulang
+    jika semua percobaan gagal karena error koneksi.
+    """
+    for attempt in range(max_retries + 1):
+        if limiter is not None:
+            limiter.acquire(url)
+
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == max_retries:
+                raise
+            sleep(backoff_delay(attempt, backoff_base, backoff_max))
+            continue
+
+        if response.status_code not in retry_statuses or attempt == max_retries:
+            return response
+
+        delay = _retry_after_seconds(response)
+        response.close()
+        sleep(min(backoff_max, delay) if delay is not None else backoff_delay(attempt, backoff_base, backoff_max))
+
+
+def run_concurrently(func, items, concurrency):
+    """
+    Jalankan func(item) untuk setiap item di thread pool berukuran concurrency.
+    Hasil dikembalikan begitu selesai (tidak berurutan) sebagai (item, hasil, exception).
+    """
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {executor.submit(func, item): item for item in items}
+        try:
+            for future in as_completed(futures):
+                error = future.exception()
+                yield futures[future], (None if error is not None else future.result()), error
+        finally:
+            # Jika pemanggil berhenti di tengah jalan, item yang belum dimulai dibatalkan
+            for future in futures:
+                future.cancel()
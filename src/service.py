@@ -0,0 +1,628 @@
+"""
+HTTP JSON API untuk TourismRecommender berbasis asyncio (tanpa dependensi tambahan).
+
+Endpoint:
+    GET /recommendations?gender=...&age_group=...&city=...&trip_type=...
+        (age=<angka> dapat dipakai sebagai pengganti age_group, opsional
+        n_categories, n_places, serta lat dan lon untuk re-rank berdasarkan jarak)
+    GET /places/{place_id}
+    GET /places/{place_id}/also-liked
+        (objek wisata yang juga disukai user lain, opsional n dan city)
+    GET /places/{place_id}/similar
+        (objek wisata dengan deskripsi paling mirip, opsional k dan same_city=1)
+    GET /places/{place_id}/nearby
+    GET /nearby?lat=...&lon=...
+        (objek wisata terdekat, opsional radius_km dan k)
+    GET /personalized?city=...&user_id=...
+        (tanpa user_id: gender dan age_group/age sebagai prior, opsional n)
+    GET /itinerary?gender=...&age_group=...&city=...&trip_type=...
+        (rencana kunjungan satu hari, opsional hours, budget, lat dan lon
+        sebagai titik awal, serta return=1 untuk kembali ke titik awal)
+    GET /health
+        (statistik cache hasil, dan versi snapshot data yang aktif jika hot reload aktif)
+
+Menjalankan service:
+    python -m src.service --host 0.0.0.0 --port 8000 --workers 4
+
+Dengan --reload-interval <detik>, perubahan data (pipeline, gambar baru)
+dimuat ulang di background tanpa restart (lihat src.reload).
+
+Dengan --processes <n>, n proses worker berbagi port yang sama; artefak
+serving dibangun sekali oleh proses induk lalu dibuka dengan mmap oleh
+setiap worker (lihat serve_processes).
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+from src.cache import DEFAULT_MAX_SIZE
+from src.itinerary import DEFAULT_DAY_MINUTES
+from src.utils import get_age_group
+
+logger = logging.getLogger(__name__)
+
+MAX_HEADER_BYTES = 64 * 1024
+DEFAULT_KEEPALIVE_TIMEOUT = 15.0
+
+HTTP_REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable',
+}
+
+
+class HTTPError(Exception):
+    """Error yang dikembalikan ke client sebagai response JSON {"error": ...}"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _json_body(payload):
+    return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+
+def _int_param(params, name, default):
+    value = params.get(name)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise HTTPError(400, f"Parameter {name} harus berupa angka")
+    if value < 1:
+        raise HTTPError(400, f"Parameter {name} minimal 1")
+    return value
+
+
+def _float_param(params, name, default):
+    value = params.get(name)
+    if value is None:
+        return default
+    try:
+        value = float(value)
+    except ValueError:
+        raise HTTPError(400, f"Parameter {name} harus berupa angka")
+    if value != value or value in (float('inf'), float('-inf')):
+        raise HTTPError(400, f"Parameter {name} harus berupa angka")
+    return value
+
+
+class RecommendationService:
+    """
+    Service HTTP yang membungkus satu TourismRecommender bersama.
+
+    Parsing HTTP dan koneksi keep-alive ditangani event loop, sedangkan
+    pekerjaan CPU (rekomendasi dan serialisasi JSON) dijalankan di thread pool
+    dengan jumlah worker terbatas. Jika antrean sudah penuh (max_pending),
+    request langsung dijawab 503 agar latensi tidak terus bertambah.
+    """
+
+    def __init__(self, recommender, max_workers=4, max_pending=None,
+                 keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT, max_n_categories=6, max_n_places=20):
+        self.recommender = recommender
+        # HotReloader: satu request memakai satu snapshot data dari awal sampai akhir
+        self.pinned = getattr(recommender, 'pinned', contextlib.nullcontext)
+        self.max_workers = max_workers
+        self.max_pending = max_pending if max_pending is not None else max_workers * 64
+        self.keepalive_timeout = keepalive_timeout
+        self.max_n_categories = max_n_categories
+        self.max_n_places = max_n_places
+
+        self.executor = None
+        self.server = None
+        self.pending = 0
+        # Task per koneksi yang sedang dilayani, dibatalkan saat close()
+        self._connections = set()
+
+        self.routes = {
+            'recommendations': self.recommendations,
+            'places': self.place,
+            'personalized': self.personalized,
+            'nearby': self.nearby,
+            'itinerary': self.itinerary,
+            'health': self.health,
+        }
+
+    # Handler endpoint (dijalankan di worker pool)
+
+    def recommendations(self, path_args, params):
+        if path_args:
+            raise HTTPError(404, "Endpoint tidak ditemukan")
+        age_group = self._profile(params)
+
+        n_categories = min(_int_param(params, 'n_categories', 6), self.max_n_categories)
+        n_places = min(_int_param(params, 'n_places', 3), self.max_n_places)
+        user_location = self._location(params, required=False)
+
+        try:
+            recommendations = self.recommender.get_recommendations(
+                params['gender'], age_group, params['city'], params['trip_type'],
+                n_categories=n_categories, n_places_per_category=n_places, user_location=user_location
+            )
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+        return 200, {
+            'profile': {
+                'gender': params['gender'],
+                'age_group': age_group,
+                'city': params['city'],
+                'trip_type': params['trip_type'],
+            },
+            'recommendations': recommendations,
+        }
+
+    def itinerary(self, path_args, params):
+        if path_args:
+            raise HTTPError(404, "Endpoint tidak ditemukan")
+        age_group = self._profile(params)
+
+        hours = _float_param(params, 'hours', DEFAULT_DAY_MINUTES / 60)
+        if not 0 < hours <= 24:
+            raise HTTPError(400, "Parameter hours harus antara 0 dan 24")
+        budget = _float_param(params, 'budget', None)
+        if budget is not None and budget < 0:
+            raise HTTPError(400, "Parameter budget tidak boleh negatif")
+        start_location = self._location(params, required=False)
+        return_to_start = params.get('return', '').lower() in ('1', 'true', 'yes')
+
+        try:
+            itinerary = self.recommender.plan_itinerary(
+                params['gender'], age_group, params['city'], params['trip_type'],
+                time_limit=hours * 60, budget=budget, start_location=start_location,
+                return_to_start=return_to_start
+            )
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+        return 200, {
+            'profile': {
+                'gender': params['gender'],
+                'age_group': age_group,
+                'city': params['city'],
+                'trip_type': params['trip_type'],
+            },
+            'itinerary': itinerary,
+        }
+
+    def place(self, path_args, params):
+        if len(path_args) == 2 and path_args[1] == 'also-liked':
+            return self.also_liked(path_args[:1], params)
+        if len(path_args) == 2 and path_args[1] == 'similar':
+            return self.similar(path_args[:1], params)
+        if len(path_args) == 2 and path_args[1] == 'nearby':
+            return self._nearby(params, place_id=self._place_id(path_args[0]))
+        if len(path_args) != 1:
+            raise HTTPError(404, "Endpoint tidak ditemukan")
+        place_id = self._place_id(path_args[0])
+
+        try:
+            place_name, city, description, image_urls = self.recommender.place_details[place_id]
+        except KeyError:
+            raise HTTPError(404, f"Objek wisata {place_id} tidak ditemukan")
+
+        return 200, {
+            'Place_Id': place_id,
+            'Place_Name': place_name,
+            'City': city,
+            'Description': description,
+            'image_urls': list(image_urls),
+        }
+
+    def also_liked(self, path_args, params):
+        place_id = self._place_id(path_args[0])
+        if place_id not in self.recommender.place_details:
+            raise HTTPError(404, f"Objek wisata {place_id} tidak ditemukan")
+
+        n_places = min(_int_param(params, 'n', 5), self.max_n_places)
+        return 200, {
+            'Place_Id': place_id,
+            'places': self.recommender.get_because_you_liked(place_id, n_places, params.get('city') or None),
+        }
+
+    def similar(self, path_args, params):
+        place_id = self._place_id(path_args[0])
+        if place_id not in self.recommender.place_details:
+            raise HTTPError(404, f"Objek wisata {place_id} tidak ditemukan")
+
+        k = min(_int_param(params, 'k', 5), self.max_n_places)
+        same_city = params.get('same_city', '').lower() in ('1', 'true', 'yes')
+        return 200, {
+            'Place_Id': place_id,
+            'same_city': same_city,
+            'places': self.recommender.similar_places(place_id, k, same_city),
+        }
+
+    def personalized(self, path_args, params):
+        if path_args:
+            raise HTTPError(404, "Endpoint tidak ditemukan")
+        if not params.get('city'):
+            raise HTTPError(400, "Parameter wajib belum diisi: city")
+
+        user_id = _int_param(params, 'user_id', None)
+        age_group = params.get('age_group')
+        if not age_group and params.get('age'):
+            age_group = get_age_group(_int_param(params, 'age', None))
+        n_places = min(_int_param(params, 'n', 10), self.max_n_places)
+
+        return 200, {
+            'city': params['city'],
+            'user_id': user_id,
+            'places': self.recommender.get_personalized_places(
+                params['city'], user_id, params.get('gender'), age_group, n_places
+            ),
+        }
+
+    def nearby(self, path_args, params):
+        if path_args:
+            raise HTTPError(404, "Endpoint tidak ditemukan")
+        lat, lon = self._location(params, required=True)
+        return self._nearby(params, lat=lat, lon=lon)
+
+    def _nearby(self, params, place_id=None, lat=None, lon=None):
+        radius_km = _float_param(params, 'radius_km', 5.0)
+        if radius_km <= 0:
+            raise HTTPError(400, "Parameter radius_km harus lebih besar dari 0")
+        k = min(_int_param(params, 'k', 10), self.max_n_places)
+
+        try:
+            places = self.recommender.nearby(place_id, lat, lon, radius_km, k)
+        except KeyError:
+            raise HTTPError(404, f"Objek wisata {place_id} tidak ditemukan")
+        return 200, {'Place_Id': place_id, 'lat': lat, 'lon': lon, 'radius_km': radius_km, 'places': places}
+
+    @staticmethod
+    def _profile(params):
+        """Validasi parameter profil (gender, city, trip_type) dan kembalikan age_group"""
+        missing = [name for name in ('gender', 'city', 'trip_type') if not params.get(name)]
+        if missing:
+            raise HTTPError(400, f"Parameter wajib belum diisi: {', '.join(missing)}")
+
+        age_group = params.get('age_group')
+        if not age_group:
+            if not params.get('age'):
+                raise HTTPError(400, "Parameter age atau age_group wajib diisi")
+            age_group = get_age_group(_int_param(params, 'age', None))
+        return age_group
+
+    @staticmethod
+    def _location(params, required):
+        """Tuple (lat, lon) dari parameter, atau None jika tidak diisi dan tidak wajib"""
+        if not params.get('lat') and not params.get('lon'):
+            if required:
+                raise HTTPError(400, "Parameter wajib belum diisi: lat, lon")
+            return None
+        if not params.get('lat') or not params.get('lon'):
+            raise HTTPError(400, "Parameter lat dan lon harus diisi bersamaan")
+
+        lat, lon = _float_param(params, 'lat', None), _float_param(params, 'lon', None)
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise HTTPError(400, "Koordinat lat/lon tidak valid")
+        return lat, lon
+
+    @staticmethod
+    def _place_id(value):
+        try:
+            return int(value)
+        except ValueError:
+            raise HTTPError(400, "Place_Id harus berupa angka")
+
+    def health(self, path_args, params):
+        payload = {'status': 'ok', 'pending': self.pending}
+        stats = getattr(self.recommender, 'stats', None)
+        if callable(stats):
+            payload['snapshot'] = stats()
+        cache = getattr(self.recommender, 'result_cache', None)
+        if cache is not None:
+            payload['cache'] = cache.stats()
+        return 200, payload
+
+    def handle(self, method, target):
+        """
+        Proses satu request dan kembalikan (status, body JSON dalam bytes).
+        Dapat dipanggil langsung tanpa socket, misalnya untuk pengujian.
+        """
+        try:
+            if method not in ('GET', 'HEAD'):
+                raise HTTPError(405, f"Method {method} tidak didukung")
+
+            url = urlsplit(target)
+            parts = [part for part in url.path.split('/') if part]
+            handler = self.routes.get(parts[0]) if parts else None
+            if handler is None:
+                raise HTTPError(404, "Endpoint tidak ditemukan")
+
+            params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            with self.pinned():
+                status, payload = handler(parts[1:], params)
+        except HTTPError as e:
+            status, payload = e.status, {'error': e.message}
+        except Exception:
+            # Detail exception hanya dicatat di log, tidak dikirim ke client
+            logger.exception("Request %s %s gagal", method, target)
+            status, payload = 500, {'error': "Internal Server Error"}
+        return status, _json_body(payload)
+
+    # Server HTTP/1.1
+
+    async def start(self, host='127.0.0.1', port=8000, reuse_port=False):
+        """
+        Mulai menerima koneksi. Dengan port=0, port bebas dipilih otomatis (lihat self.port).
+        reuse_port=True memungkinkan beberapa proses worker mendengarkan port yang sama.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='recommender')
+        self.server = await asyncio.start_server(self._serve_connection, host, port, limit=MAX_HEADER_BYTES,
+                                                 reuse_port=reuse_port or None)
+        return self.server
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """
+        Berhenti menerima koneksi, batalkan koneksi yang masih terbuka
+        (termasuk koneksi keep-alive yang idle), lalu hentikan worker pool
+        tanpa memblokir event loop
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        # Di Python 3.8 wait_closed() tidak menunggu atau membatalkan task koneksi
+        connections = list(self._connections)
+        for task in connections:
+            task.cancel()
+        await asyncio.gather(*connections, return_exceptions=True)
+        if self.executor is not None:
+            executor, self.executor = self.executor, None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    async def __aenter__(self):
+        if self.server is None:
+            await self.start('127.0.0.1', 0)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _dispatch(self, method, target):
+        if self.pending >= self.max_pending:
+            return 503, _json_body({'error': "Server sedang sibuk, coba lagi"})
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self.handle, method, target)
+        finally:
+            self.pending -= 1
+
+    async def _serve_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                # Tunggu request berikutnya; koneksi idle ditutup setelah keepalive_timeout
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.keepalive_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._write_response(writer, 413, _json_body({'error': "Header terlalu besar"}), False)
+                    break
+
+                try:
+                    method, target, version, headers = self._parse_head(head)
+                except ValueError:
+                    await self._write_response(writer, 400, _json_body({'error': "Request tidak valid"}), False)
+                    break
+
+                # Body (jika ada) tidak dipakai, tetapi harus dibaca agar request berikutnya tetap sinkron
+                content_length = headers.get('content-length', '0')
+                if not content_length.isdigit():
+                    await self._write_response(writer, 400, _json_body({'error': "Content-Length tidak valid"}), False)
+                    break
+                if int(content_length) > MAX_HEADER_BYTES:
+                    await self._write_response(writer, 413, _json_body({'error': "Body terlalu besar"}), False)
+                    break
+                if int(content_length):
+                    await reader.readexactly(int(content_length))
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+                status, body = await self._dispatch(method, target)
+                await self._write_response(writer, status, body, keep_alive, head_only=(method == 'HEAD'))
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # Dibatalkan oleh close(): tutup koneksi tanpa traceback
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    @staticmethod
+    def _parse_head(head):
+        lines = head.decode('latin-1').split('\r\n')
+        method, target, version = lines[0].split(' ')
+        if not version.startswith('HTTP/1.'):
+            raise ValueError(version)
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+        return method.upper(), target, version, headers
+
+    async def _write_response(self, writer, status, body, keep_alive, head_only=False):
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        )
+        if status == 503:
+            head += "Retry-After: 1\r\n"
+        writer.write(head.encode('latin-1') + b'\r\n' + (b'' if head_only else body))
+        await writer.drain()
+
+
+class ServiceClient:
+    """
+    Client HTTP sederhana dengan satu koneksi keep-alive, untuk menguji service
+    di proses yang sama (misalnya service.start(port=0) di event loop yang sama).
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def get(self, path, params=None):
+        """Kirim GET dan kembalikan (status, body JSON yang sudah di-decode)"""
+        if self.writer is None:
+            await self.connect()
+        if params:
+            path = f"{path}?{urlencode(params)}"
+
+        self.writer.write(f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n\r\n".encode('latin-1'))
+        await self.writer.drain()
+
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split(' ')[1])
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+        body = await self.reader.readexactly(int(headers.get('content-length', 0)))
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, json.loads(body.decode('utf-8')) if body else None
+
+
+async def serve(host, port, max_workers, data_path='data/processed', models_path='models', reload_interval=0,
+                reuse_port=False, **recommender_kwargs):
+    if reload_interval > 0:
+        from src.reload import HotReloader
+        recommender = HotReloader(data_path, models_path, interval=reload_interval, **recommender_kwargs).start()
+    else:
+        from src.recommender import TourismRecommender
+        recommender = TourismRecommender(data_path, models_path, **recommender_kwargs)
+    service = RecommendationService(recommender, max_workers=max_workers)
+    server = await service.start(host, port, reuse_port)
+    print(f"Service berjalan di http://{host}:{service.port} ({max_workers} worker, pid {os.getpid()})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+        if reload_interval > 0:
+            recommender.stop()
+
+
+def _serve_worker(host, port, max_workers, data_path, models_path, reload_interval, recommender_kwargs):
+    try:
+        asyncio.run(serve(host, port, max_workers, data_path, models_path, reload_interval, reuse_port=True,
+                          **recommender_kwargs))
+    except KeyboardInterrupt:
+        pass
+
+
+def serve_processes(n_processes, host, port, max_workers, data_path='data/processed', models_path='models',
+                    reload_interval=0, **recommender_kwargs):
+    """
+    Jalankan n_processes proses worker yang berbagi port (SO_REUSEPORT, Linux).
+
+    Proses induk membangun artefak serving sekali (jika belum ada atau sudah
+    tidak sesuai data) sebelum worker dimulai. Setiap worker membuka artefak
+    dan file model dengan mmap, sehingga tabel numerik dan string dibagi lewat
+    page cache OS dan memori privat per worker hanya beberapa MB.
+    """
+    import multiprocessing
+    from src.artifacts import ensure_artifacts
+
+    ensure_artifacts(data_path, models_path)
+    workers = [
+        multiprocessing.Process(target=_serve_worker, name=f'recommender-worker-{i}',
+                                args=(host, port, max_workers, data_path, models_path, reload_interval,
+                                      recommender_kwargs))
+        for i in range(n_processes)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP API rekomendasi wisata")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1),
+                        help="Jumlah worker thread untuk pekerjaan CPU")
+    parser.add_argument('--data-path', default='data/processed')
+    parser.add_argument('--models-path', default='models')
+    parser.add_argument('--reload-interval', type=float, default=0,
+                        help="Interval pemeriksaan perubahan data untuk hot reload (detik, 0 = nonaktif)")
+    parser.add_argument('--processes', type=int, default=1,
+                        help="Jumlah proses worker yang berbagi port dan artefak mmap")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_SIZE,
+                        help="Jumlah hasil rekomendasi yang disimpan di cache (0 = nonaktif)")
+    parser.add_argument('--cache-ttl', type=float, default=None,
+                        help="Masa berlaku hasil di cache (detik, default tanpa batas)")
+    args = parser.parse_args(argv)
+
+    recommender_kwargs = {'result_cache_size': args.cache_size, 'result_cache_ttl': args.cache_ttl}
+    try:
+        if args.processes > 1:
+            serve_processes(args.processes, args.host, args.port, args.workers, args.data_path,
+                            args.models_path, args.reload_interval, **recommender_kwargs)
+        else:
+            asyncio.run(serve(args.host, args.port, args.workers, args.data_path, args.models_path,
+                              args.reload_interval, **recommender_kwargs))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
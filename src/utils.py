@@ -1,12 +1,39 @@
-import pandas as pd
-
-def get_age_group(age):
-    """Convert numerical age to age group."""
-    if 18 <= age <= 22:
-        return 'Teen/College'
-    elif 23 <= age <= 27:
-        return 'Young Adult'
-    elif 28 <= age <= 32:
-        return 'Adult'
-    else:
-        return 'Mature Adult'
\ No newline at end of file
+import os
+
+import pandas as pd
+
+# Pilihan input profil pengguna yang tersedia di aplikasi
+GENDER_OPTIONS = ['Laki-laki', 'Perempuan', 'Tidak ingin menyebutkan']
+AGE_GROUP_OPTIONS = ['Teen/College', 'Young Adult', 'Adult', 'Mature Adult']
+CITY_OPTIONS = ['Jakarta', 'Bandung', 'Semarang', 'Yogyakarta', 'Surabaya']
+TRIP_TYPE_OPTIONS = ['Solo Trip', 'Couple Trip', 'Family Trip', 'Friends Trip']
+
+def get_age_group(age):
+    """Convert numerical age to age group."""
+    if 18 <= age <= 22:
+        return 'Teen/College'
+    elif 23 <= age <= 27:
+        return 'Young Adult'
+    elif 28 <= age <= 32:
+        return 'Adult'
+    else:
+        return 'Mature Adult'
+
+
+def load_place_images(file_path='data/processed/tourism_with_images.csv'):
+    """
+    Load image URLs per Place_Id, already split on '|'.
+    Returns an empty dict if the file does not exist.
+    """
+    if not os.path.exists(file_path):
+        return {}
+
+    df = pd.read_csv(file_path, usecols=['Place_Id', 'image_urls'])
+    place_images = {}
+    for place_id, image_urls in zip(df['Place_Id'].tolist(), df['image_urls'].tolist()):
+        if isinstance(image_urls, str):
+            urls = tuple(url.strip() for url in image_urls.split('|') if url.strip())
+        else:
+            urls = ()
+        place_images[place_id] = urls
+    return place_images